@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Batch evaluation of every autonomous trajectory with autosim.
+
+Each trajectory is run for both alliances and for a number of randomly
+perturbed starting poses. Runs are spread over a process pool; every worker
+has its own HAL simulation and trajectory store. Per-run results are
+aggregated into a summary table that is printed and written as CSV.
+
+Run from the pybot directory:
+    python autobatch.py --runs 20 --out autobatch.csv
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import math
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+import zlib
+
+import trajectories
+
+DEFAULT_RUNS = 10
+DEFAULT_SIGMA_XY = 0.05          # meters
+DEFAULT_SIGMA_HEADING = 2.0      # degrees
+
+SUMMARY_FIELDS = ['trajectory', 'alliance', 'runs', 'failed', 'rms_error_mean', 'rms_error_max',
+                  'max_error', 'max_heading_error_deg', 'final_error_mean', 'final_error_max', 'events']
+
+_store = None
+
+def _initWorker(names: list[str]) -> None:
+    """
+    Runs once in every worker process.
+    """
+    global _store
+    import hal
+    from trajectories import TrajectoryStore
+    hal.initialize(500, 0)
+    _store = TrajectoryStore()
+    for name in names:
+        _store.load(name)
+
+def _runJob(name: str, red: bool, seed: int | None, sigma_xy: float, sigma_heading: float):
+    """
+    Returns (report, start_error); the report is None if the trajectory
+    didn't load.
+    """
+    import autosim
+    start_error = (0.0, 0.0, 0.0)
+    if seed is not None:
+        rng = random.Random(seed)
+        start_error = (rng.gauss(0.0, sigma_xy),
+                       rng.gauss(0.0, sigma_xy),
+                       math.radians(rng.gauss(0.0, sigma_heading)))
+    table = _store.get(name)
+    if table is None:
+        return None, start_error
+    return autosim.runTrajectory(table, red, start_error, name), start_error
+
+def jobs(names: list[str], runs: int) -> list[tuple[str, bool, int | None]]:
+    """
+    One nominal run plus `runs` perturbed runs per trajectory and alliance.
+    Seeds are derived from the job itself, so reruns are reproducible.
+    """
+    result = []
+    for name in names:
+        for red in (False, True):
+            result.append((name, red, None))
+            for i in range(runs):
+                result.append((name, red, zlib.crc32(f"{name}/{red}/{i}".encode())))
+    return result
+
+def summarize(results) -> list[dict]:
+    """
+    Aggregate run results per trajectory and alliance. `results` holds a
+    (name, red, report) per job, with a None report for a failed run.
+    """
+    groups: dict[tuple[str, bool], list] = {}
+    failures: dict[tuple[str, bool], int] = {}
+    for name, red, report in results:
+        groups.setdefault((name, red), [])
+        if report is None:
+            failures[(name, red)] = failures.get((name, red), 0) + 1
+        else:
+            groups[(name, red)].append(report)
+
+    rows = []
+    for (name, red), reports in sorted(groups.items()):
+        failed = failures.get((name, red), 0)
+        if not reports:
+            row = dict.fromkeys(SUMMARY_FIELDS, math.nan)
+            row.update(trajectory=name, alliance='red' if red else 'blue', runs=0, failed=failed, events='')
+            rows.append(row)
+            continue
+        rms = [r.rms_error for r in reports]
+        final = [r.final_error for r in reports]
+        event_times: dict[str, list[float]] = {}
+        for r in reports:
+            for t, event in r.events:
+                event_times.setdefault(event, []).append(t)
+        rows.append({
+            'trajectory': name,
+            'alliance': 'red' if red else 'blue',
+            'runs': len(reports),
+            'failed': failed,
+            'rms_error_mean': statistics.fmean(rms),
+            'rms_error_max': max(rms),
+            'max_error': max(r.max_error for r in reports),
+            'max_heading_error_deg': math.degrees(max(r.max_heading_error for r in reports)),
+            'final_error_mean': statistics.fmean(final),
+            'final_error_max': max(final),
+            'events': ' '.join('%s@%.2f±%.3f' % (event, statistics.fmean(times), statistics.pstdev(times))
+                               for event, times in sorted(event_times.items())),
+        })
+    return rows
+
+def printSummary(rows: list[dict]) -> None:
+    print("%-14s %-5s %5s %6s %9s %9s %9s %9s %10s %10s  %s" % (
+        "trajectory", "side", "runs", "failed", "rms mean", "rms max", "max m", "max deg",
+        "final mean", "final max", "events"))
+    for row in rows:
+        print("%-14s %-5s %5d %6d %9.3f %9.3f %9.3f %9.2f %10.3f %10.3f  %s" % (
+            row['trajectory'], row['alliance'], row['runs'], row['failed'],
+            row['rms_error_mean'], row['rms_error_max'], row['max_error'],
+            row['max_heading_error_deg'], row['final_error_mean'], row['final_error_max'],
+            row['events']))
+
+def writeCsv(rows: list[dict], path: str) -> None:
+    if not rows:
+        return
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('trajectories', nargs='*', help='trajectory names (default: all in deploy/choreo)')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help='perturbed runs per trajectory and alliance')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes')
+    parser.add_argument('--sigma-xy', type=float, default=DEFAULT_SIGMA_XY, help='start position error std dev (m)')
+    parser.add_argument('--sigma-heading', type=float, default=DEFAULT_SIGMA_HEADING, help='start heading error std dev (deg)')
+    parser.add_argument('--out', default='autobatch.csv', help='summary CSV to write')
+    args = parser.parse_args(argv)
+
+    names = args.trajectories or trajectories.trajectoryNames()
+    work = jobs(names, args.runs)
+    start = time.perf_counter()
+
+    # Spawn, so each worker gets a fresh HAL instead of a forked copy
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.workers, mp_context=context,
+                                                initializer=_initWorker, initargs=(names,)) as pool:
+        futures = [(name, red, pool.submit(_runJob, name, red, seed, args.sigma_xy, args.sigma_heading))
+                   for name, red, seed in work]
+        results = []
+        for name, red, future in futures:
+            try:
+                report, _ = future.result()
+            except Exception as e:
+                print(f"{name} ({'red' if red else 'blue'}): run failed: {e!r}", file=sys.stderr)
+                report = None
+            results.append((name, red, report))
+
+    rows = summarize(results)
+    printSummary(rows)
+    writeCsv(rows, args.out)
+    failed = sum(1 for _, _, report in results if report is None)
+    print("%d runs (%d failed) in %.1f s, summary written to %s" % (
+        len(results), failed, time.perf_counter() - start, args.out))
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
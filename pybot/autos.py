@@ -1,45 +1,147 @@
-import os
+import math
+import typing
 import commands2
 import wpilib
-import choreo
+from wpimath.controller import ProfiledPIDController
+from wpimath.geometry import Pose2d
+from wpimath.trajectory import TrapezoidProfile
+
+import trajectories
+from pathgen import PathGenerator
+from trajectories import SampleTable, TrajectorySampler
 
 DEFAULT_TRAJECTORY = 'leftscore'
 
+# Markers that are this late (e.g. after a loop overrun) are dropped, not fired
+EVENT_WINDOW_SECONDS = 0.2
+
+# Motion limits and tolerances for DriveToPose
+DRIVE_TO_POSE_MAX_SPEED = 3.0                           # m/s
+DRIVE_TO_POSE_MAX_ACCELERATION = 3.0                    # m/s²
+DRIVE_TO_POSE_MAX_ANGULAR_SPEED = math.radians(360.0)   # rad/s
+DRIVE_TO_POSE_MAX_ANGULAR_ACCELERATION = math.radians(720.0)
+DRIVE_TO_POSE_POSITION_TOLERANCE = 0.02                 # m
+DRIVE_TO_POSE_HEADING_TOLERANCE = math.radians(2.0)
+
+class EventScheduler:
+    """
+    Fires trajectory event markers in timestamp order.
+
+    Markers are sorted once when loaded and a pointer advances past each one
+    as it fires, so polling costs only the events that are due. Every marker
+    fires exactly once, including repeats of the same event name.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, typing.Callable[[], None]] = {}
+        self._markers = []
+        self._next = 0
+
+    def register(self, event: str, handler: typing.Callable[[], None]) -> None:
+        """
+        Set the action to run when a marker named `event` is reached.
+        """
+        self._handlers[event] = handler
+
+    def load(self, markers) -> None:
+        """
+        Replace the markers to fire and rewind to the first one.
+        """
+        self._markers = sorted (markers, key=lambda marker: marker.timestamp)
+        self._next = 0
+
+    def trigger(self, event: str) -> None:
+        """
+        Run the handler for `event` immediately, if there is one.
+        """
+        handler = self._handlers.get (event)
+        if handler is not None:
+            handler()
+
+    def poll(self, now: float) -> None:
+        """
+        Fire every marker with a timestamp at or before `now`.
+        """
+        markers = self._markers
+        while self._next < len (markers) and markers[self._next].timestamp <= now:
+            marker = markers[self._next]
+            self._next += 1
+            if now < marker.timestamp + EVENT_WINDOW_SECONDS:
+                self.trigger (marker.event)
+
+def fieldVelocity(state) -> tuple[float, float]:
+    """
+    The field-centric (vx, vy) of a drive state, whose speeds are robot-centric.
+    """
+    heading = state.pose.rotation().radians()
+    speeds = state.speeds
+    cos = math.cos(heading)
+    sin = math.sin(heading)
+    return (speeds.vx * cos - speeds.vy * sin,
+            speeds.vx * sin + speeds.vy * cos)
+
 class FollowTrajectory(commands2.Command):
-    def __init__(self, drivetrain, intake, traj) -> None:
+    def __init__(self, drivetrain, intake, traj, reset_pose: bool = True, finish_at_end: bool = False) -> None:
         """
         Initializes the AutonomousCommand.
 
         :param drivetrain: The drivetrain subsystem used by this command.
-        :param traj: The trajectory file to follow.
+        :param traj: The pre-loaded trajectory to follow, or the name of a trajectory file to load.
+                     May be None if a subclass sets it with setTrajectory.
         :param is_red_alliance: Boolean indicating if the robot is on the red alliance.
+        :param reset_pose: Reset odometry to the start of the trajectory when starting.
+        :param finish_at_end: Finish when the trajectory's time is up instead of running until interrupted.
         """
         super().__init__()
         self.drivetrain = drivetrain
         self.intake = intake
-        self.trajectory = choreo.load_swerve_trajectory(traj)
+        self.reset_pose = reset_pose
+        self.finish_at_end = finish_at_end
+        self.trajectory = None
+        self.sampler = None
+        if traj is not None:
+            if isinstance(traj, str):
+                traj = trajectories.loadTrajectory(traj)
+            self.setTrajectory(traj if isinstance(traj, SampleTable) else SampleTable(traj))
+        self.is_red_alliance = False
         self.timer = wpilib.Timer()
         self.laststamp = 0
         self.event_markers = []
-        self.triggered_events = set()
+
+        self.events = EventScheduler()
+        self.events.register("CoralPlace", self.intake.shoot)
+        self.events.register("CoralIntake", self.intake.load)
+        self.events.register("CoralStop", self.intake.stop)
+        self.events.register("ResetHeading", self.drivetrain.seed_field_centric)
 
         self.addRequirements(self.drivetrain)  # Ensure the drivetrain is a requirement for this command
-        
+
+    def setTrajectory(self, table: SampleTable) -> None:
+        """
+        Replace the trajectory to follow. Takes effect at the next initialize.
+        """
+        self.trajectory = table
+        self.sampler = TrajectorySampler(table)
 
     def initialize(self) -> None:
         """
         This autonomous runs the autonomous command selected by your RobotContainer class.
         """
         if self.trajectory:
+            # The alliance can't change mid-routine, so pick the samples once
+            self.is_red_alliance = wpilib.DriverStation.getAlliance() == wpilib.DriverStation.Alliance.kRed
+            self.sampler.reset()
+
             # Get the initial pose of the trajectory
-            initial_pose = self.trajectory.get_initial_pose(True)
+            initial_pose = self.trajectory.initialPose(self.is_red_alliance)
 
-            if initial_pose:
+            if initial_pose and self.reset_pose:
                 # Reset odometry to the start of the trajectory
                 self.drivetrain.reset_pose(initial_pose)
 
             # Load event markers from the trajectory
             self.event_markers = self.trajectory.events
+            self.events.load(self.event_markers)
 
         # Reset and start the timer when the autonomous period begins
         self.timer.restart()
@@ -49,8 +151,10 @@ class FollowTrajectory(commands2.Command):
         This function is called periodically during autonomous.
         """
         if self.trajectory:
+            now = self.timer.get()
+
             # Sample the trajectory at the current time into the autonomous period
-            sample = self.trajectory.sample_at(self.timer.get(), True)
+            sample = self.sampler.sample(now, self.is_red_alliance)
 
             if sample:
                 #if sample.timestamp != self.laststamp:
@@ -58,12 +162,8 @@ class FollowTrajectory(commands2.Command):
                 self.drivetrain.follow_trajectory(sample)
                 self.laststamp = sample.timestamp
 
-                # Check for event markers and trigger actions
-                for marker in self.event_markers:
-                    if marker.timestamp <= self.timer.get() < marker.timestamp + 0.2:
-                        if marker.event not in self.triggered_events:
-                            self.triggerEvent(marker.event)
-                            self.triggered_events.add(marker.event)
+                # Fire any event markers that are now due
+                self.events.poll(now)
 
                 #else:
                     #self.drivetrain.stop()
@@ -72,32 +172,132 @@ class FollowTrajectory(commands2.Command):
         """
         Trigger the action associated with the event.
         """
-
-        if event == "CoralPlace":
-            self.intake.shoot()
-        elif event == "CoralIntake":
-            self.intake.load()
-        elif event == "CoralStop":
-            self.intake.stop()
-        elif event == "ResetHeading":
-            self.drivetrain.seed_field_centric()
+        self.events.trigger(event)
 
     def isFinished(self) -> bool:
         """
         Returns true when the command should end.
         """
-        return False
+        if not self.finish_at_end or not self.trajectory:
+            return False
+        return self.timer.get() >= self.trajectory.totalTime()
+
+class FollowGeneratedPath(FollowTrajectory):
+    """
+    Generates a path from wherever the robot is to a target when started,
+    then follows it like any other trajectory and finishes at its end.
+    """
+
+    def __init__(self, drivetrain, intake, target: Pose2d | typing.Callable[[], Pose2d],
+                 generator: PathGenerator | None = None) -> None:
+        """
+        :param target: The pose to drive to, or a function returning it that
+                       is called when the command starts.
+        :param generator: Path generator with the motion limits to use.
+        """
+        super().__init__(drivetrain, intake, None, reset_pose=False, finish_at_end=True)
+        self.generator = generator if generator is not None else PathGenerator()
+        self._target = target
+
+    def initialize(self) -> None:
+        state = self.drivetrain.get_state()
+        target = self._target() if callable(self._target) else self._target
+        self.setTrajectory(self.generator.generate(state.pose, target, fieldVelocity(state)))
+        super().initialize()
+
+class DriveToPose(commands2.Command):
+    """
+    Drives straight to a field pose along trapezoidal motion profiles.
+
+    Translation is profiled as the distance left to the target, so x and y
+    stay coordinated and the robot takes a straight line; heading has its own
+    profile. Each profile's setpoint velocity is used as feedforward with PID
+    on top, and the command finishes once both are within tolerance.
+    """
+
+    def __init__(self, drivetrain, target: Pose2d | typing.Callable[[], Pose2d]) -> None:
+        """
+        :param drivetrain: The drivetrain subsystem used by this command.
+        :param target: The pose to drive to, or a function returning it that
+                       is called when the command starts.
+        """
+        super().__init__()
+        self.drivetrain = drivetrain
+        self._target_source = target
+        self.target = target if isinstance(target, Pose2d) else Pose2d()
+        self.translation_controller = ProfiledPIDController(
+            3.0, 0.0, 0.0,
+            TrapezoidProfile.Constraints(DRIVE_TO_POSE_MAX_SPEED, DRIVE_TO_POSE_MAX_ACCELERATION))
+        self.heading_controller = ProfiledPIDController(
+            4.0, 0.0, 0.0,
+            TrapezoidProfile.Constraints(DRIVE_TO_POSE_MAX_ANGULAR_SPEED, DRIVE_TO_POSE_MAX_ANGULAR_ACCELERATION))
+        self.heading_controller.enableContinuousInput(-math.pi, math.pi)
+        self._distance = math.inf
+        self._heading_error = math.inf
+
+        self.addRequirements(self.drivetrain)
+
+    def initialize(self) -> None:
+        if callable(self._target_source):
+            self.target = self._target_source()
+        self._distance = math.inf
+        self._heading_error = math.inf
+
+        state = self.drivetrain.get_state()
+        pose = state.pose
+        heading = pose.rotation().radians()
+        dx = pose.X() - self.target.X()
+        dy = pose.Y() - self.target.Y()
+        distance = math.hypot(dx, dy)
+
+        # Start the profiles from the current motion so there is no jerk
+        # when taking over from the driver
+        field_vx, field_vy = fieldVelocity(state)
+        closing_speed = (field_vx * dx + field_vy * dy) / distance if distance > 1e-6 else 0.0
+        self.translation_controller.reset(distance, closing_speed)
+        self.translation_controller.setGoal(0.0)
+        self.heading_controller.reset(heading, state.speeds.omega)
+        self.heading_controller.setGoal(self.target.rotation().radians())
+
+    def execute(self) -> None:
+        pose = self.drivetrain.get_pose()
+        dx = pose.X() - self.target.X()
+        dy = pose.Y() - self.target.Y()
+        self._distance = math.hypot(dx, dy)
+        heading = pose.rotation().radians()
+        self._heading_error = math.remainder(self.target.rotation().radians() - heading, math.tau)
+
+        # Speed along the line from the target to the robot; negative closes in
+        speed = self.translation_controller.calculate(self._distance)
+        speed += self.translation_controller.getSetpoint().velocity
+        if self._distance > 1e-6:
+            vx = speed * dx / self._distance
+            vy = speed * dy / self._distance
+        else:
+            vx = vy = 0.0
+
+        omega = self.heading_controller.calculate(heading)
+        omega += self.heading_controller.getSetpoint().velocity
+
+        self.drivetrain.drive_field_speeds(vx, vy, omega)
+
+    def atTarget(self) -> bool:
+        return (self._distance < DRIVE_TO_POSE_POSITION_TOLERANCE
+                and abs(self._heading_error) < DRIVE_TO_POSE_HEADING_TOLERANCE)
+
+    def isFinished(self) -> bool:
+        return self.atTarget()
+
+    def end(self, interrupted: bool) -> None:
+        # The last errors are kept, so atTarget() tells how the command ended
+        self.drivetrain.stop()
+
+def createChooser(names: list[str] | None = None) -> wpilib.SendableChooser:
+    if names is None:
+        names = trajectories.trajectoryNames()
 
-def createChooser() -> wpilib.SendableChooser:
-    traj_dir = f"{wpilib.getOperatingDirectory()}/deploy/choreo"
-    traj_files = []
-    for f in os.listdir (traj_dir):
-        if f.endswith('.traj'):
-            traj_files.append (f)
-    
     chooser = wpilib.SendableChooser()
-    for traj_file in traj_files:
-        chooser.addOption (traj_file.removesuffix ('.traj'),
-                                traj_file.removesuffix ('.traj'))        
+    for name in names:
+        chooser.addOption (name, name)
     chooser.setDefaultOption (DEFAULT_TRAJECTORY, DEFAULT_TRAJECTORY)
     return chooser
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Headless, faster than real time simulation of autonomous trajectories.
+
+The HAL clock is paused and stepped by hand, so FollowTrajectory's timer
+sees simulated time, and the drivetrain is replaced by a kinematic model
+that runs the same TrajectoryController as CommandSwerveDrivetrain. A 15 s
+routine runs in a fraction of a second.
+
+Run from the pybot directory:
+    python autosim.py [trajectory ...]
+"""
+
+import math
+import sys
+import time
+from dataclasses import dataclass, field
+
+import commands2
+import hal
+import wpilib
+import wpilib.simulation
+from wpimath.geometry import Pose2d, Rotation2d
+from wpimath.kinematics import ChassisSpeeds
+
+import trajectories
+from autos import FollowTrajectory
+from generated.tuner_constants import TunerConstants
+from subsystems.command_swerve_drivetrain import TrajectoryController
+from trajectories import SampleTable, TrajectorySampler, TrajectoryStore
+
+LOOP_PERIOD = 0.02
+PHYSICS_PERIOD = 0.005
+SETTLE_SECONDS = 0.5
+
+# Limits of the kinematic drivetrain model
+MAX_ACCELERATION = 8.0          # m/s²
+MAX_ANGULAR_ACCELERATION = 30.0 # rad/s²
+
+@dataclass
+class TrackingReport:
+    """
+    Result of one simulated run of a trajectory.
+    """
+    name: str
+    red: bool
+    duration: float = 0.0
+    rms_error: float = 0.0
+    max_error: float = 0.0
+    max_heading_error: float = 0.0
+    final_error: float = 0.0
+    final_heading_error: float = 0.0
+    events: list[tuple[float, str]] = field(default_factory=list)
+    wall_time: float = 0.0
+
+class SimDriveState:
+    """
+    The fields of SwerveDriveState that commands read.
+    """
+
+    def __init__(self, pose: Pose2d, speeds: ChassisSpeeds) -> None:
+        self.pose = pose
+        self.speeds = speeds
+
+class SimDrivetrain(commands2.Subsystem):
+    """
+    Kinematic stand-in for CommandSwerveDrivetrain.
+
+    Velocities follow the commanded field speeds with limited acceleration
+    and are integrated into the pose. Only the methods FollowTrajectory and
+    DriveToPose use are provided.
+    """
+
+    def __init__(self, clock) -> None:
+        super().__init__()
+        self.controller = TrajectoryController()
+        self.events: list[tuple[float, str]] = []
+        self._clock = clock
+        self._max_speed = TunerConstants.speed_at_12_volts
+        self._command = ChassisSpeeds()
+        self._vx = 0.0
+        self._vy = 0.0
+        self._omega = 0.0
+        self._x = 0.0
+        self._y = 0.0
+        self._heading = 0.0
+
+    def reset_pose(self, pose: Pose2d) -> None:
+        self._x = pose.X()
+        self._y = pose.Y()
+        self._heading = pose.rotation().radians()
+
+    def get_pose(self) -> Pose2d:
+        return Pose2d(self._x, self._y, Rotation2d(self._heading))
+
+    def get_state(self) -> SimDriveState:
+        # Measured speeds are robot-centric, like the real drivetrain's
+        cos = math.cos(self._heading)
+        sin = math.sin(self._heading)
+        speeds = ChassisSpeeds(self._vx * cos + self._vy * sin,
+                               -self._vx * sin + self._vy * cos,
+                               self._omega)
+        return SimDriveState(self.get_pose(), speeds)
+
+    def seed_field_centric(self) -> None:
+        self.events.append((self._clock(), "ResetHeading"))
+
+    def follow_trajectory(self, sample) -> None:
+        self.controller.calculate(self.get_pose(), sample, self._command)
+
+    def drive_field_speeds(self, vx: float, vy: float, omega: float) -> None:
+        self._command.vx = vx
+        self._command.vy = vy
+        self._command.omega = omega
+
+    def stop(self) -> None:
+        self._command.vx = self._command.vy = self._command.omega = 0.0
+
+    def step(self, dt: float) -> None:
+        """
+        Advance the model by dt seconds.
+        """
+        limit = MAX_ACCELERATION * dt
+        vx = self._vx + max(-limit, min(limit, self._command.vx - self._vx))
+        vy = self._vy + max(-limit, min(limit, self._command.vy - self._vy))
+        speed = math.hypot(vx, vy)
+        if speed > self._max_speed:
+            vx *= self._max_speed / speed
+            vy *= self._max_speed / speed
+        limit = MAX_ANGULAR_ACCELERATION * dt
+        self._omega += max(-limit, min(limit, self._command.omega - self._omega))
+        self._vx = vx
+        self._vy = vy
+
+        self._x += self._vx * dt
+        self._y += self._vy * dt
+        self._heading = math.remainder(self._heading + self._omega * dt, math.tau)
+
+class SimIntake:
+    """
+    Records intake actions instead of driving motors.
+    """
+
+    def __init__(self, clock) -> None:
+        self.events: list[tuple[float, str]] = []
+        self._clock = clock
+
+    def shoot(self) -> None:
+        self.events.append((self._clock(), "shoot"))
+
+    def load(self) -> None:
+        self.events.append((self._clock(), "load"))
+
+    def stop(self) -> None:
+        self.events.append((self._clock(), "stop"))
+
+def setAlliance(red: bool) -> None:
+    station = hal.AllianceStationID.kRed1 if red else hal.AllianceStationID.kBlue1
+    wpilib.simulation.DriverStationSim.setAllianceStationId(station)
+    wpilib.simulation.DriverStationSim.notifyNewData()
+    wpilib.DriverStation.refreshData()
+
+def runTrajectory(table: SampleTable, red: bool = False,
+                  start_error: tuple[float, float, float] = (0.0, 0.0, 0.0),
+                  name: str | None = None) -> TrackingReport:
+    """
+    Run FollowTrajectory on `table` against the kinematic model.
+
+    :param table: The trajectory to follow.
+    :param red: Run as the red alliance.
+    :param start_error: (x, y, heading) offset of the robot from the
+                        trajectory's start pose, in meters and radians.
+    :param name: Label for the report, e.g. the TrajectoryStore key;
+                 defaults to the trajectory's own name.
+    """
+    wall_start = time.perf_counter()
+    setAlliance(red)
+    wpilib.simulation.pauseTiming()
+
+    start_time = wpilib.Timer.getFPGATimestamp()
+    clock = lambda: wpilib.Timer.getFPGATimestamp() - start_time
+    drivetrain = SimDrivetrain(clock)
+    intake = SimIntake(clock)
+    command = FollowTrajectory(drivetrain, intake, table)
+    reference = TrajectorySampler(table)
+    report = TrackingReport(name or table.name, red)
+
+    command.initialize()
+    # Apply the start error after initialize has reset the pose
+    start = drivetrain.get_pose()
+    drivetrain.reset_pose(Pose2d(start.X() + start_error[0],
+                                 start.Y() + start_error[1],
+                                 Rotation2d(start.rotation().radians() + start_error[2])))
+
+    last_event = max((marker.timestamp for marker in table.events), default=0.0)
+    run_time = max(table.totalTime(), last_event) + SETTLE_SECONDS
+    steps = round(LOOP_PERIOD / PHYSICS_PERIOD)
+    loops = math.ceil(run_time / LOOP_PERIOD)
+    squared_total = 0.0
+
+    for _ in range(loops):
+        command.execute()
+        for _ in range(steps):
+            drivetrain.step(PHYSICS_PERIOD)
+            wpilib.simulation.stepTiming(PHYSICS_PERIOD)
+
+        now = clock()
+        target = reference.sample(now, red)
+        pose = drivetrain.get_pose()
+        error = math.hypot(pose.X() - target.x, pose.Y() - target.y)
+        heading_error = abs(math.remainder(pose.rotation().radians() - target.heading, math.tau))
+        squared_total += error * error
+        report.max_error = max(report.max_error, error)
+        report.max_heading_error = max(report.max_heading_error, heading_error)
+
+    command.end(False)
+    wpilib.simulation.resumeTiming()
+    commands2.CommandScheduler.getInstance().unregisterSubsystem(drivetrain)
+
+    report.duration = loops * LOOP_PERIOD
+    report.rms_error = math.sqrt(squared_total / loops) if loops else 0.0
+    report.final_error = error if loops else 0.0
+    report.final_heading_error = heading_error if loops else 0.0
+    report.events = sorted(drivetrain.events + intake.events)
+    report.wall_time = time.perf_counter() - wall_start
+    return report
+
+def printReports(reports: list[TrackingReport]) -> None:
+    print("%-14s %-5s %7s %8s %8s %9s %8s %9s  %s" % (
+        "trajectory", "side", "sim s", "rms m", "max m", "max deg", "final m", "wall ms", "events"))
+    for r in reports:
+        events = ", ".join("%s@%.2f" % (name, t) for t, name in r.events)
+        print("%-14s %-5s %7.2f %8.3f %8.3f %9.2f %8.3f %9.1f  %s" % (
+            r.name, "red" if r.red else "blue", r.duration, r.rms_error, r.max_error,
+            math.degrees(r.max_heading_error), r.final_error, r.wall_time * 1000.0, events))
+
+def main(argv: list[str]) -> int:
+    hal.initialize(500, 0)
+    store = TrajectoryStore()
+    names = argv or trajectories.trajectoryNames()
+    for name in names:
+        store.load(name)
+
+    reports = []
+    for name in names:
+        table = store.get(name)
+        if table is None:
+            continue
+        for red in (False, True):
+            reports.append(runTrajectory(table, red, name=name))
+
+    printReports(reports)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Measure memory allocated per control cycle on the CommandSwerveDrivetrain
+field-speeds paths, comparing the old build-a-new-request approach with the
+preallocated requests.
+
+Run from the pybot directory (simulation):
+    python -m benchmarks.fieldspeeds
+"""
+
+import time
+import tracemalloc
+import hal
+from phoenix6 import swerve
+from wpimath.geometry import Pose2d
+from wpimath.kinematics import ChassisSpeeds
+
+from autos import DriveToPose
+from generated.tuner_constants import TunerConstants
+from trajectories import TrajectorySample
+
+CYCLES = 2000
+
+def legacyRequest(vx: float, vy: float, omega: float) -> swerve.requests.ApplyFieldSpeeds:
+    """
+    How the drivetrain used to build its request every cycle.
+    """
+    return swerve.requests.ApplyFieldSpeeds().with_speeds(ChassisSpeeds(vx, vy, omega)) \
+        .with_drive_request_type(swerve.swerve_module.SwerveModule.DriveRequestType.VELOCITY) \
+        .with_steer_request_type(swerve.swerve_module.SwerveModule.SteerRequestType.POSITION) \
+        .with_desaturate_wheel_speeds(True)
+
+def measure(label: str, fn) -> None:
+    """
+    Run fn CYCLES times and report the transient memory it allocates per call.
+    Allocations that are freed again before the next cycle still count, since
+    they are what the garbage collector ends up chasing.
+    """
+    fn()  # warm up caches and lazy imports
+    tracemalloc.start()
+    peak_total = 0
+    start = time.perf_counter()
+    for _ in range (CYCLES):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn()
+        peak_total += tracemalloc.get_traced_memory()[1] - before
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    print ("  %-34s %8.1f bytes/cycle  %7.2f us/cycle" % (
+        label, peak_total / CYCLES, elapsed / CYCLES * 1e6))
+
+def main():
+    hal.initialize(500, 0)
+    drivetrain = TunerConstants.create_drivetrain()
+    sample = TrajectorySample()
+    target = Pose2d(2, 1, 0.5)
+
+    print ("Field speeds request path:")
+    measure ("legacy: new request + set_control", lambda: drivetrain.set_control (legacyRequest (0.1, 0.2, 0.3)))
+    measure ("preallocated: stop()", drivetrain.stop)
+    measure ("preallocated: drive_field_speeds", lambda: drivetrain.drive_field_speeds (0.1, 0.2, 0.3))
+    measure ("preallocated: request only",
+             lambda: drivetrain._apply_field_speeds (drivetrain._stop_request, 0.1, 0.2, 0.3))
+    print ("Full controller paths (includes get_pose and PID math):")
+    measure ("follow_trajectory", lambda: drivetrain.follow_trajectory (sample))
+    drive_to_pose = DriveToPose (drivetrain, target)
+    drive_to_pose.initialize()
+    measure ("DriveToPose.execute", drive_to_pose.execute)
+    measure ("point_at_coordinate", lambda: drivetrain.point_at_coordinate (target, (0.1, 0.2)))
+    print ("done!")
+
+if __name__ == '__main__':
+    main()
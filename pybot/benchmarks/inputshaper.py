@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Compare the original joystick shaping math from RobotContainer with
+DriveInputShaper.
+
+Run from the pybot directory:
+    python -m benchmarks.inputshaper
+"""
+
+import math
+import random
+import time
+
+from inputshaper import DriveInputShaper
+from robotcontainer import RobotContainer, DEAD_BAND, MAX_SPEED_SCALING, MAX_SPEED_ROT
+
+MAX_SPEED = 4.5
+MAX_ANGULAR_RATE = 7.0
+EXPONENT = 4.0
+CALLS = 200000
+
+def original(x0, y0, rot):
+    """
+    calculateJoystick + the rotation part of defaultDriveRequest, as they were.
+    """
+    apply = RobotContainer.applyExponential
+    magnitude = apply(math.hypot(x0, y0), DEAD_BAND, EXPONENT) * MAX_SPEED * MAX_SPEED_SCALING
+    theta = math.atan2(y0, x0)
+    x1 = magnitude * math.cos(theta)
+    y1 = magnitude * math.sin(theta)
+    omega = -1.0 * apply(rot, DEAD_BAND, EXPONENT) * MAX_ANGULAR_RATE * MAX_SPEED_ROT
+    return -1.0 * y1, -1.0 * x1, omega
+
+def main():
+    rng = random.Random(1)
+    sticks = [(rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(1000)]
+    shaper = DriveInputShaper(MAX_SPEED, MAX_ANGULAR_RATE, DEAD_BAND, EXPONENT, MAX_SPEED_SCALING, MAX_SPEED_ROT)
+    shaper.setSigns(-1.0, -1.0)
+    rounds = CALLS // len(sticks)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for x, y, r in sticks:
+            original(x, y, r)
+    original_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for x, y, r in sticks:
+            shaper.update(x, y, r)
+    shaper_time = time.perf_counter() - start
+
+    calls = rounds * len(sticks)
+    print("Joystick shaping (%d calls):" % calls)
+    print("  original  %6.3f us/call" % (original_time / calls * 1e6))
+    print("  shaper    %6.3f us/call  (%.1fx)" % (shaper_time / calls * 1e6, original_time / shaper_time))
+    print("done!")
+
+if __name__ == '__main__':
+    main()
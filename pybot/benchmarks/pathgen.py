@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Generation latency of PathGenerator versus path length.
+
+Run from the pybot directory:
+    python -m benchmarks.pathgen
+"""
+
+import math
+import time
+
+from wpimath.geometry import Pose2d, Rotation2d
+
+from pathgen import PathGenerator
+
+LENGTHS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 12.0)    # meters
+REPEATS = 500
+
+def main() -> None:
+    generator = PathGenerator()
+    start = Pose2d(1.0, 1.0, Rotation2d())
+    print("%8s %8s %8s %10s %10s" % ("length", "samples", "path s", "mean ms", "max ms"))
+    for length in LENGTHS:
+        target = Pose2d(1.0 + length * math.cos(0.3), 1.0 + length * math.sin(0.3), Rotation2d(2.0))
+        times = []
+        for _ in range(REPEATS):
+            begin = time.perf_counter()
+            table = generator.generate(start, target)
+            times.append(time.perf_counter() - begin)
+        print("%8.2f %8d %8.2f %10.3f %10.3f" % (
+            length, len(table), table.totalTime(),
+            sum(times) / len(times) * 1000.0, max(times) * 1000.0))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Compare choreo's SwerveTrajectory.sample_at with TrajectorySampler over every
+trajectory in deploy/choreo.
+
+Run from the pybot directory:
+    python -m benchmarks.sampler
+"""
+
+import time
+
+import trajectories
+from trajectories import SampleTable, TrajectorySampler
+
+LOOP_PERIOD = 0.02
+REPEATS = 200
+
+def timestamps(total_time: float) -> list[float]:
+    """
+    The timestamps FollowTrajectory would sample at, plus a little overrun.
+    """
+    count = int ((total_time + 0.5) / LOOP_PERIOD)
+    return [i * LOOP_PERIOD for i in range (count)]
+
+def maxError(traj, sampler: TrajectorySampler, stamps: list[float]) -> float:
+    """
+    Largest absolute difference between the two samplers over all fields.
+    """
+    worst = 0.0
+    sampler.reset()
+    for t in stamps:
+        a = traj.sample_at (t, False)
+        b = sampler.sample (t, False)
+        for field in ('x', 'y', 'heading', 'vx', 'vy', 'omega'):
+            worst = max (worst, abs (getattr (a, field) - getattr (b, field)))
+    return worst
+
+def benchmark(name: str) -> None:
+    traj = trajectories.loadTrajectory (name)
+    sampler = TrajectorySampler (SampleTable (traj))
+    stamps = timestamps (traj.get_total_time())
+
+    start = time.perf_counter()
+    for _ in range (REPEATS):
+        for t in stamps:
+            traj.sample_at (t, False)
+    choreo_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range (REPEATS):
+        sampler.reset()
+        for t in stamps:
+            sampler.sample (t, False)
+    sampler_time = time.perf_counter() - start
+
+    calls = REPEATS * len (stamps)
+    print ("  %-12s %5d calls  choreo %7.2f us/call  sampler %7.2f us/call  (%.1fx)  max err %.2e" % (
+        name, calls,
+        choreo_time / calls * 1e6,
+        sampler_time / calls * 1e6,
+        choreo_time / sampler_time if sampler_time > 0 else 0.0,
+        maxError (traj, sampler, stamps)))
+
+def main():
+    print ("Trajectory sampling:")
+    for name in trajectories.trajectoryNames():
+        benchmark (name)
+    print ("done!")
+
+if __name__ == '__main__':
+    main()
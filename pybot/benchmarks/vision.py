@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Cost of getting a Limelight result on the robot loop, against a local fake
+camera with a simulated network delay.
+
+- blocking: a new connection and a parse per request on the calling thread,
+  which is what the old teleopPeriodic did through limelight.get_results()
+- persistent: LimelightClient.poll() on the calling thread (reused connection)
+- snapshot: reading LimelightClient.latest while the client polls in the
+  background, which is all the robot loop does now
+
+Run from the pybot directory:
+    python -m benchmarks.vision
+"""
+
+import http.client
+import json
+import statistics
+import time
+
+import limelightresults
+
+from tests.fixtures.fakelimelight import FakeLimelight
+from vision import LimelightClient
+
+REQUESTS = 200
+DELAYS = (0.0, 0.002, 0.005)
+
+def percentiles(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2]
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return "p50 %8.3f ms  p99 %8.3f ms  mean %8.3f ms" % (
+        p50 * 1000.0, p99 * 1000.0, statistics.fmean(samples) * 1000.0)
+
+def blocking(fake: FakeLimelight) -> list[float]:
+    times = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        connection = http.client.HTTPConnection(fake.host, fake.port)
+        connection.request('GET', '/results')
+        limelightresults.parse_results(json.loads(connection.getresponse().read()))
+        connection.close()
+        times.append(time.perf_counter() - start)
+    return times
+
+def persistent(fake: FakeLimelight) -> list[float]:
+    client = LimelightClient(fake.host, fake.port, clock=time.monotonic)
+    times = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        client.poll()
+        times.append(time.perf_counter() - start)
+    client.stop()
+    return times
+
+def snapshot(fake: FakeLimelight) -> tuple[list[float], int]:
+    client = LimelightClient(fake.host, fake.port, clock=time.monotonic)
+    client.start()
+    times = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        result = client.latest
+        if result is not None:
+            result.results.fiducialResults
+        times.append(time.perf_counter() - start)
+        time.sleep(0.001)
+    client.stop()
+    return times, client.latest.sequence if client.latest else 0
+
+def main() -> None:
+    for delay in DELAYS:
+        with FakeLimelight(delay=delay) as fake:
+            print("server delay %.1f ms" % (delay * 1000.0))
+            print("  blocking    %s" % percentiles(blocking(fake)))
+            print("  persistent  %s" % percentiles(persistent(fake)))
+            times, frames = snapshot(fake)
+            print("  snapshot    %s  (%d frames polled in background)" % (percentiles(times), frames))
+
+if __name__ == '__main__':
+    main()
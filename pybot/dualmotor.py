@@ -1,9 +1,34 @@
 from phoenix6.hardware import talon_fx
+from phoenix6.controls import DutyCycleOut
 from phoenix6.controls.follower import Follower
 from phoenix6.signals import NeutralModeValue
+from statussignals import LEADER_SIGNAL_HZ, SignalPlan, SignalRegistry
+
+class ControlBatch:
+    """
+    Collects leader control requests from several mechanisms and sends them
+    together once per loop, from flush().
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[int, tuple[talon_fx.TalonFX, object]] = {}
+
+    def stage(self, motor: talon_fx.TalonFX, request) -> None:
+        self._pending[id(motor)] = (motor, request)
+
+    def discard(self, motor: talon_fx.TalonFX) -> None:
+        self._pending.pop(id(motor), None)
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        for motor, request in self._pending.values():
+            motor.set_control(request)
+        self._pending.clear()
 
 class DualMotor:
-    def __init__(self, master_id, follower_id) -> None:
+    def __init__(self, master_id, follower_id, batch: ControlBatch | None = None,
+                 signals: SignalRegistry | None = None) -> None:
         self.motor = talon_fx.TalonFX(master_id)
         self.follower = talon_fx.TalonFX(follower_id)
         
@@ -12,9 +37,59 @@ class DualMotor:
         self.follower.setNeutralMode(NeutralModeValue.BRAKE)
         self.follower.set_control(Follower(master_id, True))
 
+        # Control requests are reused, and only sent when the demand changes.
+        # Phoenix keeps re-sending the last request on its own.
+        self._batch = batch
+        self._duty_cycle = DutyCycleOut(0.0)
+        self._demand = None
+
+        # Feedback signals are refreshed by the registry once per loop when
+        # there is one; otherwise each read refreshes its own signal.
+        self._signals = signals
+
+    def signalPlan(self) -> SignalPlan:
+        """
+        The status signals this mechanism uses. The follower only needs the
+        leader's output signals; nothing is read from the follower itself.
+        """
+        return SignalPlan(type(self).__name__) \
+            .signals(LEADER_SIGNAL_HZ,
+                     self.motor.get_duty_cycle(False),
+                     self.motor.get_motor_voltage(False),
+                     self.motor.get_torque_current(False)) \
+            .device(self.motor, self.follower)
+
+    def registerSignals(self, *signals) -> None:
+        if self._signals is not None:
+            self._signals.register(*signals)
+
+    def readSignal(self, signal) -> float:
+        """
+        Current value of a feedback signal.
+        """
+        if self._signals is None:
+            signal.refresh()
+        return signal.value
+
+    def applyControl(self, request, demand) -> None:
+        """
+        Send a control request to the leader unless `demand` (a hashable
+        description of the request, e.g. ('duty', 0.5)) was the last one sent.
+        With a ControlBatch the request goes out on the next flush instead.
+        """
+        if demand == self._demand:
+            return
+        self._demand = demand
+        if self._batch is not None:
+            self._batch.stage(self.motor, request)
+        else:
+            self.motor.set_control(request)
 
     def stop(self) -> None:
+        self._demand = None
+        if self._batch is not None:
+            self._batch.discard(self.motor)
         self.motor.stopMotor()
         
     def setMotor(self, value) -> None:
-        self.motor.set(value)
+        self.applyControl(self._duty_cycle.with_output(value), ('duty', value))
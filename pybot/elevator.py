@@ -1,18 +1,130 @@
-from dualmotor import DualMotor
-from phoenix6.controls import DutyCycleOut# , NeutralOut
+import math
+from commands2 import Subsystem
+from dualmotor import ControlBatch, DualMotor
+from statussignals import SignalPlan, SignalRegistry
+from phoenix6.controls import MotionMagicVoltage # , NeutralOut
 from phoenix6.configs import TalonFXConfiguration
+from phoenix6.signals import GravityTypeValue, NeutralModeValue
 
 HOLDING_POWER = 0.015
 GOING_UP_POWER = 0.7
 GOING_DOWN_POWER = -0.5
 
-class Elevator(DualMotor):
-    def __init__(self, motor1_id, motor2_id):
-        super().__init__(motor1_id, motor2_id)
+# Mechanism geometry. Height is carriage travel in meters from the bottom.
+# These are CAD estimates and should be checked against the real elevator.
+GEAR_RATIO = 9.0            # motor rotations per drum rotation
+DRUM_RADIUS = 0.0254        # meters, sprocket pitch radius
+CARRIAGE_MASS = 6.0         # kg
+MIN_HEIGHT = 0.0            # meters
+MAX_HEIGHT = 1.3            # meters
+
+# Rotor rotations per meter of travel. Used as the sensor-to-mechanism ratio,
+# so positions and velocities on the TalonFX are in meters.
+ROTOR_ROTATIONS_PER_METER = GEAR_RATIO / (2.0 * math.pi * DRUM_RADIUS)
+
+# Named target heights in meters
+PRESET_HEIGHTS = {
+    'stow': 0.0,
+    'intake': 0.05,
+    'L1': 0.25,
+    'L2': 0.45,
+    'L3': 0.85,
+    'L4': 1.25,
+}
+POSITION_TOLERANCE = 0.02   # meters
+FEEDBACK_SIGNAL_HZ = 50.0
+SOFT_LIMIT_MARGIN = 0.02    # meters kept clear of the hard stops
+
+# Motion Magic profile, in meters
+CRUISE_VELOCITY = 1.5       # m/s
+ACCELERATION = 4.0          # m/s²
+JERK = 40.0                 # m/s³
+
+# Closed loop gains (volts per meter of error etc.). Starting values, tune with SysId.
+K_G = 0.30
+K_S = 0.10
+K_V = 6.8
+K_A = 0.10
+K_P = 20.0
+K_D = 0.5
+
+class Elevator(DualMotor, Subsystem):
+    """
+    Two-motor elevator. It is a Subsystem so that preset and manual commands
+    require it and interrupt each other instead of fighting over the motors.
+    """
+
+    def __init__(self, motor1_id, motor2_id, batch: ControlBatch | None = None,
+                 signals: SignalRegistry | None = None):
+        Subsystem.__init__(self)
+        DualMotor.__init__(self, motor1_id, motor2_id, batch, signals)
+        self.motor.configurator.apply(self._configuration())
+
+        # The carriage starts at the bottom
+        self.motor.set_position(MIN_HEIGHT)
+        self._position = self.motor.get_position()
+        self._velocity = self.motor.get_velocity()
+        self.registerSignals(self._position, self._velocity)
+        self._target = MIN_HEIGHT
+        self._position_request = MotionMagicVoltage(MIN_HEIGHT).with_slot(0)
+
+    @staticmethod
+    def _configuration() -> TalonFXConfiguration:
+        config = TalonFXConfiguration()
+        # Applying a configuration resets everything else, so keep brake mode
+        config.motor_output.neutral_mode = NeutralModeValue.BRAKE
+        config.feedback.sensor_to_mechanism_ratio = ROTOR_ROTATIONS_PER_METER
+
+        config.slot0.gravity_type = GravityTypeValue.ELEVATOR_STATIC
+        config.slot0.k_g = K_G
+        config.slot0.k_s = K_S
+        config.slot0.k_v = K_V
+        config.slot0.k_a = K_A
+        config.slot0.k_p = K_P
+        config.slot0.k_d = K_D
+
+        config.motion_magic.motion_magic_cruise_velocity = CRUISE_VELOCITY
+        config.motion_magic.motion_magic_acceleration = ACCELERATION
+        config.motion_magic.motion_magic_jerk = JERK
+
+        config.software_limit_switch.forward_soft_limit_enable = True
+        config.software_limit_switch.forward_soft_limit_threshold = MAX_HEIGHT - SOFT_LIMIT_MARGIN
+        config.software_limit_switch.reverse_soft_limit_enable = True
+        config.software_limit_switch.reverse_soft_limit_threshold = MIN_HEIGHT
+        return config
+
+    def signalPlan(self) -> SignalPlan:
+        return super().signalPlan().signals(FEEDBACK_SIGNAL_HZ, self._position, self._velocity)
 
     def move_to_position(self, position):
-        # Implement logic to move the elevator to a specific position. Not sure on the units yet
-        pass
+        """
+        Move the carriage to a height in meters using Motion Magic on the
+        leader. The profile runs on the motor controller, so this only needs
+        to be called once per setpoint.
+        """
+        self._target = min(max(position, MIN_HEIGHT), MAX_HEIGHT - SOFT_LIMIT_MARGIN)
+        self.applyControl(self._position_request.with_position(self._target), ('position', self._target))
+
+    def moveToPreset(self, name: str) -> None:
+        """
+        Move to one of the named PRESET_HEIGHTS.
+        """
+        self.move_to_position(PRESET_HEIGHTS[name])
+
+    def height(self) -> float:
+        """
+        Carriage height in meters, compensated for CAN latency when the
+        signals are refreshed by a registry.
+        """
+        if self._signals is None:
+            return self.readSignal(self._position)
+        return SignalRegistry.compensated(self._position, self._velocity)
+
+    def atTarget(self) -> bool:
+        """
+        True once the carriage is within POSITION_TOLERANCE of the last target.
+        """
+        return abs(self.height() - self._target) < POSITION_TOLERANCE
 
     def moveUp(self) -> None:
         self.setMotor(GOING_UP_POWER)
@@ -21,5 +133,5 @@ class Elevator(DualMotor):
         self.setMotor(GOING_DOWN_POWER)
 
     def stop(self) -> None:
-        self.motor.stopMotor()
-        self.motor.set_control(DutyCycleOut(HOLDING_POWER))
\ No newline at end of file
+        # Hold against gravity rather than going neutral
+        self.setMotor(HOLDING_POWER)
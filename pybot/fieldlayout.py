@@ -0,0 +1,134 @@
+import math
+from array import array
+
+from robotpy_apriltag import AprilTagField, AprilTagFieldLayout
+from wpimath.geometry import Pose2d, Rotation2d
+
+FIELD = AprilTagField.k2025ReefscapeWelded
+
+# Tags on the six faces of each alliance's reef
+RED_REEF_TAGS = (6, 7, 8, 9, 10, 11)
+BLUE_REEF_TAGS = (17, 18, 19, 20, 21, 22)
+
+# Distance from a reef tag to the robot center when scoring on that face
+SCORING_DISTANCE = 0.55         # meters
+
+# Limelight 3 horizontal field of view and useful range
+CAMERA_FOV = math.radians(63.3)
+MAX_TAG_DISTANCE = 5.0          # meters
+
+class FieldLayout:
+    """
+    The 2025 AprilTag layout, loaded once and indexed by tag ID.
+
+    Tag positions and facing angles are kept in flat arrays indexed by ID,
+    and the scoring pose in front of every reef face is computed up front
+    for both alliances, so per-loop queries are plain arithmetic over a
+    handful of entries.
+    """
+
+    def __init__(self, layout: AprilTagFieldLayout | None = None) -> None:
+        self.layout = layout if layout is not None else AprilTagFieldLayout.loadField(FIELD)
+        self.field_length = self.layout.getFieldLength()
+        self.field_width = self.layout.getFieldWidth()
+
+        tags = self.layout.getTags()
+        size = max(tag.ID for tag in tags) + 1
+        self.ids = tuple(sorted(tag.ID for tag in tags))
+        self.x = array('d', [math.nan] * size)
+        self.y = array('d', [math.nan] * size)
+        self.z = array('d', [math.nan] * size)
+        self.yaw = array('d', [math.nan] * size)
+        self._poses: list[Pose2d | None] = [None] * size
+        for tag in tags:
+            pose = tag.pose
+            self.x[tag.ID] = pose.X()
+            self.y[tag.ID] = pose.Y()
+            self.z[tag.ID] = pose.Z()
+            self.yaw[tag.ID] = pose.rotation().Z()
+            self._poses[tag.ID] = pose.toPose2d()
+
+        self._reef_tags = {False: BLUE_REEF_TAGS, True: RED_REEF_TAGS}
+        self._scoring_targets = {red: tuple(self._scoringTarget(tag_id) for tag_id in tag_ids)
+                                 for red, tag_ids in self._reef_tags.items()}
+        self._reef_centers = {red: Pose2d(sum(self.x[i] for i in tag_ids) / len(tag_ids),
+                                          sum(self.y[i] for i in tag_ids) / len(tag_ids),
+                                          Rotation2d())
+                              for red, tag_ids in self._reef_tags.items()}
+
+    def _scoringTarget(self, tag_id: int) -> Pose2d:
+        """
+        The robot pose in front of a tag, facing it.
+        """
+        yaw = self.yaw[tag_id]
+        return Pose2d(self.x[tag_id] + SCORING_DISTANCE * math.cos(yaw),
+                      self.y[tag_id] + SCORING_DISTANCE * math.sin(yaw),
+                      Rotation2d(yaw + math.pi))
+
+    def tagPose(self, tag_id: int) -> Pose2d | None:
+        """
+        Returns the field pose of a tag, or None if there is no such tag.
+        """
+        if 0 <= tag_id < len(self._poses):
+            return self._poses[tag_id]
+        return None
+
+    def reefTags(self, red: bool) -> tuple[int, ...]:
+        return self._reef_tags[red]
+
+    def reefCenter(self, red: bool) -> Pose2d:
+        """
+        The middle of the alliance's reef, as a pose to point at.
+        """
+        return self._reef_centers[red]
+
+    def scoringTargets(self, red: bool) -> tuple[Pose2d, ...]:
+        """
+        The scoring pose in front of each reef face, in reefTags() order.
+        """
+        return self._scoring_targets[red]
+
+    def nearestScoringTarget(self, pose: Pose2d, red: bool) -> tuple[int, Pose2d]:
+        """
+        Returns the tag ID and scoring pose of the reef face closest to `pose`.
+        """
+        x = pose.X()
+        y = pose.Y()
+        targets = self._scoring_targets[red]
+        best = 0
+        best_distance = math.inf
+        for i, target in enumerate(targets):
+            distance = (target.X() - x) ** 2 + (target.Y() - y) ** 2
+            if distance < best_distance:
+                best = i
+                best_distance = distance
+        return self._reef_tags[red][best], targets[best]
+
+    def visibleTags(self, pose: Pose2d, fov: float = CAMERA_FOV,
+                    max_distance: float = MAX_TAG_DISTANCE) -> list[int]:
+        """
+        IDs of the tags a forward-facing camera at `pose` could see: within
+        range, inside the field of view and facing the robot. Sorted by
+        distance, nearest first.
+        """
+        x = pose.X()
+        y = pose.Y()
+        heading = pose.rotation().radians()
+        half_fov = fov / 2
+        max_squared = max_distance * max_distance
+
+        visible = []
+        for tag_id in self.ids:
+            dx = self.x[tag_id] - x
+            dy = self.y[tag_id] - y
+            squared = dx * dx + dy * dy
+            if squared > max_squared:
+                continue
+            # The tag must face the robot
+            if dx * math.cos(self.yaw[tag_id]) + dy * math.sin(self.yaw[tag_id]) >= 0.0:
+                continue
+            if abs(math.remainder(math.atan2(dy, dx) - heading, math.tau)) > half_fov:
+                continue
+            visible.append((squared, tag_id))
+        visible.sort()
+        return [tag_id for _, tag_id in visible]
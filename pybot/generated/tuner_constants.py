@@ -71,6 +71,10 @@ class TunerConstants:
     # All swerve devices must share the same CAN bus
     canbus = CANBus("", "./logs/example.hoot")
 
+    # Rate of the odometry thread; 0 uses Phoenix's default of
+    # 250 Hz on CAN FD and 100 Hz on CAN 2.0
+    odometry_update_frequency: units.hertz = 0
+
     # Theoretical free speed (m/s) at 12 V applied output;
     # This needs to be tuned to your individual robot
     speed_at_12_volts: units.meters_per_second = 5.230
@@ -219,16 +223,32 @@ class TunerConstants:
     )
 
     @classmethod
-    def create_drivetrain(clazz) -> CommandSwerveDrivetrain:
+    def odometry_frequency(clazz, odometry_update_frequency: units.hertz | None = None) -> units.hertz:
+        """
+        The odometry rate the drivetrain will actually run at for a requested
+        rate (default: odometry_update_frequency).
+        """
+        if odometry_update_frequency is None:
+            odometry_update_frequency = clazz.odometry_update_frequency
+        if odometry_update_frequency > 0:
+            return odometry_update_frequency
+        return 250.0 if clazz.canbus.is_network_fd() else 100.0
+
+    @classmethod
+    def create_drivetrain(clazz, odometry_update_frequency: units.hertz | None = None) -> CommandSwerveDrivetrain:
         """
         Creates a CommandSwerveDrivetrain instance.
         This should only be called once in your robot program.
+
+        :param odometry_update_frequency: Odometry thread rate; defaults to
+                                          the odometry_update_frequency constant.
         """
         return CommandSwerveDrivetrain(
             hardware.TalonFX,
             hardware.TalonFX,
             hardware.CANcoder,
             clazz.drivetrain_constants,
+            clazz.odometry_frequency(odometry_update_frequency),
             [
                 clazz.front_left,
                 clazz.front_right,
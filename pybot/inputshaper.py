@@ -0,0 +1,116 @@
+import math
+from wpimath.filter import SlewRateLimiter
+
+class DriveInputShaper:
+    """
+    Maps raw controller axes to field velocities.
+
+    The stages are deadband, exponential response, an optional slew-rate
+    limit and gear scaling. The curve is the same as
+    RobotContainer.applyExponential applied to the stick magnitude, but the
+    constants are folded together whenever the deadband, exponent or gear
+    changes. The translation vector is scaled directly instead of going
+    through atan2/cos/sin.
+
+    Results of `update` are left in `vx`, `vy` and `omega` so the drive loop
+    doesn't allocate.
+    """
+
+    def __init__(self, max_speed: float, max_angular_rate: float,
+                 deadband: float, exponent: float,
+                 drive_scale: float = 1.0, rot_scale: float = 1.0,
+                 slew_rate: float | None = None, rot_slew_rate: float | None = None) -> None:
+        """
+        :param max_speed: Top translational speed in m/s.
+        :param max_angular_rate: Top rotational rate in rad/s.
+        :param deadband: Input deadband, as a fraction of full stick.
+        :param exponent: Exponent of the response curve.
+        :param drive_scale: Gear scaling applied to translation.
+        :param rot_scale: Gear scaling applied to rotation.
+        :param slew_rate: Max change of vx/vy in m/s per second, None for no limit.
+        :param rot_slew_rate: Max change of omega in rad/s per second, None for no limit.
+        """
+        self._max_speed = max_speed
+        self._max_angular_rate = max_angular_rate
+        self._deadband = deadband
+        self._exponent = exponent
+        self._drive_scale = drive_scale
+        self._rot_scale = rot_scale
+        self._drive_sign = 1.0
+        self._rot_sign = 1.0
+        self._x_limiter = SlewRateLimiter(slew_rate) if slew_rate else None
+        self._y_limiter = SlewRateLimiter(slew_rate) if slew_rate else None
+        self._rot_limiter = SlewRateLimiter(rot_slew_rate) if rot_slew_rate else None
+
+        self.vx = 0.0
+        self.vy = 0.0
+        self.omega = 0.0
+
+        self._precompute()
+
+    def _precompute(self) -> None:
+        self._inv_range = 1.0 / (1.0 - self._deadband)
+        self._drive_gain = self._max_speed * self._drive_scale
+        self._rot_gain = self._max_angular_rate * self._rot_scale
+
+    def setCurve(self, deadband: float, exponent: float) -> None:
+        self._deadband = deadband
+        self._exponent = exponent
+        self._precompute()
+
+    def setScaling(self, drive_scale: float, rot_scale: float) -> None:
+        """
+        Change the gear scaling, e.g. for slow-mo.
+        """
+        self._drive_scale = drive_scale
+        self._rot_scale = rot_scale
+        self._precompute()
+
+    def setSigns(self, drive_sign: float, rot_sign: float) -> None:
+        """
+        Set the per-alliance direction of translation and of rotation.
+        """
+        self._drive_sign = drive_sign
+        self._rot_sign = rot_sign
+
+    def translate(self, x: float, y: float) -> tuple[float, float]:
+        """
+        Shape a translation stick to (x, y) speeds in m/s, keeping its direction.
+        """
+        magnitude = math.hypot(x, y)
+        if magnitude < self._deadband or magnitude == 0.0:
+            return 0.0, 0.0
+        scale = ((magnitude - self._deadband) * self._inv_range) ** self._exponent * self._drive_gain / magnitude
+        return x * scale, y * scale
+
+    def rotate(self, x: float) -> float:
+        """
+        Shape a rotation stick to a rate in rad/s.
+        """
+        if -self._deadband < x < self._deadband:
+            return 0.0
+        if x > 0.0:
+            return ((x - self._deadband) * self._inv_range) ** self._exponent * self._rot_gain
+        return -((-x - self._deadband) * self._inv_range) ** self._exponent * self._rot_gain
+
+    def update(self, left_x: float, left_y: float, right_x: float) -> None:
+        """
+        Shape the sticks into field velocities stored in vx, vy and omega.
+
+        Forward on the field (+X) comes from the left stick's Y axis and left
+        (+Y) from its X axis, following WPILib conventions.
+        """
+        x, y = self.translate(left_x, left_y)
+        vx = self._drive_sign * y
+        vy = self._drive_sign * x
+        omega = self._rot_sign * self.rotate(right_x)
+
+        if self._x_limiter is not None:
+            vx = self._x_limiter.calculate(vx)
+            vy = self._y_limiter.calculate(vy)
+        if self._rot_limiter is not None:
+            omega = self._rot_limiter.calculate(omega)
+
+        self.vx = vx
+        self.vy = vy
+        self.omega = omega
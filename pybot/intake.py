@@ -1,12 +1,18 @@
-from dualmotor import DualMotor
+from dualmotor import ControlBatch, DualMotor
+from statussignals import SignalRegistry
 
 SHOOTING_POWER = -.25
 LOADING_POWER = -.15
 
+# Roller geometry, CAD estimates
+GEAR_RATIO = 3.0            # motor rotations per roller rotation
+ROLLER_MOI = 0.0015         # kg m², both rollers combined
+
 
 class Intake(DualMotor):
-    def __init__(self, motor1_id, motor2_id):
-        super().__init__(motor1_id, motor2_id)
+    def __init__(self, motor1_id, motor2_id, batch: ControlBatch | None = None,
+                 signals: SignalRegistry | None = None):
+        super().__init__(motor1_id, motor2_id, batch, signals)
 
     def shoot(self):
         """Shoots the coral."""
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Exports the drive telemetry of match logs to columnar NumPy .npz files.
+
+The DriveState/Pose, ModuleStates, ModuleTargets and OdometryPeriod entries
+that Telemetry.telemeterize writes through SignalLogger are read from each
+log (a hoot converted with `owlet -f wpilog`), stored as one float64 matrix
+per stream plus its own time column, and summarized: per-module speed and
+angle tracking error and odometry period jitter. Logs are processed in
+parallel; each worker streams one log at a time into compact arrays, so
+memory is bounded by the largest log times the number of workers.
+
+Load a result with numpy.load('match.npz'); e.g. data['module_states'] is
+an N x 8 matrix of (angle rad, speed m/s) per module and
+data['module_states_time'] its timestamps in seconds.
+
+Run from the pybot directory:
+    python logexport.py logs/*.wpilog --out export
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import glob
+import math
+import os
+import sys
+import time
+from array import array
+
+import numpy as np
+
+from logstream import LogStream
+
+ENTRIES = {
+    'pose': ('DriveState/Pose', 'double[]'),
+    'module_states': ('DriveState/ModuleStates', 'double[]'),
+    'module_targets': ('DriveState/ModuleTargets', 'double[]'),
+    'odometry_period': ('DriveState/OdometryPeriod', 'double'),
+}
+# Values per record of each stream
+WIDTHS = {'pose': 3, 'module_states': 8, 'module_targets': 8, 'odometry_period': 1}
+
+MODULE_COUNT = 4
+# Below this target speed a module's angle isn't held, so it isn't scored
+MIN_TRACKING_SPEED = 0.1    # m/s
+
+SUMMARY_FIELDS = (['log', 'duration', 'samples', 'odometry_hz', 'period_mean_ms',
+                   'period_std_ms', 'period_p99_ms', 'period_max_ms']
+                  + [f'module{m}_speed_rms' for m in range(MODULE_COUNT)]
+                  + [f'module{m}_angle_rms_deg' for m in range(MODULE_COUNT)])
+
+def readLog(path: str) -> dict[str, np.ndarray]:
+    """
+    Stream the drive telemetry of one log into arrays.
+    """
+    columns = {key: (array('d'), array('d')) for key in ENTRIES}
+    for key, t, value in LogStream(path).stream(ENTRIES):
+        times, values = columns[key]
+        if WIDTHS[key] == 1:
+            values.append(value)
+        elif len(value) == WIDTHS[key]:
+            values.extend(value)
+        else:
+            continue
+        times.append(t)
+
+    data = {}
+    for key, (times, values) in columns.items():
+        data[key + '_time'] = np.array(times, dtype=np.float64)
+        values = np.array(values, dtype=np.float64)
+        data[key] = values if WIDTHS[key] == 1 else values.reshape(-1, WIDTHS[key])
+    return data
+
+def summarize(name: str, data: dict[str, np.ndarray]) -> dict:
+    """
+    Tracking error and odometry jitter of one exported log.
+    """
+    row = dict.fromkeys(SUMMARY_FIELDS, math.nan)
+    row['log'] = name
+
+    times = data['pose_time']
+    row['duration'] = float(times[-1] - times[0]) if len(times) > 1 else 0.0
+
+    period = data['odometry_period']
+    if len(period):
+        row['odometry_hz'] = 1.0 / float(period.mean())
+        row['period_mean_ms'] = float(period.mean()) * 1000.0
+        row['period_std_ms'] = float(period.std()) * 1000.0
+        row['period_p99_ms'] = float(np.percentile(period, 99)) * 1000.0
+        row['period_max_ms'] = float(period.max()) * 1000.0
+
+    # States and targets are written by the same telemeterize call, so
+    # their rows pair up in order
+    count = min(len(data['module_states']), len(data['module_targets']))
+    row['samples'] = count
+    if count:
+        states = data['module_states'][:count].reshape(count, MODULE_COUNT, 2)
+        targets = data['module_targets'][:count].reshape(count, MODULE_COUNT, 2)
+        speed_error = states[:, :, 1] - targets[:, :, 1]
+        angle_error = np.remainder(states[:, :, 0] - targets[:, :, 0] + math.pi, math.tau) - math.pi
+        moving = np.abs(targets[:, :, 1]) > MIN_TRACKING_SPEED
+        for m in range(MODULE_COUNT):
+            row[f'module{m}_speed_rms'] = float(np.sqrt(np.mean(speed_error[:, m] ** 2)))
+            held = angle_error[moving[:, m], m]
+            if len(held):
+                row[f'module{m}_angle_rms_deg'] = math.degrees(float(np.sqrt(np.mean(held ** 2))))
+    return row
+
+def exportLog(path: str, out_dir: str) -> dict:
+    """
+    Export one log to <out_dir>/<name>.npz and return its summary row.
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    data = readLog(path)
+    np.savez_compressed(os.path.join(out_dir, name + '.npz'), **data)
+    return summarize(name, data)
+
+def findLogs(paths: list[str]) -> list[str]:
+    logs = []
+    for path in paths:
+        if os.path.isdir(path):
+            logs.extend(sorted(glob.glob(os.path.join(path, '*.wpilog'))))
+        else:
+            logs.append(path)
+    return logs
+
+def printSummary(rows: list[dict]) -> None:
+    print("%-24s %7s %8s %8s %8s %8s  %s" % (
+        "log", "dur s", "odo Hz", "std ms", "p99 ms", "max ms", "speed rms m/s / angle rms deg per module"))
+    for row in rows:
+        modules = "  ".join("%.3f/%.1f" % (row[f'module{m}_speed_rms'], row[f'module{m}_angle_rms_deg'])
+                            for m in range(MODULE_COUNT))
+        print("%-24s %7.1f %8.1f %8.3f %8.3f %8.3f  %s" % (
+            row['log'][:24], row['duration'], row['odometry_hz'], row['period_std_ms'],
+            row['period_p99_ms'], row['period_max_ms'], modules))
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('logs', nargs='+', help='wpilog files or directories of them')
+    parser.add_argument('--out', default='export', help='directory for the .npz files and summary')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes')
+    args = parser.parse_args(argv)
+
+    logs = findLogs(args.logs)
+    os.makedirs(args.out, exist_ok=True)
+    start = time.perf_counter()
+
+    rows = []
+    failed = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(exportLog, path, args.out): path for path in logs}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                rows.append(future.result())
+            except (OSError, ValueError) as e:
+                failed += 1
+                print(f"{futures[future]}: {e}", file=sys.stderr)
+
+    rows.sort(key=lambda row: row['log'])
+    summary = os.path.join(args.out, 'summary.csv')
+    with open(summary, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    printSummary(rows)
+    print("%d logs exported in %.1f s, summary written to %s" % (len(rows), time.perf_counter() - start, summary))
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,84 @@
+"""
+Streaming reader for WPILib .wpilog files.
+
+DataLogReader memory-maps the file and records are decoded one at a time as
+they are iterated, so a log of any size is read in constant memory. Hoot
+files written by SignalLogger have to be converted first:
+    owlet -f wpilog match.hoot match.wpilog
+"""
+
+import struct
+from typing import Callable, Iterator
+
+from wpiutil.log import DataLogReader, DataLogRecord
+
+_POSE2D = struct.Struct('<3d')
+
+# How to decode a record of each entry type
+DECODERS: dict[str, Callable[[DataLogRecord], object]] = {
+    'double': DataLogRecord.getDouble,
+    'float': DataLogRecord.getFloat,
+    'int64': DataLogRecord.getInteger,
+    'boolean': DataLogRecord.getBoolean,
+    'string': DataLogRecord.getString,
+    'double[]': DataLogRecord.getDoubleArray,
+    'float[]': DataLogRecord.getFloatArray,
+    'int64[]': DataLogRecord.getIntegerArray,
+    'boolean[]': DataLogRecord.getBooleanArray,
+    # (x, y, radians), as published to NetworkTables and mirrored by DataLogManager
+    'struct:Pose2d': lambda record: _POSE2D.unpack(bytes(record.getRaw())),
+}
+
+def matches(name: str, wanted: str) -> bool:
+    """
+    True if a log entry name refers to `wanted`. Converters and the
+    NetworkTables mirror add prefixes (e.g. 'NT:/DriveState/Pose'), so a
+    match on the last path components is accepted too.
+    """
+    return name == wanted or name.endswith('/' + wanted) or name.endswith(':' + wanted)
+
+class LogStream:
+    """
+    One .wpilog file, read as a stream of decoded records.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._reader = DataLogReader(path)
+        if not self._reader.isValid():
+            raise ValueError(f"{path} is not a wpilog file")
+
+    def entries(self) -> dict[str, str]:
+        """
+        Names and types of every entry in the log.
+        """
+        entries = {}
+        for record in self._reader:
+            if record.isStart():
+                data = record.getStartData()
+                entries[data.name] = data.type
+        return entries
+
+    def stream(self, wanted: dict[str, tuple[str, str]]) -> Iterator[tuple[str, float, object]]:
+        """
+        Yield (key, timestamp in seconds, value) for every record of the
+        wanted entries, in file order.
+
+        :param wanted: Maps the key to yield to the (name, type) of the entry.
+        """
+        decoders: dict[int, tuple[str, Callable[[DataLogRecord], object]]] = {}
+        for record in self._reader:
+            if record.isStart():
+                data = record.getStartData()
+                for key, (name, entry_type) in wanted.items():
+                    if data.type == entry_type and matches(data.name, name):
+                        decoders[data.entry] = (key, DECODERS[entry_type])
+                        break
+                continue
+            if record.isControl():
+                continue
+
+            decoder = decoders.get(record.getEntry())
+            if decoder is not None:
+                key, decode = decoder
+                yield key, record.getTimestamp() * 1e-6, decode(record)
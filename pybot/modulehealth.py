@@ -0,0 +1,117 @@
+import logging
+import math
+
+from ntcore import NetworkTableInstance
+
+MODULE_COUNT = 4
+
+# Module status codes, as published in ModuleHealth/Status
+OK = 0
+SLIPPING = 1
+STALLED = 2
+MISALIGNED = 3
+STATUS_NAMES = ('OK', 'Slipping', 'Stalled', 'Misaligned')
+
+TIME_CONSTANT = 0.25            # seconds, for the moving averages
+MIN_TARGET_SPEED = 0.3          # m/s; below this angle and speed ratio aren't judged
+SLIP_SPEED_ERROR = 0.5          # m/s faster than commanded
+STALL_RATIO = 0.3               # of the commanded speed
+MISALIGN_ANGLE = math.radians(10.0)
+CLEAR_FRACTION = 0.5            # a fault clears once its error is back under this part of the threshold
+
+PUBLISH_HZ = 5.0
+
+class ModuleHealthMonitor:
+    """
+    Tracks how well each swerve module follows its target.
+
+    Fed every drive state from Telemetry, it keeps an exponentially weighted
+    moving average per module of the angle error, the speed error and the
+    ratio of measured to commanded speed, so memory and cost per update are
+    fixed. A module is flagged as slipping (running faster than commanded),
+    stalled (well below the commanded speed) or misaligned (angle off while
+    driving), with hysteresis so a flag doesn't flicker. Only the averages
+    and status codes are published, a few times a second and whenever a
+    status changes.
+    """
+
+    def __init__(self, time_constant: float = TIME_CONSTANT, publish_hz: float = PUBLISH_HZ) -> None:
+        self.time_constant = time_constant
+        self.angle_error = [0.0] * MODULE_COUNT
+        """Average absolute angle error while driving (radians)"""
+        self.speed_error = [0.0] * MODULE_COUNT
+        """Average of measured minus commanded wheel speed (m/s)"""
+        self.speed_ratio = [1.0] * MODULE_COUNT
+        """Average of measured over commanded wheel speed while driving"""
+        self.status = [OK] * MODULE_COUNT
+
+        self._publish_period = 1.0 / publish_hz
+        self._last_publish = -math.inf
+        table = NetworkTableInstance.getDefault().getTable("ModuleHealth")
+        self._status_pub = table.getIntegerArrayTopic("Status").publish()
+        self._angle_pub = table.getDoubleArrayTopic("AngleErrorDegrees").publish()
+        self._speed_pub = table.getDoubleArrayTopic("SpeedError").publish()
+        self._healthy_pub = table.getBooleanTopic("Healthy").publish()
+
+    def update(self, state) -> None:
+        """
+        Fold one drive state (module_states, module_targets, odometry_period,
+        timestamp) into the averages.
+        """
+        dt = state.odometry_period
+        if not dt > 0.0:
+            return
+        alpha = 1.0 - math.exp(-dt / self.time_constant)
+
+        changed = False
+        for i in range(MODULE_COUNT):
+            measured = state.module_states[i]
+            target = state.module_targets[i]
+            speed = abs(measured.speed)
+            target_speed = abs(target.speed)
+
+            self.speed_error[i] += alpha * (speed - target_speed - self.speed_error[i])
+            if target_speed > MIN_TARGET_SPEED:
+                # Modulo half a turn: a flipped module with reversed speed is on target
+                angle = abs(math.remainder(measured.angle.radians() - target.angle.radians(), math.pi))
+                self.angle_error[i] += alpha * (angle - self.angle_error[i])
+                self.speed_ratio[i] += alpha * (speed / target_speed - self.speed_ratio[i])
+
+            status = self._classify(i)
+            if status != self.status[i]:
+                if status != OK:
+                    logging.warning(f"Swerve module {i} {STATUS_NAMES[status].lower()}")
+                else:
+                    logging.info(f"Swerve module {i} recovered")
+                self.status[i] = status
+                changed = True
+
+        now = state.timestamp
+        if changed or now - self._last_publish >= self._publish_period or now < self._last_publish:
+            self._last_publish = now
+            self.publish()
+
+    def _classify(self, i: int) -> int:
+        current = self.status[i]
+        ratio = self.speed_ratio[i]
+        faults = (
+            (STALLED, ratio < STALL_RATIO,
+             ratio < 1.0 - (1.0 - STALL_RATIO) * CLEAR_FRACTION),
+            (SLIPPING, self.speed_error[i] > SLIP_SPEED_ERROR,
+             self.speed_error[i] > SLIP_SPEED_ERROR * CLEAR_FRACTION),
+            (MISALIGNED, self.angle_error[i] > MISALIGN_ANGLE,
+             self.angle_error[i] > MISALIGN_ANGLE * CLEAR_FRACTION),
+        )
+        for status, tripped, holding in faults:
+            if tripped or (current == status and holding):
+                return status
+        return OK
+
+    def healthy(self) -> bool:
+        return all(status == OK for status in self.status)
+
+    def publish(self) -> None:
+        self._status_pub.set(self.status)
+        self._angle_pub.set([math.degrees(error) for error in self.angle_error])
+        self._speed_pub.set(self.speed_error)
+        self._healthy_pub.set(self.healthy())
@@ -0,0 +1,147 @@
+import math
+from array import array
+
+from ntcore import NetworkTableInstance
+from phoenix6 import SignalLogger, utils
+
+# Histogram layouts, in milliseconds
+PERIOD_BUCKET_MS = 0.25
+PERIOD_BUCKETS = 80             # 0-20 ms, plus one overflow bucket
+LATENCY_BUCKET_MS = 0.5
+LATENCY_BUCKETS = 100           # 0-50 ms, plus one overflow bucket
+
+PUBLISH_PERIOD = 1.0            # seconds per published window
+
+class Histogram:
+    """
+    Counts of values in fixed-width buckets, the last one catching overflow.
+
+    Counts only ever increase, so one thread can add while another takes
+    snapshots and works on the difference between two of them.
+    """
+
+    def __init__(self, bucket_width: float, bucket_count: int) -> None:
+        self.bucket_width = bucket_width
+        self.counts = array('q', bytes(8 * (bucket_count + 1)))
+        self._last = len(self.counts) - 1
+
+    def add(self, value: float) -> None:
+        index = int(value / self.bucket_width)
+        if index < 0:
+            index = 0
+        elif index > self._last:
+            index = self._last
+        self.counts[index] += 1
+
+    def snapshot(self) -> array:
+        return array('q', self.counts)
+
+    def edges(self) -> list[float]:
+        """
+        Upper edge of each bucket; the overflow bucket's is infinite.
+        """
+        return [self.bucket_width * (i + 1) for i in range(self._last)] + [math.inf]
+
+    def percentile(self, counts, fraction: float) -> float:
+        """
+        Upper edge of the bucket holding the given fraction of `counts`.
+        """
+        total = sum(counts)
+        if total == 0:
+            return math.nan
+        rank = fraction * total
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return self.bucket_width * (i + 1) if i < self._last else math.inf
+        return math.inf
+
+class OdometryStats:
+    """
+    Histograms of the odometry period and the drive state latency, plus DAQ
+    counts.
+
+    record() runs on the odometry thread for every state and only does a
+    bucket increment per histogram. publish() runs on the telemetry worker;
+    once per window it diffs the cumulative counts against the previous
+    window and publishes the window's histograms, p50/p99/max and failed
+    DAQs to NetworkTables under Odometry/ and to SignalLogger.
+    """
+
+    def __init__(self, publish_period: float = PUBLISH_PERIOD) -> None:
+        self.period = Histogram(PERIOD_BUCKET_MS, PERIOD_BUCKETS)
+        self.latency = Histogram(LATENCY_BUCKET_MS, LATENCY_BUCKETS)
+        self.max_period = 0.0
+        self.max_latency = 0.0
+        self.failed_daqs = 0
+
+        self._publish_period = publish_period
+        self._last_publish = -math.inf
+        self._last_period = self.period.snapshot()
+        self._last_latency = self.latency.snapshot()
+        self._last_failed = 0
+
+        table = NetworkTableInstance.getDefault().getTable("Odometry")
+        table.getDoubleArrayTopic("PeriodBucketsMs").publish().set(self.period.edges()[:-1])
+        table.getDoubleArrayTopic("LatencyBucketsMs").publish().set(self.latency.edges()[:-1])
+        self._period_pub = table.getIntegerArrayTopic("PeriodHistogram").publish()
+        self._latency_pub = table.getIntegerArrayTopic("LatencyHistogram").publish()
+        self._summary_pub = table.getDoubleArrayTopic("PeriodMs").publish()
+        self._latency_summary_pub = table.getDoubleArrayTopic("LatencyMs").publish()
+        self._failed_pub = table.getIntegerTopic("FailedDaqs").publish()
+        self._failed_window_pub = table.getIntegerTopic("FailedDaqsPerWindow").publish()
+
+    def record(self, state) -> None:
+        """
+        Add one drive state. Called on the odometry thread.
+        """
+        period_ms = state.odometry_period * 1000.0
+        latency_ms = (utils.get_current_time_seconds() - state.timestamp) * 1000.0
+        self.period.add(period_ms)
+        self.latency.add(latency_ms)
+        if period_ms > self.max_period:
+            self.max_period = period_ms
+        if latency_ms > self.max_latency:
+            self.max_latency = latency_ms
+        self.failed_daqs = state.failed_daqs
+
+    def publish(self, now: float) -> None:
+        """
+        Publish the window ending at `now` if it is complete.
+        """
+        if 0.0 <= now - self._last_publish < self._publish_period:
+            return
+        self._last_publish = now
+
+        period = self.period.snapshot()
+        latency = self.latency.snapshot()
+        period_window = [new - old for new, old in zip(period, self._last_period)]
+        latency_window = [new - old for new, old in zip(latency, self._last_latency)]
+        self._last_period = period
+        self._last_latency = latency
+        failed = self.failed_daqs
+        failed_window = failed - self._last_failed
+        self._last_failed = failed
+
+        period_summary = [self.period.percentile(period_window, 0.5),
+                          self.period.percentile(period_window, 0.99),
+                          self.max_period]
+        latency_summary = [self.latency.percentile(latency_window, 0.5),
+                           self.latency.percentile(latency_window, 0.99),
+                           self.max_latency]
+        self.max_period = 0.0
+        self.max_latency = 0.0
+
+        self._period_pub.set(period_window)
+        self._latency_pub.set(latency_window)
+        self._summary_pub.set(period_summary)
+        self._latency_summary_pub.set(latency_summary)
+        self._failed_pub.set(failed)
+        self._failed_window_pub.set(failed_window)
+
+        SignalLogger.write_double_array("Odometry/PeriodHistogram", [float(count) for count in period_window])
+        SignalLogger.write_double_array("Odometry/LatencyHistogram", [float(count) for count in latency_window])
+        SignalLogger.write_double_array("Odometry/PeriodMs", period_summary)
+        SignalLogger.write_double_array("Odometry/LatencyMs", latency_summary)
+        SignalLogger.write_integer("Odometry/FailedDaqs", failed)
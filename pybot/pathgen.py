@@ -0,0 +1,170 @@
+"""
+Straight-line swerve trajectories generated on the robot.
+
+PathGenerator turns the current pose and a target (e.g. the nearest reef
+face) into a time-parameterized SampleTable in well under a millisecond, so
+it can be built when a button is pressed and followed by the same
+FollowTrajectory command that runs the Choreo files.
+"""
+
+import math
+from array import array
+
+from wpimath.geometry import Pose2d
+
+from trajectories import SampleTable
+
+SAMPLE_PERIOD = 0.02            # seconds between samples
+
+MAX_SPEED = 3.0                 # m/s
+MAX_ACCELERATION = 3.0          # m/s²
+MAX_ANGULAR_SPEED = math.radians(360.0)
+MAX_ANGULAR_ACCELERATION = math.radians(720.0)
+
+class TrapezoidMove:
+    """
+    Closed-form trapezoidal velocity profile over a distance, starting at
+    `start_speed` and ending at rest. Becomes a triangle when the distance
+    is too short to reach `max_speed`.
+
+    With a `duration` longer than the fastest profile, the cruise speed is
+    lowered until the move takes that long; the start speed is kept, so a
+    move that starts faster than its cruise speed slows down to it first.
+    """
+    __slots__ = ('distance', 'start_speed', 'acceleration', 'start_acceleration', 'peak',
+                 'accel_time', 'cruise_end', 'total', 'accel_distance')
+
+    def __init__(self, distance: float, max_speed: float, max_acceleration: float,
+                 start_speed: float = 0.0, duration: float | None = None) -> None:
+        a = max_acceleration
+        # Can't start faster than the limit or than allows stopping in time
+        v0 = min(max(start_speed, 0.0), max_speed, math.sqrt(2.0 * a * distance))
+        peak = min(math.sqrt((2.0 * a * distance + v0 * v0) / 2.0), max_speed)
+        peak = max(peak, v0)
+
+        self.distance = distance
+        self.start_speed = v0
+        self.acceleration = a
+        self._plan(peak)
+        if duration is not None and duration > self.total and distance > 0.0:
+            # The duration only grows as the cruise speed drops, so bisect
+            low, high = 0.0, peak
+            for _ in range(60):
+                self._plan(0.5 * (low + high))
+                if self.total > duration:
+                    low = self.peak
+                else:
+                    high = self.peak
+            self._plan(high)
+
+    def _plan(self, peak: float) -> None:
+        """
+        Lay out the profile for a cruise speed of `peak`.
+        """
+        a = self.acceleration
+        v0 = self.start_speed
+        self.peak = peak
+        self.start_acceleration = a if peak >= v0 else -a
+        self.accel_time = abs(peak - v0) / a
+        self.accel_distance = 0.5 * (v0 + peak) * self.accel_time
+        cruise = max(0.0, self.distance - self.accel_distance - peak * peak / (2.0 * a))
+        self.cruise_end = self.accel_time + (cruise / peak if peak > 0.0 else 0.0)
+        self.total = self.cruise_end + peak / a
+
+    def at(self, t: float) -> tuple[float, float, float]:
+        """
+        Returns (position, velocity, acceleration) at time `t`.
+        """
+        a = self.acceleration
+        if t <= 0.0:
+            return 0.0, self.start_speed, 0.0
+        if t < self.accel_time:
+            a0 = self.start_acceleration
+            return self.start_speed * t + 0.5 * a0 * t * t, self.start_speed + a0 * t, a0
+        if t < self.cruise_end:
+            return self.accel_distance + self.peak * (t - self.accel_time), self.peak, 0.0
+        if t < self.total:
+            remaining = self.total - t
+            return self.distance - 0.5 * a * remaining * remaining, a * remaining, -a
+        return self.distance, 0.0, 0.0
+
+class PathGenerator:
+    """
+    Generates a straight-line trajectory from one pose to another.
+
+    Translation and heading each follow a trapezoidal profile within their
+    limits; the shorter one is re-planned with a lower cruise speed to
+    finish together with the longer one, which keeps it within its limits
+    and keeps the start speed. Samples are in field
+    coordinates, so the same table is used for both alliances.
+    """
+
+    def __init__(self, max_speed: float = MAX_SPEED, max_acceleration: float = MAX_ACCELERATION,
+                 max_angular_speed: float = MAX_ANGULAR_SPEED,
+                 max_angular_acceleration: float = MAX_ANGULAR_ACCELERATION,
+                 sample_period: float = SAMPLE_PERIOD) -> None:
+        self.max_speed = max_speed
+        self.max_acceleration = max_acceleration
+        self.max_angular_speed = max_angular_speed
+        self.max_angular_acceleration = max_angular_acceleration
+        self.sample_period = sample_period
+
+    def generate(self, start: Pose2d, target: Pose2d,
+                 start_velocity: tuple[float, float] = (0.0, 0.0),
+                 name: str = 'generated') -> SampleTable:
+        """
+        :param start: The current pose of the robot.
+        :param target: The pose to end at, at rest.
+        :param start_velocity: Current field-centric (vx, vy); the part along
+                               the path is kept instead of stopping first.
+        """
+        x0 = start.X()
+        y0 = start.Y()
+        dx = target.X() - x0
+        dy = target.Y() - y0
+        distance = math.hypot(dx, dy)
+        ux, uy = (dx / distance, dy / distance) if distance > 1e-9 else (0.0, 0.0)
+        along = start_velocity[0] * ux + start_velocity[1] * uy
+
+        heading0 = start.rotation().radians()
+        turn = math.remainder(target.rotation().radians() - heading0, math.tau)
+        direction = 1.0 if turn >= 0.0 else -1.0
+
+        move = TrapezoidMove(distance, self.max_speed, self.max_acceleration, along)
+        rotate = TrapezoidMove(abs(turn), self.max_angular_speed, self.max_angular_acceleration)
+        total = max(move.total, rotate.total)
+        # Stretch the shorter profile to the full duration
+        if move.total < total:
+            move = TrapezoidMove(distance, self.max_speed, self.max_acceleration, along, total)
+        elif rotate.total < total:
+            rotate = TrapezoidMove(abs(turn), self.max_angular_speed, self.max_angular_acceleration,
+                                   0.0, total)
+
+        count = max(1, math.ceil(total / self.sample_period - 1e-9)) + 1
+        t = array('d', bytes(8 * count))
+        x = array('d', t)
+        y = array('d', t)
+        heading = array('d', t)
+        vx = array('d', t)
+        vy = array('d', t)
+        omega = array('d', t)
+        ax = array('d', t)
+        ay = array('d', t)
+        alpha = array('d', t)
+
+        for i in range(count):
+            time = min(i * self.sample_period, total)
+            p, v, acc = move.at(time)
+            theta, w, w_dot = rotate.at(time)
+            t[i] = time
+            x[i] = x0 + ux * p
+            y[i] = y0 + uy * p
+            heading[i] = math.remainder(heading0 + direction * theta, math.tau)
+            vx[i] = ux * v
+            vy[i] = uy * v
+            omega[i] = direction * w
+            ax[i] = ux * acc
+            ay[i] = uy * acc
+            alpha[i] = direction * w_dot
+
+        return SampleTable.fromArrays(name, t, x, y, heading, vx, vy, omega, ax, ay, alpha)
@@ -1,13 +1,85 @@
-# Trimmed copy of the drivetrain example here:
+# Physics for the elevator and intake mechanisms. Based on the example here:
 # https://robotpy.readthedocs.io/projects/pyfrc/en/stable/physics.html
+#
+# The swerve drive isn't modelled here; Phoenix simulates it from
+# CommandSwerveDrivetrain's own sim thread.
 
-import hal.simulation
-from pyfrc.physics import drivetrains
+import math
+import typing
+import wpilib
+from wpilib.simulation import BatterySim, DCMotorSim, ElevatorSim, RoboRioSim
+from wpimath.system.plant import DCMotor, LinearSystemId
+from pyfrc.physics.core import PhysicsInterface
+
+import elevator
+import intake
+
+if typing.TYPE_CHECKING:
+    from robot import MyRobot
+
+SIM_PERIOD = 0.005  # seconds, same as the drivetrain's sim loop
 
 class PhysicsEngine:
 
-    def __init__(self, physics_controller):
-        pass
+    def __init__(self, physics_controller: PhysicsInterface, robot: "MyRobot"):
+        self.physics_controller = physics_controller
+        self.elevator = robot.container.elevator
+        self.intake = robot.container.intake
+
+        self.elevator_sim = ElevatorSim(
+            DCMotor.krakenX60(2),
+            elevator.GEAR_RATIO,
+            elevator.CARRIAGE_MASS,
+            elevator.DRUM_RADIUS,
+            elevator.MIN_HEIGHT,
+            elevator.MAX_HEIGHT,
+            True,
+            elevator.MIN_HEIGHT,
+        )
+        intake_gearbox = DCMotor.krakenX60(2)
+        self.intake_sim = DCMotorSim(
+            LinearSystemId.DCMotorSystem(intake_gearbox, intake.ROLLER_MOI, intake.GEAR_RATIO),
+            intake_gearbox,
+        )
+
+    def update_sim(self, now: float, tm_diff: float):
+        battery = wpilib.RobotController.getBatteryVoltage()
+        elevator_leader = self.elevator.motor.sim_state
+        intake_leader = self.intake.motor.sim_state
+        for sim_state in (elevator_leader, self.elevator.follower.sim_state,
+                          intake_leader, self.intake.follower.sim_state):
+            sim_state.set_supply_voltage(battery)
+
+        # Step at the sim period even though pyfrc calls us once per robot loop
+        steps = max(1, round(tm_diff / SIM_PERIOD))
+        dt = tm_diff / steps
+        for _ in range(steps):
+            self.elevator_sim.setInputVoltage(elevator_leader.motor_voltage)
+            self.elevator_sim.update(dt)
+            self.intake_sim.setInputVoltage(intake_leader.motor_voltage)
+            self.intake_sim.update(dt)
+
+        # Feed the mechanism state back into the motors' sensors
+        rotor_position = self.elevator_sim.getPosition() * elevator.ROTOR_ROTATIONS_PER_METER
+        rotor_velocity = self.elevator_sim.getVelocity() * elevator.ROTOR_ROTATIONS_PER_METER
+        self._setRotor(self.elevator, rotor_position, rotor_velocity)
+
+        rotor_position = self.intake_sim.getAngularPosition() / math.tau * intake.GEAR_RATIO
+        rotor_velocity = self.intake_sim.getAngularVelocity() / math.tau * intake.GEAR_RATIO
+        self._setRotor(self.intake, rotor_position, rotor_velocity)
+
+        # Sag the battery under the mechanism load
+        RoboRioSim.setVInVoltage(BatterySim.calculate([
+            self.elevator_sim.getCurrentDraw(),
+            self.intake_sim.getCurrentDraw(),
+        ]))
 
-    def update_sim(self, now, tm_diff):
-        pass
+    @staticmethod
+    def _setRotor(mechanism, position: float, velocity: float):
+        """
+        Set the leader's rotor state; the follower is mounted opposed.
+        """
+        mechanism.motor.sim_state.set_raw_rotor_position(position)
+        mechanism.motor.sim_state.set_rotor_velocity(velocity)
+        mechanism.follower.sim_state.set_raw_rotor_position(-position)
+        mechanism.follower.sim_state.set_rotor_velocity(-velocity)
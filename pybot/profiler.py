@@ -0,0 +1,199 @@
+import logging
+import time
+import typing
+from array import array
+from ntcore import NetworkTableInstance
+
+DEFAULT_CAPACITY = 256
+PUBLISH_EVERY_LOOPS = 50  # 1 Hz at the 20 ms loop period
+LOOP_PHASE = "RobotPeriodic"
+
+class _Ring:
+    """
+    Fixed-size ring buffer of durations in seconds.
+    """
+    __slots__ = ('values', 'index', 'count')
+
+    def __init__(self, capacity: int) -> None:
+        self.values = array ('d', bytes (8 * capacity))
+        self.index = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.values[self.index] = value
+        self.index = (self.index + 1) % len (self.values)
+        if self.count < len (self.values):
+            self.count += 1
+
+    def stats(self) -> tuple[float, float, float]:
+        """
+        Returns (p50, p99, max) in seconds over the buffered values.
+        """
+        if self.count == 0:
+            return (0.0, 0.0, 0.0)
+        ordered = sorted (self.values[:self.count])
+        last = self.count - 1
+        return (ordered[last // 2], ordered[(last * 99) // 100], ordered[last])
+
+class LoopProfiler:
+    """
+    Records how long each part of the robot loop takes.
+
+    Durations go into fixed-size ring buffers per phase (and per command), and
+    p50/p99/max in milliseconds are published to NetworkTables under
+    `Profiler/<phase>` every PUBLISH_EVERY_LOOPS loops. Overruns are logged at
+    most once per publish window, with their count and the worst loop's
+    slowest phase.
+
+    When disabled nothing is wrapped or hooked, so the only cost left is the
+    `enabled` check in the robot loop.
+
+    Phases are recorded from the main thread, except instrumented methods
+    marked `in_loop=False` (e.g. telemetry on the odometry thread), which get
+    their own ring but don't count towards the loop budget.
+    """
+
+    def __init__(self, budget: float, enabled: bool = True, capacity: int = DEFAULT_CAPACITY) -> None:
+        """
+        :param budget: The loop period in seconds; loops longer than this are overruns.
+        :param enabled: Whether to record anything at all.
+        :param capacity: Number of samples kept per phase.
+        """
+        self.budget = budget
+        self.enabled = enabled
+        self.overruns = 0
+        self._window_overruns = 0
+        self._window_worst = (0.0, 0.0, "unknown")
+        self._capacity = capacity
+        self._rings: dict[str, _Ring] = {}
+        self._loop: dict[str, float] = {}
+        self._loop_start = 0.0
+        self._loops = 0
+        self._last_command_stamp = 0.0
+        self._publishers = {}
+        self._ring (LOOP_PHASE)
+        self._table = NetworkTableInstance.getDefault().getTable ("Profiler")
+        self._overrun_pub = self._table.getIntegerTopic ("Overruns").publish()
+
+    def _ring(self, phase: str) -> _Ring:
+        ring = self._rings.get (phase)
+        if ring is None:
+            ring = self._rings[phase] = _Ring (self._capacity)
+        return ring
+
+    def record(self, phase: str, seconds: float) -> None:
+        """
+        Add one duration for a phase of the main loop.
+        """
+        self._ring (phase).add (seconds)
+        self._loop[phase] = self._loop.get (phase, 0.0) + seconds
+
+    def instrument(self, obj, method: str, phase: str | None = None, in_loop: bool = True) -> None:
+        """
+        Replace `obj.method` with a wrapper that records its run time.
+
+        Must be called before anything captures the bound method (e.g. before
+        registering it as a callback).
+
+        :param obj: The object owning the method.
+        :param method: Name of the method to time.
+        :param phase: Name to report under, defaults to `Class.method`.
+        :param in_loop: False if the method runs outside the main loop thread.
+        """
+        if not self.enabled:
+            return
+        phase = phase or f"{type (obj).__name__}.{method}"
+        wrapped = getattr (obj, method)
+        clock = time.perf_counter
+        if in_loop:
+            record = lambda seconds: self.record (phase, seconds)
+        else:
+            record = self._ring (phase).add
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return wrapped (*args, **kwargs)
+            finally:
+                record (clock() - start)
+
+        setattr (obj, method, timed)
+
+    def watchScheduler(self, scheduler) -> None:
+        """
+        Time each command's execute() through the scheduler's execute hook.
+
+        The hook runs right after each execute(), so a command's time is
+        measured from the previous hook. The first command of a loop also
+        carries the subsystem periodic() calls and button polling that the
+        scheduler runs before it.
+        """
+        if not self.enabled:
+            return
+        clock = time.perf_counter
+
+        def onExecute(command) -> None:
+            now = clock()
+            self.record (f"Command/{command.getName()}", now - self._last_command_stamp)
+            self._last_command_stamp = now
+
+        scheduler.onCommandExecute (onExecute)
+
+    def beginLoop(self) -> None:
+        """
+        Call at the start of robotPeriodic.
+        """
+        self._loop.clear()
+        self._loop_start = time.perf_counter()
+        self._last_command_stamp = self._loop_start
+
+    def endLoop(self) -> None:
+        """
+        Call at the end of robotPeriodic.
+        """
+        elapsed = time.perf_counter() - self._loop_start
+        phases = [(t, name) for name, t in self._loop.items()]
+        self.record (LOOP_PHASE, elapsed)
+        if elapsed > self.budget:
+            self.overruns += 1
+            self._window_overruns += 1
+            if elapsed > self._window_worst[0]:
+                slowest = max (phases) if phases else (0.0, "unknown")
+                self._window_worst = (elapsed, slowest[0], slowest[1])
+
+        self._loops += 1
+        if self._loops % PUBLISH_EVERY_LOOPS == 0:
+            self._logOverruns()
+            self.publish()
+
+    def _logOverruns(self) -> None:
+        if self._window_overruns == 0:
+            return
+        elapsed, slowest, phase = self._window_worst
+        logging.warning (f"{self._window_overruns} loop overrun(s) in the last {PUBLISH_EVERY_LOOPS} loops, "
+                         f"worst {elapsed * 1000:.2f} ms (budget {self.budget * 1000:.0f} ms), "
+                         f"slowest: {phase} {slowest * 1000:.2f} ms")
+        self._window_overruns = 0
+        self._window_worst = (0.0, 0.0, "unknown")
+
+    def publish(self) -> None:
+        """
+        Push p50/p99/max (milliseconds) of every phase to NetworkTables.
+        """
+        for phase, ring in list (self._rings.items()):
+            pub = self._publishers.get (phase)
+            if pub is None:
+                pub = self._publishers[phase] = self._table.getDoubleArrayTopic (phase).publish()
+            p50, p99, worst = ring.stats()
+            pub.set ([p50 * 1000.0, p99 * 1000.0, worst * 1000.0])
+        self._overrun_pub.set (self.overruns)
+
+    def phases(self) -> typing.Iterable[str]:
+        return list (self._rings.keys())
+
+    def stats(self, phase: str) -> tuple[float, float, float]:
+        """
+        Returns (p50, p99, max) in seconds for a phase.
+        """
+        ring = self._rings.get (phase)
+        return ring.stats() if ring else (0.0, 0.0, 0.0)
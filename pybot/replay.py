@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Replays a match log through the drive controllers, as fast as it can be read.
+
+Logged joystick axes are fed through the same DriveInputShaper that
+RobotContainer.defaultDriveRequest uses, and during autonomous the logged
+pose is fed through the TrajectoryController behind
+CommandSwerveDrivetrain.follow_trajectory. The outputs are written as CSV
+and can be diffed against a previous run, so a controller change can be
+regression-tested against real match data.
+
+Joystick and DS state come from the wpilog that DataLogManager writes. The
+pose is read from the same file (the DriveState/Pose NetworkTables mirror)
+or, at the full odometry rate, from a SignalLogger hoot converted with owlet.
+
+Run from the pybot directory:
+    python replay.py match.wpilog --out new.csv --compare old.csv --trajectory leftscore
+"""
+
+import argparse
+import csv
+import math
+import sys
+import time
+from typing import Iterator
+
+from wpimath.geometry import Pose2d, Rotation2d
+from wpimath.kinematics import ChassisSpeeds
+from wpimath.units import rotationsToRadians
+
+import robotcontainer
+from generated.tuner_constants import TunerConstants
+from inputshaper import DriveInputShaper
+from logstream import LogStream
+from subsystems.command_swerve_drivetrain import TrajectoryController
+from trajectories import SampleTable, TrajectorySampler, TrajectoryStore
+
+# Xbox controller layout, as bound in RobotContainer
+LEFT_X_AXIS = 0
+LEFT_Y_AXIS = 1
+RIGHT_X_AXIS = 4
+GEAR_SWITCH_BUTTON = 1      # B, zero-based
+
+ENTRIES = {
+    'axes': ('DS:joystick0/axes', 'float[]'),
+    'buttons': ('DS:joystick0/buttons', 'boolean[]'),
+    'enabled': ('DS:enabled', 'boolean'),
+    'autonomous': ('DS:autonomous', 'boolean'),
+    # x, y, degrees at the odometry rate (SignalLogger, converted with owlet)
+    'pose': ('DriveState/Pose', 'double[]'),
+    # x, y, radians at the NetworkTables rate (DataLogManager)
+    'ntpose': ('DriveState/Pose', 'struct:Pose2d'),
+}
+
+CSV_FIELDS = ('channel', 'time', 'vx', 'vy', 'omega')
+DEFAULT_TOLERANCE = 1e-6
+
+class Replay:
+    """
+    Re-runs the controllers over a stream of logged records.
+
+    :param trajectory: The trajectory that ran in autonomous, if any.
+    :param red: The alliance the match was played on.
+    """
+
+    def __init__(self, trajectory: SampleTable | None = None, red: bool = False) -> None:
+        self.shaper = DriveInputShaper(
+            TunerConstants.speed_at_12_volts,
+            rotationsToRadians(TunerConstants.angular_at_12_volts),
+            robotcontainer.DEAD_BAND, robotcontainer.DRIVE_EXPONENT,
+            robotcontainer.MAX_SPEED_SCALING, robotcontainer.MAX_SPEED_ROT)
+        # Same signs as RobotContainer.configureButtonBindings
+        self.shaper.setSigns(1.0 if red else -1.0, -1.0)
+        self.controller = TrajectoryController()
+        self.sampler = TrajectorySampler(trajectory) if trajectory is not None else None
+        self.red = red
+        self.records = 0
+
+        self._speeds = ChassisSpeeds()
+        self._enabled = False
+        self._autonomous = False
+        self._auto_start: float | None = None
+        self._slowmo = False
+        self._gear_button = False
+        self._full_rate_pose = False
+
+    def run(self, records: Iterator[tuple[str, float, object]]) -> Iterator[tuple[str, float, float, float, float]]:
+        """
+        Yield a (channel, time, vx, vy, omega) row for every controller output.
+        """
+        for key, t, value in records:
+            self.records += 1
+            if key == 'axes':
+                if self._enabled and not self._autonomous and len(value) > RIGHT_X_AXIS:
+                    shaper = self.shaper
+                    shaper.update(value[LEFT_X_AXIS], value[LEFT_Y_AXIS], value[RIGHT_X_AXIS])
+                    yield ('drive', t, shaper.vx, shaper.vy, shaper.omega)
+            elif key == 'buttons':
+                pressed = len(value) > GEAR_SWITCH_BUTTON and value[GEAR_SWITCH_BUTTON]
+                if pressed and not self._gear_button:
+                    self._gearSwitch()
+                self._gear_button = pressed
+            elif key == 'enabled' or key == 'autonomous':
+                if key == 'enabled':
+                    self._enabled = value
+                else:
+                    self._autonomous = value
+                if not (self._enabled and self._autonomous):
+                    self._auto_start = None
+                elif self._auto_start is None:
+                    self._auto_start = t
+                    if self.sampler is not None:
+                        self.sampler.reset()
+            elif key == 'pose' or key == 'ntpose':
+                if key == 'pose':
+                    self._full_rate_pose = True
+                    pose = Pose2d(value[0], value[1], Rotation2d.fromDegrees(value[2]))
+                elif self._full_rate_pose:
+                    continue
+                else:
+                    pose = Pose2d(value[0], value[1], Rotation2d(value[2]))
+                if self._auto_start is not None and self.sampler is not None:
+                    sample = self.sampler.sample(t - self._auto_start, self.red)
+                    speeds = self.controller.calculate(pose, sample, self._speeds)
+                    yield ('follow', t, speeds.vx, speeds.vy, speeds.omega)
+
+    def _gearSwitch(self) -> None:
+        # Mirrors RobotContainer.gear_switch
+        self._slowmo = not self._slowmo
+        if self._slowmo:
+            self.shaper.setScaling(robotcontainer.SLOWMO_SPEED_SCALING, robotcontainer.SLOWMO_SPEED_ROT)
+        else:
+            self.shaper.setScaling(robotcontainer.MAX_SPEED_SCALING, robotcontainer.MAX_SPEED_ROT)
+
+class Diff:
+    """
+    Compares output rows with a previous run, row by row.
+    """
+
+    def __init__(self, baseline_path: str, tolerance: float = DEFAULT_TOLERANCE) -> None:
+        self._file = open(baseline_path, newline='')
+        self._rows = csv.reader(self._file)
+        next(self._rows, None)
+        self.tolerance = tolerance
+        self.compared = 0
+        self.mismatches = 0
+        self.missing = 0
+        self.extra = 0
+        self.max_error = dict.fromkeys(CSV_FIELDS[2:], 0.0)
+        self.first_mismatch: tuple | None = None
+
+    def check(self, row: tuple) -> None:
+        old = next(self._rows, None)
+        if old is None:
+            self.extra += 1
+            return
+        if old[0] != row[0] or abs(float(old[1]) - row[1]) > 1e-9:
+            # The inputs differ, not just the controller
+            self.mismatches += 1
+            self.first_mismatch = self.first_mismatch or (old, row)
+            return
+        self.compared += 1
+        worst = 0.0
+        for i, field in enumerate(CSV_FIELDS[2:], 2):
+            error = abs(float(old[i]) - row[i])
+            self.max_error[field] = max(self.max_error[field], error)
+            worst = max(worst, error)
+        if worst > self.tolerance:
+            self.mismatches += 1
+            self.first_mismatch = self.first_mismatch or (old, row)
+
+    def finish(self) -> None:
+        self.missing = sum(1 for _ in self._rows)
+        self._file.close()
+
+    def passed(self) -> bool:
+        return self.mismatches == 0 and self.missing == 0 and self.extra == 0
+
+    def report(self) -> str:
+        lines = ["compared %d rows: %d over tolerance %g, %d missing, %d extra" % (
+            self.compared, self.mismatches, self.tolerance, self.missing, self.extra)]
+        lines.append("max error: " + ", ".join("%s %.3g" % item for item in self.max_error.items()))
+        if self.first_mismatch is not None:
+            old, new = self.first_mismatch
+            lines.append("first mismatch: baseline %s, now %s" % (
+                ",".join(old), ",".join(repr(value) for value in new)))
+        return "\n".join(lines)
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('log', help='wpilog file')
+    parser.add_argument('--out', default='replay.csv', help='controller outputs to write')
+    parser.add_argument('--compare', help='outputs of a previous run to diff against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--trajectory', help='trajectory that ran in autonomous')
+    parser.add_argument('--red', action='store_true', help='the match was played on the red alliance')
+    args = parser.parse_args(argv)
+
+    table = None
+    if args.trajectory:
+        store = TrajectoryStore()
+        store.load(args.trajectory)
+        table = store.get(args.trajectory)
+        if table is None:
+            return 1
+
+    replay = Replay(table, args.red)
+    diff = Diff(args.compare, args.tolerance) if args.compare else None
+    start = time.perf_counter()
+    rows = 0
+    with open(args.out, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        for row in replay.run(LogStream(args.log).stream(ENTRIES)):
+            writer.writerow(row)
+            rows += 1
+            if diff is not None:
+                diff.check(row)
+    elapsed = time.perf_counter() - start
+
+    print("%d records, %d outputs in %.2f s (%.0f records/s), written to %s" % (
+        replay.records, rows, elapsed, replay.records / elapsed if elapsed > 0 else math.inf, args.out))
+    if diff is None:
+        return 0
+    diff.finish()
+    print(diff.report())
+    return 0 if diff.passed() else 1
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -5,13 +5,20 @@
 # the WPILib BSD license file in the root directory of this project.
 #
 
+# First, so the startup timeline covers the imports of the robot code
+import startup
+startup.timeline.timeImports()
+
+import logging
 import typing
 import wpilib, commands2
 
 import autos
+from profiler import LoopProfiler
 from robotcontainer import RobotContainer
 
 LATENCY_SECONDS = 0.02
+PROFILE_LOOP = False    # set True to publish loop timing under Profiler/
 
 class MyRobot(wpilib.TimedRobot):
     autonomousCommand: typing.Optional[commands2.Command] = None
@@ -21,19 +28,48 @@ class MyRobot(wpilib.TimedRobot):
         super().__init__(LATENCY_SECONDS)
     
     def robotInit(self) -> None:
-        self.container = RobotContainer()
+        timeline = startup.timeline
+        logging.basicConfig(level=logging.DEBUG)
+        with timeline.stage("DataLogManager"):
+            # Record DS state and joysticks (and mirror NetworkTables) for replay.py
+            wpilib.DataLogManager.start()
+            wpilib.DriverStation.startDataLog(wpilib.DataLogManager.getLog())
+        with timeline.stage("RobotContainer"):
+            self.container = RobotContainer()
         self.scheduler = commands2.CommandScheduler.getInstance()
-        self.registerTrajectories()
+        with timeline.stage("Trajectory chooser"):
+            self.registerTrajectories()
+        self.registerProfiler()
+        timeline.finish()
 
     def registerTrajectories(self) -> None:
-        self.chooser = autos.createChooser()
+        self.chooser = autos.createChooser(self.container.trajectories.names())
         wpilib.SmartDashboard.putData ('Trajectory Files', self.chooser)
 
+    def registerProfiler(self) -> None:
+        self.profiler = LoopProfiler (LATENCY_SECONDS, PROFILE_LOOP)
+        self.profiler.instrument (self.container.drivetrain, 'periodic', 'CommandSwerveDrivetrain.periodic')
+        self.profiler.instrument (self.container, 'defaultDriveRequest', 'RobotContainer.defaultDriveRequest')
+        # Telemetry runs on Phoenix's odometry thread, outside the main loop
+        self.profiler.instrument (self.container._logger, 'telemeterize', 'Telemetry.telemeterize', in_loop=False)
+        self.profiler.watchScheduler (self.scheduler)
+
     def selectedTrajectory(self) -> str:
         return self.chooser.getSelected()
 
     def robotPeriodic(self) -> None:
+        if self.profiler.enabled:
+            self.profiler.beginLoop()
+            self.runLoop()
+            self.profiler.endLoop()
+        else:
+            self.runLoop()
+
+    def runLoop(self) -> None:
+        # Read all mechanism feedback at once, run commands, then send outputs
+        self.container.signals.refresh()
         self.scheduler.run()
+        self.container.motorBatch.flush()
 
     def disabledInit(self) -> None:
         pass
@@ -9,19 +9,25 @@ import commands2.button
 import commands2.cmd
 #from commands2.sysid import SysIdRoutine
 from generated.tuner_constants import TunerConstants
-from telemetry import Telemetry
+from telemetry import Telemetry, TelemetryPublisher
 from wpimath.geometry import Pose2d # , Rotation2d
 from phoenix6 import swerve#, SignalLogger
 from wpimath.units import rotationsToRadians
 from intake import Intake  # Import the Intake class
 from elevator import Elevator  # Import the Elevator class
+from dualmotor import ControlBatch
+import statussignals
+from trajectories import TrajectoryStore
+from fieldlayout import FieldLayout
+from inputshaper import DriveInputShaper
+from vision import VisionSystem
+from visionfusion import VisionFusion
+from startup import timeline
+import concurrent.futures
 import wpilib
 import logging
 import math
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
-
 
 MAX_SPEED_SCALING = 0.55
 CURRENT_SPEED_SCALING = MAX_SPEED_SCALING
@@ -31,12 +37,12 @@ MAX_SPEED_ROT = .1
 SLOWMO_SPEED_ROT = .03
 
 DEAD_BAND = 0.03
+DRIVE_EXPONENT = 4.0 # Exponential factor (try 2, 2.5, or 3)
 ELEVATOR_MOTOR_ID_1 = 20
 ELEVATOR_MOTOR_ID_2 = 14
 
 INTAKE_MOTOR_ID_TOP = 18
 INTAKE_MOTOR_ID_BOTTOM = 22
-DUMMY_POSE = Pose2d(2, 1, 1/2)
 
 class RobotContainer:
     """
@@ -56,7 +62,7 @@ class RobotContainer:
 
         # Setting up bindings for necessary control of the swerve drive platform
         self._deadband = DEAD_BAND # The input deadband
-        self._exponent = 4.0 # Exponential factor (try 2, 2.5, or 3)
+        self._exponent = DRIVE_EXPONENT
 
         self._drive = (
             swerve.requests.FieldCentric()
@@ -68,49 +74,102 @@ class RobotContainer:
                 swerve.SwerveModule.DriveRequestType.VELOCITY
             )
         )
+        self._shaper = DriveInputShaper(
+            self._max_speed, self._max_angular_rate,
+            self._deadband, self._exponent,
+            MAX_SPEED_SCALING, MAX_SPEED_ROT
+        )
         self._brake = swerve.requests.SwerveDriveBrake()
         self._point = swerve.requests.PointWheelsAt()
         self.slowmo = False
 
-        self._logger = Telemetry(self._max_speed)
+        with timeline.stage("Telemetry"):
+            self._logger = Telemetry(self._max_speed)
 
-        self.drivetrain = TunerConstants.create_drivetrain()
         self.current_drive_speed = MAX_SPEED_SCALING
         self.current_rot_speed = MAX_SPEED_ROT
 
-        # Initialize the elevator with motor IDs
-        self.elevator = Elevator(ELEVATOR_MOTOR_ID_1, ELEVATOR_MOTOR_ID_2)
-        # Initialize the intake with motor IDs
-        self.intake = Intake(INTAKE_MOTOR_ID_TOP, INTAKE_MOTOR_ID_BOTTOM)
-        
+        # Mechanism outputs are collected and sent once per loop, and their
+        # feedback signals are refreshed together once per loop
+        self.motorBatch = ControlBatch()
+        self.signals = statussignals.SignalRegistry()
+        # The elevator registers itself with the scheduler from a worker
+        # thread below; create the scheduler here so only one ever exists
+        commands2.CommandScheduler.getInstance()
+
+        # Applying a configuration blocks until the device acknowledges it, so
+        # the mechanisms are configured on worker threads while the drivetrain
+        # is built and the field and trajectories are parsed here
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="DeviceConfig") as pool:
+            elevator = pool.submit(self._timed, "Elevator", Elevator,
+                                   ELEVATOR_MOTOR_ID_1, ELEVATOR_MOTOR_ID_2, self.motorBatch, self.signals)
+            intake = pool.submit(self._timed, "Intake", Intake,
+                                 INTAKE_MOTOR_ID_TOP, INTAKE_MOTOR_ID_BOTTOM, self.motorBatch, self.signals)
+
+            with timeline.stage("Drivetrain"):
+                self.drivetrain = TunerConstants.create_drivetrain()
+
+            # AprilTag positions and reef scoring poses, computed once
+            with timeline.stage("FieldLayout"):
+                self.field = FieldLayout()
+
+            # Parse every trajectory now so autonomousInit doesn't have to
+            with timeline.stage("Trajectories"):
+                self.trajectories = TrajectoryStore()
+                self.trajectories.loadAll()
+
+            self.elevator = elevator.result()
+            self.intake = intake.result()
+
+        # Turn off every status signal nobody reads
+        with timeline.stage("Bus utilization"):
+            self._optimizeBusUtilization()
+
         # Setup telemetry
         self._registerTelemetry()
 
+        # Limelights are discovered and polled in the background, and their
+        # pose estimates are fused into odometry on the poll threads
+        self.vision = VisionSystem()
+        self.visionFusion = VisionFusion(self.drivetrain)
+        self.vision.addListener(self.visionFusion.addResult)
+        if wpilib.RobotBase.isReal():
+            self.vision.start()
 
-    def calculateJoystick(self) -> tuple[float, float]:
-            x0, y0 = self._joystick.getLeftX(), self._joystick.getLeftY()
-            magnitude = self.applyExponential(math.hypot(x0, y0), self._deadband, self._exponent) * self._max_speed * self.current_drive_speed
-            theta = math.atan2(y0, x0)
 
-            x1 = magnitude * math.cos(theta)
-            y1 = magnitude * math.sin(theta)
+    @staticmethod
+    def _timed(name: str, factory, *args):
+        with timeline.stage(name):
+            return factory(*args)
 
-            return x1, y1
+    def calculateJoystick(self) -> tuple[float, float]:
+            return self._shaper.translate(self._joystick.getLeftX(), self._joystick.getLeftY())
     
     def defaultDriveRequest(self) -> swerve.requests.SwerveRequest:
-            (new_vx, new_vy) = self.calculateJoystick()
+            shaper = self._shaper
+            shaper.update(self._joystick.getLeftX(), self._joystick.getLeftY(), self._joystick.getRightX())
 
-            return (self._drive.with_velocity_x(self._driveMultiplier * new_vy # Drive left with negative X (left)
-            )  .with_velocity_y(self._driveMultiplier * new_vx) # Drive forward with negative Y (forward)
-            .with_rotational_rate(
-                self._rotMultiplier * self.applyExponential(self._joystick.getRightX(), self._deadband, self._exponent) * self._max_angular_rate * self.current_rot_speed
-            ))  # Drive counterclockwise with negative X (left)
+            return (self._drive.with_velocity_x(shaper.vx) # Drive forward with negative Y (forward)
+            .with_velocity_y(shaper.vy) # Drive left with negative X (left)
+            .with_rotational_rate(shaper.omega)) # Drive counterclockwise with negative X (left)
     
-    def create_go_to_coordinate_request(self):        
-        return self.drivetrain.go_to_coordinate(DUMMY_POSE)
+    def nearestReefTarget(self) -> Pose2d:
+        _, target = self.field.nearestScoringTarget(self.drivetrain.get_pose(), self.isRedAlliance())
+        return target
+
+    def create_go_to_coordinate_request(self) -> commands2.Command:
+        # Drive to the scoring pose of the nearest reef face
+        from autos import DriveToPose
+        return DriveToPose(self.drivetrain, self.nearestReefTarget)
+
+    def createReefPathCommand(self) -> commands2.Command:
+        # Generate a trajectory to the nearest reef face and follow it
+        from autos import FollowGeneratedPath
+        return FollowGeneratedPath(self.drivetrain, self.intake, self.nearestReefTarget)
 
     def create_point_at_coordinate_request(self):
-        return self.drivetrain.point_at_coordinate(DUMMY_POSE, self.calculateJoystick())
+        target = self.field.reefCenter(self.isRedAlliance())
+        return self.drivetrain.point_at_coordinate(target, self.calculateJoystick())
 
     def configureButtonBindings(self) -> None:
         """
@@ -123,6 +182,7 @@ class RobotContainer:
         # Cache the multiplier
         self._driveMultiplier = 1.0 if self.isRedAlliance() else -1.0
         self._rotMultiplier = -1.0
+        self._shaper.setSigns(self._driveMultiplier, self._rotMultiplier)
         
         # Note that X is defined as forward according to WPILib convention,
         # and Y is defined as to the left according to WPILib convention.
@@ -135,12 +195,14 @@ class RobotContainer:
         # Configure buttons for elevator control
         self._joystick.y().whileTrue(commands2.cmd.startEnd(
             lambda: self.elevator.moveUp(),
-            lambda: self.elevator.stop()
+            lambda: self.elevator.stop(),
+            self.elevator
         ))
 
         self._joystick.a().whileTrue(commands2.cmd.startEnd(
             lambda: self.elevator.moveDown(),
-            lambda: self.elevator.stop()
+            lambda: self.elevator.stop(),
+            self.elevator
         ))
 
         self._joystick.rightTrigger().onTrue(commands2.cmd.runOnce(self.elevator.stop, self.elevator))
@@ -157,9 +219,25 @@ class RobotContainer:
 
         self._joystick.b().onTrue(commands2.cmd.runOnce(lambda: self.gear_switch()))
 
-        #self._joystick.start().whileTrue(commands2.cmd.run(
-        #    lambda: self.create_go_to_coordinate_request(), self.drivetrain
-        #))
+        # Elevator presets on the d-pad
+        self._joystick.povDown().onTrue(self.elevatorToPreset('stow'))
+        self._joystick.povLeft().onTrue(self.elevatorToPreset('L2'))
+        self._joystick.povRight().onTrue(self.elevatorToPreset('L3'))
+        self._joystick.povUp().onTrue(self.elevatorToPreset('L4'))
+
+        self._joystick.start().whileTrue(self.create_go_to_coordinate_request())
+        self._joystick.leftTrigger().whileTrue(self.createReefPathCommand())
+
+    def elevatorToPreset(self, name: str) -> commands2.Command:
+        """
+        Command that sends the elevator to a named preset height and finishes
+        once it gets there. The motor controller keeps holding the height.
+        It requires the elevator, so manual control interrupts it.
+        """
+        return commands2.cmd.runOnce(
+            lambda: self.elevator.moveToPreset(name),
+            self.elevator
+        ).andThen(commands2.cmd.waitUntil(self.elevator.atTarget))
 
     def gear_switch(self):
         if not self.slowmo:
@@ -170,19 +248,35 @@ class RobotContainer:
             self.current_drive_speed = MAX_SPEED_SCALING
             self.current_rot_speed = MAX_SPEED_ROT
             self.slowmo = False
+        self._shaper.setScaling(self.current_drive_speed, self.current_rot_speed)
 
     def resetHeading(self) -> None:
         self.drivetrain.seed_field_centric()
 
     def getAutonomousCommand(self, selected: str) -> commands2.Command:
         from autos import FollowTrajectory
+        trajectory = self.trajectories.get (selected)
+        if trajectory is None:
+            logging.warning (f"Trajectory '{selected}' was not pre-loaded")
+            return None
         return FollowTrajectory (self.drivetrain,
                                  self.intake,
-                                 selected)
+                                 trajectory)
     
+    def _optimizeBusUtilization(self) -> None:
+        odometry_hz = TunerConstants.odometry_frequency()
+        statussignals.optimizeBusUtilization([
+            statussignals.swervePlan(self.drivetrain, odometry_hz),
+            self.elevator.signalPlan(),
+            self.intake.signalPlan(),
+        ], TunerConstants.canbus)
+
     def _registerTelemetry (self) -> None:
+        # Only copy the state on the odometry thread, publish it on another
+        self._telemetry_publisher = TelemetryPublisher(self._logger)
+        self._telemetry_publisher.start()
         self.drivetrain.register_telemetry(
-            lambda state: self._logger.telemeterize(state)
+            lambda state: self._telemetry_publisher.submit(state)
         )
 
     @staticmethod
@@ -0,0 +1,116 @@
+"""
+Startup timeline: how long robot code takes from robot.py until it is ready.
+
+robot.py imports this module first and turns on import timing. The robotpy
+launcher has already imported wpilib, hal and ntcore by then, so those (and
+the launcher itself) are not on the timeline; everything robot.py pulls in
+after that, such as commands2, phoenix6 and the robot's own modules, is.
+Each module's first import is timed (excluding the modules it imports
+itself), and robotInit wraps its steps in named stages. When robotInit is
+done, finish() logs the timeline and publishes it under Startup/ in
+NetworkTables, which DataLogManager also records, so startup after a
+brownout reboot can be checked in the match log.
+"""
+
+import builtins
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+REPORTED_IMPORTS = 10       # slowest imports listed in the log
+
+class StartupTimeline:
+    def __init__(self, clock=time.perf_counter) -> None:
+        self._clock = clock
+        self.start = clock()
+        self.stages: list[tuple[str, str, float, float]] = []
+        """(name, thread, start, duration) of each finished stage, in seconds"""
+        self.imports: dict[str, float] = {}
+        """Time spent importing each module, excluding its own imports"""
+        self.ready_time: float | None = None
+
+        self._import = None
+        self._import_thread = None
+        self._import_stack: list[float] = []
+
+    def elapsed(self) -> float:
+        return self._clock() - self.start
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time a block of startup work. Stages may run on any thread.
+        """
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.stages.append((name, threading.current_thread().name,
+                                start - self.start, self._clock() - start))
+
+    def timeImports(self) -> None:
+        """
+        Time the first import of every module on this thread until finish().
+        """
+        if self._import is None:
+            self._import = builtins.__import__
+            self._import_thread = threading.get_ident()
+            builtins.__import__ = self._timedImport
+
+    def _timedImport(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules or threading.get_ident() != self._import_thread:
+            return self._import(name, globals, locals, fromlist, level)
+
+        stack = self._import_stack
+        stack.append(0.0)
+        start = self._clock()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = self._clock() - start
+            nested = stack.pop()
+            self.imports[name] = self.imports.get(name, 0.0) + elapsed - nested
+            if stack:
+                stack[-1] += elapsed
+
+    def finish(self) -> float:
+        """
+        Mark robot code ready, stop timing imports, and report the timeline.
+        Returns the seconds since this module was imported.
+        """
+        if self._import is not None and builtins.__import__ == self._timedImport:
+            builtins.__import__ = self._import
+        self.ready_time = self.elapsed()
+        for line in self.report():
+            logging.info(line)
+        self.publish()
+        return self.ready_time
+
+    def report(self) -> list[str]:
+        lines = ["Startup ready after %.0f ms, %.0f ms of it importing" % (
+            1000.0 * (self.ready_time or self.elapsed()), 1000.0 * sum(self.imports.values()))]
+        for name, thread, start, duration in sorted(self.stages, key=lambda stage: stage[2]):
+            lines.append("  %8.1f ms  %8.1f ms  %-28s %s" % (1000.0 * start, 1000.0 * duration, name, thread))
+        slowest = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)[:REPORTED_IMPORTS]
+        if slowest:
+            lines.append("  slowest imports: " + ", ".join("%s %.0f ms" % (name, 1000.0 * seconds)
+                                                          for name, seconds in slowest))
+        return lines
+
+    def publish(self) -> None:
+        from ntcore import NetworkTableInstance
+
+        table = NetworkTableInstance.getDefault().getTable("Startup")
+        stages = sorted(self.stages, key=lambda stage: stage[2])
+        table.putNumber("ReadyMs", 1000.0 * (self.ready_time or self.elapsed()))
+        table.putStringArray("Stages", [stage[0] for stage in stages])
+        table.putNumberArray("StageStartMs", [1000.0 * stage[2] for stage in stages])
+        table.putNumberArray("StageMs", [1000.0 * stage[3] for stage in stages])
+        imports = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)
+        table.putStringArray("Imports", [name for name, _ in imports])
+        table.putNumberArray("ImportMs", [1000.0 * seconds for _, seconds in imports])
+
+timeline = StartupTimeline()
+"""The timeline of this robot program"""
@@ -0,0 +1,153 @@
+import logging
+import threading
+from phoenix6 import BaseStatusSignal, CANBus
+from phoenix6.hardware import ParentDevice
+from wpilib import SmartDashboard
+
+# Followers use these leader signals, so they have to stay on
+LEADER_SIGNAL_HZ = 100.0
+
+# Rough cost of one status frame on a CAN 2.0 bus at 1 Mbit/s: an extended
+# frame with 8 data bytes is ~128 bits before stuffing; assume worst case.
+CAN_BITRATE = 1_000_000
+BITS_PER_FRAME = 150
+
+# Signals Phoenix's odometry thread reads from each swerve module
+# (drive position/velocity, steer position/velocity), and from the Pigeon
+# (yaw and yaw rate).
+SWERVE_SIGNALS_PER_MODULE = 4
+PIGEON_SIGNALS = 2
+
+class SignalPlan:
+    """
+    The status signals one subsystem reads, and how often.
+
+    Devices listed here have every other status signal turned off when the
+    plan is applied.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.rates: list[tuple[float, list[BaseStatusSignal]]] = []
+        self.managed: list[tuple[float, int]] = []
+        self.devices: list[ParentDevice] = []
+
+    def signals(self, hz: float, *signals: BaseStatusSignal) -> "SignalPlan":
+        self.rates.append((hz, list(signals)))
+        return self
+
+    def managedSignals(self, hz: float, count: int) -> "SignalPlan":
+        """
+        Account for signals whose rate is set by someone else (e.g. Phoenix's
+        swerve odometry thread).
+        """
+        self.managed.append((hz, count))
+        return self
+
+    def device(self, *devices: ParentDevice) -> "SignalPlan":
+        self.devices.extend(devices)
+        return self
+
+    def framesPerSecond(self) -> float:
+        """
+        Upper bound on status frames per second, assuming one frame per signal.
+        """
+        return sum(hz * len(signals) for hz, signals in self.rates) \
+            + sum(hz * count for hz, count in self.managed)
+
+def swervePlan(drivetrain, odometry_hz: float) -> SignalPlan:
+    """
+    Plan for the swerve devices. Phoenix sets the odometry signal rates
+    itself, so this only lists the devices and the expected load.
+    """
+    plan = SignalPlan("Swerve")
+    for module in drivetrain.modules:
+        plan.device(module.drive_motor, module.steer_motor, module.encoder)
+    plan.device(drivetrain.pigeon2)
+    count = len(drivetrain.modules) * SWERVE_SIGNALS_PER_MODULE + PIGEON_SIGNALS
+    return plan.managedSignals(odometry_hz, count)
+
+def estimatedBusLoad(plans: list[SignalPlan]) -> float:
+    """
+    Estimated fraction of the CAN 2.0 bus used by status frames.
+    """
+    frames = sum(plan.framesPerSecond() for plan in plans)
+    return frames * BITS_PER_FRAME / CAN_BITRATE
+
+def optimizeBusUtilization(plans: list[SignalPlan], canbus: CANBus | None = None) -> float:
+    """
+    Apply every plan: set the declared signal rates, then turn off all the
+    other status signals on the plans' devices. Logs and publishes the
+    estimated (and, if a bus is given, measured) utilization.
+
+    :returns: The estimated bus load as a fraction.
+    """
+    for plan in plans:
+        for hz, signals in plan.rates:
+            BaseStatusSignal.set_update_frequency_for_all(hz, *signals)
+
+    devices = [device for plan in plans for device in plan.devices]
+    if devices:
+        ParentDevice.optimize_bus_utilization_for_all(*devices)
+
+    load = estimatedBusLoad(plans)
+    for plan in plans:
+        logging.info(f"CAN status frames, {plan.name}: {plan.framesPerSecond():.0f}/s")
+    logging.info(f"Estimated CAN bus load from status frames: {load * 100.0:.1f}%")
+    SmartDashboard.putNumber("CAN/EstimatedStatusLoad", load * 100.0)
+
+    if canbus is not None:
+        status = canbus.get_status()
+        if status.status.is_ok():
+            SmartDashboard.putNumber("CAN/MeasuredUtilization", status.bus_utilization * 100.0)
+            logging.info(f"Measured CAN bus utilization: {status.bus_utilization * 100.0:.1f}%")
+    return load
+
+class SignalRegistry:
+    """
+    Refreshes every registered status signal together, once per loop.
+
+    Subsystems register the signals they read and then use their cached
+    values; one refresh_all (or wait_for_all) call replaces a separate
+    refresh per signal, and all values come from the same point in time.
+    """
+
+    def __init__(self, wait_timeout: float = 0.0) -> None:
+        """
+        :param wait_timeout: If non-zero, block up to this many seconds for
+                             every signal to have new data (timestamp-aligned);
+                             otherwise just take the latest values.
+        """
+        self.wait_timeout = wait_timeout
+        self._signals: list[BaseStatusSignal] = []
+        # Mechanisms register while they are configured on worker threads
+        self._lock = threading.Lock()
+
+    def register(self, *signals: BaseStatusSignal) -> None:
+        """
+        Add signals to the refresh. Safe to call from several threads; the
+        order signals end up in doesn't matter to refresh().
+        """
+        with self._lock:
+            for signal in signals:
+                if all(signal is not known for known in self._signals):
+                    self._signals.append(signal)
+
+    def refresh(self) -> None:
+        """
+        Update every registered signal. Call once at the start of the loop.
+        """
+        if not self._signals:
+            return
+        if self.wait_timeout > 0.0:
+            BaseStatusSignal.wait_for_all(self.wait_timeout, *self._signals)
+        else:
+            BaseStatusSignal.refresh_all(*self._signals)
+
+    @staticmethod
+    def compensated(signal: BaseStatusSignal, slope: BaseStatusSignal, max_latency: float = 0.3) -> float:
+        """
+        The value of `signal` projected forward by its latency using `slope`
+        (e.g. position and velocity), from the last refresh.
+        """
+        return BaseStatusSignal.get_latency_compensated_value(signal, slope, max_latency)
@@ -1,14 +1,49 @@
 from commands2 import Command, Subsystem
-from commands2.sysid import SysIdRoutine
 import math
 from phoenix6 import SignalLogger, swerve, units, utils
-from typing import Callable, overload
+from typing import TYPE_CHECKING, Callable, overload
 from wpilib import DriverStation, Notifier, RobotController
-from wpilib.sysid import SysIdRoutineLog
 from wpimath.geometry import Pose2d, Rotation2d
 from wpimath.kinematics import ChassisSpeeds
 from wpimath.controller import PIDController
 
+if TYPE_CHECKING:
+    # Imported on first use; see _sys_id_routine
+    from commands2.sysid import SysIdRoutine
+
+
+class TrajectoryController:
+    """
+    Feedforward + PID tracking of a trajectory sample in field coordinates.
+
+    Kept separate from the drivetrain so the same control law can be run
+    against a simulated or replayed pose.
+    """
+
+    def __init__(self):
+        # D value needs adjusted, but P value is good
+        self.x_controller = PIDController(1.1, 0.0, 0.05)
+        self.y_controller = PIDController(1.1, 0.0, 0.05)
+        self.heading_controller = PIDController(1.6, 0.0, 0.05)
+        self.heading_controller.enableContinuousInput(-math.pi, math.pi)
+
+    def calculate(self, current_pose: Pose2d, sample, speeds: ChassisSpeeds) -> ChassisSpeeds:
+        """
+        Computes field-centric speeds that track the sample, written into `speeds`.
+
+        :param current_pose: The measured pose of the robot
+        :type current_pose: Pose2d
+        :param sample: The trajectory sample to track (x, y, heading, vx, vy, omega)
+        :param speeds: Output, updated in place
+        :type speeds: ChassisSpeeds
+        :returns: `speeds`
+        :rtype: ChassisSpeeds
+        """
+        speeds.vx = sample.vx + self.x_controller.calculate(current_pose.X(), sample.x)
+        speeds.vy = sample.vy + self.y_controller.calculate(current_pose.Y(), sample.y)
+        speeds.omega = sample.omega + self.heading_controller.calculate(current_pose.rotation().radians(), sample.heading)
+        return speeds
+
 
 class CommandSwerveDrivetrain(Subsystem, swerve.SwerveDrivetrain):
     """
@@ -150,94 +185,25 @@ class CommandSwerveDrivetrain(Subsystem, swerve.SwerveDrivetrain):
         self._sim_notifier: Notifier | None = None
         self._last_sim_time: units.second = 0.0
 
-        # Add PID controllers
-        # D value needs adjusted, but P value is good
-        self.x_controller = PIDController(1.1, 0.0, 0.05)
-        self.y_controller = PIDController(1.1, 0.0, 0.05)
-        self.heading_controller = PIDController(1.6, 0.0, 0.05)
-        self.heading_controller.enableContinuousInput(-math.pi, math.pi)
+        # Add PID controllers, shared with follow_trajectory and point_at_coordinate
+        self.trajectory_controller = TrajectoryController()
+        self.x_controller = self.trajectory_controller.x_controller
+        self.y_controller = self.trajectory_controller.y_controller
+        self.heading_controller = self.trajectory_controller.heading_controller
+
+        # Requests for the field-speed control modes. These are built once and
+        # their speeds are updated in place every cycle to avoid allocations.
+        self._follow_request = self._create_field_speeds_request()
+        self._go_to_request = self._create_field_speeds_request()
+        self._point_at_request = self._create_field_speeds_request()
+        self._stop_request = self._create_field_speeds_request()
 
         self._has_applied_operator_perspective = False
         """Keep track if we've ever applied the operator perspective before or not"""
 
-        # Swerve requests to apply during SysId characterization
-        self._translation_characterization = swerve.requests.SysIdSwerveTranslation()
-        self._steer_characterization = swerve.requests.SysIdSwerveSteerGains()
-        self._rotation_characterization = swerve.requests.SysIdSwerveRotation()
-
-        self._sys_id_routine_translation = SysIdRoutine(
-            SysIdRoutine.Config(
-                # Use default ramp rate (1 V/s) and timeout (10 s)
-                # Reduce dynamic voltage to 4 V to prevent brownout
-                stepVoltage=4.0,
-                # Log state with SignalLogger class
-                recordState=lambda state: SignalLogger.write_string(
-                    "SysIdTranslation_State", SysIdRoutineLog.stateEnumToString(state)
-                ),
-            ),
-            SysIdRoutine.Mechanism(
-                lambda output: self.set_control(
-                    self._translation_characterization.with_volts(output)
-                ),
-                lambda log: None,
-                self,
-            ),
-        )
-        """SysId routine for characterizing translation. This is used to find PID gains for the drive motors."""
-
-        self._sys_id_routine_steer = SysIdRoutine(
-            SysIdRoutine.Config(
-                # Use default ramp rate (1 V/s) and timeout (10 s)
-                # Use dynamic voltage of 7 V
-                stepVoltage=7.0,
-                # Log state with SignalLogger class
-                recordState=lambda state: SignalLogger.write_string(
-                    "SysIdSteer_State", SysIdRoutineLog.stateEnumToString(state)
-                ),
-            ),
-            SysIdRoutine.Mechanism(
-                lambda output: self.set_control(
-                    self._steer_characterization.with_volts(output)
-                ),
-                lambda log: None,
-                self,
-            ),
-        )
-        """SysId routine for characterizing steer. This is used to find PID gains for the steer motors."""
-
-        self._sys_id_routine_rotation = SysIdRoutine(
-            SysIdRoutine.Config(
-                # This is in radians per second², but SysId only supports "volts per second"
-                rampRate=math.pi / 6,
-                # Use dynamic voltage of 7 V
-                stepVoltage=7.0,
-                # Use default timeout (10 s)
-                # Log state with SignalLogger class
-                recordState=lambda state: SignalLogger.write_string(
-                    "SysIdSteer_State", SysIdRoutineLog.stateEnumToString(state)
-                ),
-            ),
-            SysIdRoutine.Mechanism(
-                lambda output: (
-                    # output is actually radians per second, but SysId only supports "volts"
-                    self.set_control(
-                        self._rotation_characterization.with_rotational_rate(output)
-                    ),
-                    # also log the requested output for SysId
-                    SignalLogger.write_double("Rotational_Rate", output),
-                ),
-                lambda log: None,
-                self,
-            ),
-        )
-        """
-        SysId routine for characterizing rotation.
-        This is used to find PID gains for the FieldCentricFacingAngle HeadingController.
-        See the documentation of swerve.requests.SysIdSwerveRotation for info on importing the log to SysId.
-        """
-
-        self._sys_id_routine_to_apply = self._sys_id_routine_steer
-        """The SysId routine to test"""
+        self._sys_id_routine_to_apply = "steer"
+        """The SysId routine to test: translation, steer or rotation"""
+        self._sys_id_routines: dict | None = None
 
         if utils.is_simulation():
             self._start_sim_thread()
@@ -255,7 +221,100 @@ class CommandSwerveDrivetrain(Subsystem, swerve.SwerveDrivetrain):
         """
         return self.run(lambda: self.set_control(request()))
 
-    def sys_id_quasistatic(self, direction: SysIdRoutine.Direction) -> Command:
+    def _sys_id_routine(self) -> "SysIdRoutine":
+        """
+        The SysId routine selected by self._sys_id_routine_to_apply. The
+        routines are only built the first time one is needed, so SysId isn't
+        imported or set up while the robot is starting.
+        """
+        if self._sys_id_routines is None:
+            from commands2.sysid import SysIdRoutine
+            from wpilib.sysid import SysIdRoutineLog
+
+            # Swerve requests to apply during SysId characterization
+            translation_characterization = swerve.requests.SysIdSwerveTranslation()
+            steer_characterization = swerve.requests.SysIdSwerveSteerGains()
+            rotation_characterization = swerve.requests.SysIdSwerveRotation()
+
+            translation = SysIdRoutine(
+                SysIdRoutine.Config(
+                    # Use default ramp rate (1 V/s) and timeout (10 s)
+                    # Reduce dynamic voltage to 4 V to prevent brownout
+                    stepVoltage=4.0,
+                    # Log state with SignalLogger class
+                    recordState=lambda state: SignalLogger.write_string(
+                        "SysIdTranslation_State", SysIdRoutineLog.stateEnumToString(state)
+                    ),
+                ),
+                SysIdRoutine.Mechanism(
+                    lambda output: self.set_control(
+                        translation_characterization.with_volts(output)
+                    ),
+                    lambda log: None,
+                    self,
+                ),
+            )
+            """SysId routine for characterizing translation. This is used to find PID gains for the drive motors."""
+
+            steer = SysIdRoutine(
+                SysIdRoutine.Config(
+                    # Use default ramp rate (1 V/s) and timeout (10 s)
+                    # Use dynamic voltage of 7 V
+                    stepVoltage=7.0,
+                    # Log state with SignalLogger class
+                    recordState=lambda state: SignalLogger.write_string(
+                        "SysIdSteer_State", SysIdRoutineLog.stateEnumToString(state)
+                    ),
+                ),
+                SysIdRoutine.Mechanism(
+                    lambda output: self.set_control(
+                        steer_characterization.with_volts(output)
+                    ),
+                    lambda log: None,
+                    self,
+                ),
+            )
+            """SysId routine for characterizing steer. This is used to find PID gains for the steer motors."""
+
+            rotation = SysIdRoutine(
+                SysIdRoutine.Config(
+                    # This is in radians per second², but SysId only supports "volts per second"
+                    rampRate=math.pi / 6,
+                    # Use dynamic voltage of 7 V
+                    stepVoltage=7.0,
+                    # Use default timeout (10 s)
+                    # Log state with SignalLogger class
+                    recordState=lambda state: SignalLogger.write_string(
+                        "SysIdSteer_State", SysIdRoutineLog.stateEnumToString(state)
+                    ),
+                ),
+                SysIdRoutine.Mechanism(
+                    lambda output: (
+                        # output is actually radians per second, but SysId only supports "volts"
+                        self.set_control(
+                            rotation_characterization.with_rotational_rate(output)
+                        ),
+                        # also log the requested output for SysId
+                        SignalLogger.write_double("Rotational_Rate", output),
+                    ),
+                    lambda log: None,
+                    self,
+                ),
+            )
+            """
+            SysId routine for characterizing rotation.
+            This is used to find PID gains for the FieldCentricFacingAngle HeadingController.
+            See the documentation of swerve.requests.SysIdSwerveRotation for info on importing the log to SysId.
+            """
+
+            self._sys_id_routines = {
+                "translation": translation,
+                "steer": steer,
+                "rotation": rotation,
+            }
+        return self._sys_id_routines[self._sys_id_routine_to_apply]
+
+    def sys_id_quasistatic(self, direction: "SysIdRoutine.Direction") -> Command:
         """
         Runs the SysId Quasistatic test in the given direction for the routine
         specified by self.sys_id_routine_to_apply.
@@ -265,9 +324,9 @@ class CommandSwerveDrivetrain(Subsystem, swerve.SwerveDrivetrain):
         :returns: Command to run
         :rtype: Command
         """
-        return self._sys_id_routine_to_apply.quasistatic(direction)
+        return self._sys_id_routine().quasistatic(direction)
 
-    def sys_id_dynamic(self, direction: SysIdRoutine.Direction) -> Command:
+    def sys_id_dynamic(self, direction: "SysIdRoutine.Direction") -> Command:
         """
         Runs the SysId Dynamic test in the given direction for the routine
         specified by self.sys_id_routine_to_apply.
@@ -277,7 +336,7 @@ class CommandSwerveDrivetrain(Subsystem, swerve.SwerveDrivetrain):
         :returns: Command to run
         :rtype: Command
         """
-        return self._sys_id_routine_to_apply.dynamic(direction)
+        return self._sys_id_routine().dynamic(direction)
 
     def periodic(self):
         # Periodically try to apply the operator perspective.
@@ -338,47 +397,41 @@ class CommandSwerveDrivetrain(Subsystem, swerve.SwerveDrivetrain):
         """
         return super().get_state().pose
     
-    def follow_trajectory(self, sample):
-        # Enable continuous input for heading controller
-        self.heading_controller.enableContinuousInput(-math.pi, math.pi)
-
-        # Get current pose from swerve state
-        current_pose = self.get_pose()
-
-        # Combine feedforward and feedback
-        vx = sample.vx + self.x_controller.calculate(current_pose.X(), sample.x)
-        vy = sample.vy + self.y_controller.calculate(current_pose.Y(), sample.y)
-        omega = sample.omega + self.heading_controller.calculate(current_pose.rotation().radians(), sample.heading)
-
-        speeds = ChassisSpeeds(vx, vy, omega)
+    @staticmethod
+    def _create_field_speeds_request() -> swerve.requests.ApplyFieldSpeeds:
+        """
+        Creates a field-centric speeds request that owns its own ChassisSpeeds.
+        ApplyFieldSpeeds desaturates the wheel speeds by default.
 
-        # Create field-centric request with proper enum references
-        request = swerve.requests.ApplyFieldSpeeds().with_speeds(speeds) \
+        :returns: The configured request
+        :rtype: swerve.requests.ApplyFieldSpeeds
+        """
+        request = swerve.requests.ApplyFieldSpeeds().with_speeds(ChassisSpeeds()) \
             .with_drive_request_type(swerve.swerve_module.SwerveModule.DriveRequestType.VELOCITY) \
-            .with_steer_request_type(swerve.swerve_module.SwerveModule.SteerRequestType.POSITION) \
+            .with_steer_request_type(swerve.swerve_module.SwerveModule.SteerRequestType.POSITION)
+        return request
 
+    def _apply_field_speeds(self, request: swerve.requests.ApplyFieldSpeeds, vx: float, vy: float, omega: float):
+        """
+        Writes the speeds into a preallocated request and applies it.
+        """
+        speeds = request.speeds
+        speeds.vx = vx
+        speeds.vy = vy
+        speeds.omega = omega
         self.set_control(request)
 
-    def go_to_coordinate(self, target_pose: Pose2d):
-        # Enable continuous input for heading controller
-        self.heading_controller.enableContinuousInput(-math.pi, math.pi)
-
-        # Get current pose from swerve state
-        current_pose = self.get_pose()
-
-        # Calculate the necessary speeds using PID controllers
-        vx = self.x_controller.calculate(current_pose.X(), target_pose.X())
-        vy = self.y_controller.calculate(current_pose.Y(), target_pose.Y())
-        omega = self.heading_controller.calculate(current_pose.rotation().radians(), target_pose.rotation().radians())
-
-        speeds = ChassisSpeeds(vx, vy, omega)
-
-        # Create field-centric request with proper enum references
-        request = swerve.requests.ApplyFieldSpeeds().with_speeds(speeds) \
-            .with_drive_request_type(swerve.swerve_module.SwerveModule.DriveRequestType.VELOCITY) \
-            .with_steer_request_type(swerve.swerve_module.SwerveModule.SteerRequestType.POSITION) \
+    def follow_trajectory(self, sample):
+        # Combine feedforward and feedback, straight into the preallocated request
+        self.trajectory_controller.calculate(self.get_pose(), sample, self._follow_request.speeds)
+        self.set_control(self._follow_request)
 
-        self.set_control(request)
+    def drive_field_speeds(self, vx: float, vy: float, omega: float):
+        """
+        Drives at the given field-centric speeds (blue alliance origin),
+        e.g. as computed by autos.DriveToPose.
+        """
+        self._apply_field_speeds(self._go_to_request, vx, vy, omega)
     
     def point_at_coordinate(self, target_pose: Pose2d, joyvalues: tuple[float, float]):
         forward, strafe = joyvalues[1], joyvalues[0]
@@ -390,25 +443,13 @@ class CommandSwerveDrivetrain(Subsystem, swerve.SwerveDrivetrain):
         self.heading_controller.setSetpoint(heading_to_target)
         turn_command = self.heading_controller.calculate(current_heading)
 
-        request = (
-            swerve.requests.ApplyFieldSpeeds()
-            .with_speeds(ChassisSpeeds(forward, strafe, turn_command))
-            .with_drive_request_type(swerve.swerve_module.SwerveModule.DriveRequestType.VELOCITY)
-            .with_steer_request_type(swerve.swerve_module.SwerveModule.SteerRequestType.POSITION)
-            .with_desaturate_wheel_speeds(True)
-        )
-        self.set_control(request)
+        self._apply_field_speeds(self._point_at_request, forward, strafe, turn_command)
 
     def stop(self):
         """
         Stops the swerve drivetrain by setting all speeds to zero.
         """
-        speeds = ChassisSpeeds(0.0, 0.0, 0.0)
-        request = swerve.requests.ApplyFieldSpeeds().with_speeds(speeds) \
-            .with_drive_request_type(swerve.swerve_module.SwerveModule.DriveRequestType.VELOCITY) \
-            .with_steer_request_type(swerve.swerve_module.SwerveModule.SteerRequestType.POSITION) \
-            .with_desaturate_wheel_speeds(True)
-        self.set_control(request)
+        self._apply_field_speeds(self._stop_request, 0.0, 0.0, 0.0)
 
     @staticmethod
     def compute_heading_to_target(current_pose: Pose2d, target_pose: Pose2d) -> float:
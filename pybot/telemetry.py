@@ -3,17 +3,50 @@ from phoenix6 import SignalLogger, swerve, units
 from wpilib import Color, Color8Bit, Mechanism2d, MechanismLigament2d, SmartDashboard, Field2d
 from wpimath.geometry import Pose2d
 from wpimath.kinematics import ChassisSpeeds, SwerveModulePosition, SwerveModuleState
+import math
+import os
+import threading
 import time
 
+from modulehealth import ModuleHealthMonitor
+from odometrystats import OdometryStats
+
+# Default publish rates per channel. SignalLogger gets every frame the
+# publisher picks up; frames it drops when it falls behind are counted.
+NT_PUBLISH_HZ = 50.0
+DASHBOARD_PUBLISH_HZ = 10.0
+
+# Frames in the hand-off ring between the odometry thread and the publisher
+FRAME_COUNT = 4
+
+# Dashboard widgets are only touched when a value moves more than this
+ANGLE_EPSILON_DEGREES = 0.5
+LENGTH_EPSILON = 0.005
+
 class Telemetry:
-    def __init__(self, max_speed: units.meters_per_second):
+    def __init__(self, max_speed: units.meters_per_second,
+                 nt_publish_hz: units.hertz = NT_PUBLISH_HZ,
+                 dashboard_publish_hz: units.hertz = DASHBOARD_PUBLISH_HZ):
         """
         Construct a telemetry object with the specified max speed of the robot.
 
+        telemeterize is called for every odometry update, so the channels are
+        decimated: SignalLogger entries are written at the full odometry rate,
+        the DriveState struct topics at nt_publish_hz, and the Field2d and
+        module Mechanism2d widgets at dashboard_publish_hz.
+
         :param max_speed: Maximum speed
         :type max_speed: units.meters_per_second
+        :param nt_publish_hz: Rate of the DriveState NetworkTables topics
+        :type nt_publish_hz: units.hertz
+        :param dashboard_publish_hz: Rate of the dashboard widgets
+        :type dashboard_publish_hz: units.hertz
         """
         self._max_speed = max_speed
+        self._nt_period = 1.0 / nt_publish_hz
+        self._dashboard_period = 1.0 / dashboard_publish_hz
+        self._last_nt_time = -math.inf
+        self._last_dashboard_time = -math.inf
         SignalLogger.start()
 
         # What to publish over networktables for telemetry
@@ -38,6 +71,7 @@ class Telemetry:
         self._table = self._inst.getTable("Pose")
         self._field_pub = self._table.getDoubleArrayTopic("robotPose").publish()
         self._field_type_pub = self._table.getStringTopic(".type").publish()
+        self._field_type_pub.set("Field2d")
 
         # Mechanisms to represent the swerve module states
         self._module_mechanisms: list[Mechanism2d] = [
@@ -77,28 +111,42 @@ class Telemetry:
             .appendLigament("Direction", 0.1, 0, 0, Color8Bit(Color.kWhite)),
         ]
 
+        # Register the module widgets once; SmartDashboard keeps them updated
+        for i, mechanism in enumerate(self._module_mechanisms):
+            SmartDashboard.putData(f"Module {i}", mechanism)
+
+        # Last values sent to the widgets, for skipping unchanged updates
+        self._module_angles = [math.nan] * 4
+        self._module_lengths = [math.nan] * 4
+        self._last_field_pose: Pose2d | None = None
+
+        # Per-module tracking statistics, published as a compact summary
+        self.module_health = ModuleHealthMonitor()
+
+        # Odometry period and latency histograms, fed from the odometry thread
+        self.odometry_stats = OdometryStats()
+
+        # Reused buffers for the log arrays
+        self._pose_array = [0.0] * 3
+        self._module_states_array = [0.0] * 8
+        self._module_targets_array = [0.0] * 8
+
     def telemeterize(self, state: swerve.SwerveDrivetrain.SwerveDriveState):
         """
         Accept the swerve drive state and telemeterize it to SmartDashboard and SignalLogger.
         """
-        # Telemeterize the swerve drive state
-        self._drive_pose.set(state.pose)
-        self._drive_speeds.set(state.speeds)
-        self._drive_module_states.set(state.module_states)
-        self._drive_module_targets.set(state.module_targets)
-        self._drive_module_positions.set(state.module_positions)
-        self._drive_timestamp.set(state.timestamp)
-        self._drive_odometry_frequency.set(1.0 / state.odometry_period)
-
-        # Also write to log file
-        pose_array = [state.pose.x, state.pose.y, state.pose.rotation().degrees()]
-        module_states_array = []
-        module_targets_array = []
+        # Write every sample to the log file
+        pose_array = self._pose_array
+        pose_array[0] = state.pose.x
+        pose_array[1] = state.pose.y
+        pose_array[2] = state.pose.rotation().degrees()
+        module_states_array = self._module_states_array
+        module_targets_array = self._module_targets_array
         for i in range(4):
-            module_states_array.append(state.module_states[i].angle.radians())
-            module_states_array.append(state.module_states[i].speed)
-            module_targets_array.append(state.module_targets[i].angle.radians())
-            module_targets_array.append(state.module_targets[i].speed)
+            module_states_array[2 * i] = state.module_states[i].angle.radians()
+            module_states_array[2 * i + 1] = state.module_states[i].speed
+            module_targets_array[2 * i] = state.module_targets[i].angle.radians()
+            module_targets_array[2 * i + 1] = state.module_targets[i].speed
 
         SignalLogger.write_double_array("DriveState/Pose", pose_array)
         SignalLogger.write_double_array("DriveState/ModuleStates", module_states_array)
@@ -109,17 +157,182 @@ class Telemetry:
             "DriveState/OdometryPeriod", state.odometry_period, "seconds"
         )
 
-        # Telemeterize the pose to a Field2d
-        self._field_type_pub.set("Field2d")
-        self._field_pub.set(pose_array)
+        self.module_health.update(state)
+
+        now = state.timestamp
+        self.odometry_stats.publish(now)
+
+        # Telemeterize the swerve drive state
+        if now - self._last_nt_time >= self._nt_period or now < self._last_nt_time:
+            self._last_nt_time = now
+            self._drive_pose.set(state.pose)
+            self._drive_speeds.set(state.speeds)
+            self._drive_module_states.set(state.module_states)
+            self._drive_module_targets.set(state.module_targets)
+            self._drive_module_positions.set(state.module_positions)
+            self._drive_timestamp.set(state.timestamp)
+            self._drive_odometry_frequency.set(1.0 / state.odometry_period)
+
+        if now - self._last_dashboard_time >= self._dashboard_period or now < self._last_dashboard_time:
+            self._last_dashboard_time = now
+            self._telemeterizeDashboard(state)
+
+    def _telemeterizeDashboard(self, state: swerve.SwerveDrivetrain.SwerveDriveState):
+        """
+        Update the slow-moving dashboard widgets, skipping values that haven't changed.
+        """
+        if state.pose != self._last_field_pose:
+            self._last_field_pose = state.pose
+
+            # Telemeterize the pose to a Field2d
+            self._field_pub.set(self._pose_array)
 
-        # Update the Field2d object with the robot's pose
-        self._field.setRobotPose(state.pose)
+            # Update the Field2d object with the robot's pose
+            self._field.setRobotPose(state.pose)
 
         # Telemeterize the module states to a Mechanism2d
         for i, module_state in enumerate(state.module_states):
-            self._module_speeds[i].setAngle(module_state.angle.degrees())
-            self._module_directions[i].setAngle(module_state.angle.degrees())
-            self._module_speeds[i].setLength(module_state.speed / (2 * self._max_speed))
+            angle = module_state.angle.degrees()
+            if abs(angle - self._module_angles[i]) > ANGLE_EPSILON_DEGREES or math.isnan(self._module_angles[i]):
+                self._module_angles[i] = angle
+                self._module_speeds[i].setAngle(angle)
+                self._module_directions[i].setAngle(angle)
+
+            length = module_state.speed / (2 * self._max_speed)
+            if abs(length - self._module_lengths[i]) > LENGTH_EPSILON or math.isnan(self._module_lengths[i]):
+                self._module_lengths[i] = length
+                self._module_speeds[i].setLength(length)
+
+class DriveStateFrame:
+    """
+    Preallocated copy of the SwerveDriveState fields used by Telemetry.
+
+    Mutable members (speeds, module states and positions) are copied field
+    by field into objects owned by the frame; immutable ones (Pose2d,
+    Rotation2d) are shared by reference.
+    """
+    __slots__ = ('pose', 'speeds', 'module_states', 'module_targets', 'module_positions',
+                 'raw_heading', 'timestamp', 'odometry_period', 'successful_daqs', 'failed_daqs',
+                 'sequence')
+
+    def __init__(self):
+        self.sequence = -1
+        """Sequence number of the state in the frame, -1 while it is being written"""
+        self.pose = Pose2d()
+        self.speeds = ChassisSpeeds()
+        self.module_states = [SwerveModuleState() for _ in range(4)]
+        self.module_targets = [SwerveModuleState() for _ in range(4)]
+        self.module_positions = [SwerveModulePosition() for _ in range(4)]
+        self.raw_heading = self.pose.rotation()
+        self.timestamp = 0.0
+        self.odometry_period = 0.0
+        self.successful_daqs = 0
+        self.failed_daqs = 0
+
+    def copyFrom(self, state: swerve.SwerveDrivetrain.SwerveDriveState):
+        self.pose = state.pose
+        self.speeds.vx = state.speeds.vx
+        self.speeds.vy = state.speeds.vy
+        self.speeds.omega = state.speeds.omega
+        for i in range(4):
+            src = state.module_states[i]
+            dst = self.module_states[i]
+            dst.speed = src.speed
+            dst.angle = src.angle
+            src = state.module_targets[i]
+            dst = self.module_targets[i]
+            dst.speed = src.speed
+            dst.angle = src.angle
+            src = state.module_positions[i]
+            dst = self.module_positions[i]
+            dst.distance = src.distance
+            dst.angle = src.angle
+        self.raw_heading = state.raw_heading
+        self.timestamp = state.timestamp
+        self.odometry_period = state.odometry_period
+        self.successful_daqs = state.successful_daqs
+        self.failed_daqs = state.failed_daqs
+
+class TelemetryPublisher:
+    """
+    Runs Telemetry.telemeterize on a low-priority worker thread.
+
+    The odometry callback (submit) only copies the drive state into the next
+    frame of a small preallocated ring, bumps a sequence number and adds the
+    odometry period to Telemetry.odometry_stats; no locks are taken on that
+    path. The worker always publishes the newest frame, so when it falls
+    behind the older frames are dropped and counted.
+
+    The worker copies the frame before publishing it and checks the frame's
+    sequence number before and after the copy, so a frame the odometry
+    thread rewrote in the meantime is skipped instead of published torn.
+    Both counts are published under DriveState/.
+    """
+
+    def __init__(self, telemetry: Telemetry, frame_count: int = FRAME_COUNT):
+        self._telemetry = telemetry
+        self._frames = [DriveStateFrame() for _ in range(frame_count)]
+        self._written = 0
+        self._consumed = 0
+        self.dropped = 0
+        """Frames that were replaced by a newer one before being published"""
+        self.overwritten = 0
+        """Frames skipped because the odometry thread rewrote them while they were copied"""
+        self._frame = DriveStateFrame()
+        """The worker's own copy of the frame being published"""
+
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="TelemetryPublisher", daemon=True)
+
+        table = NetworkTableInstance.getDefault().getTable("DriveState")
+        self._dropped_pub = table.getIntegerTopic("TelemetryDropped").publish()
+        self._overwritten_pub = table.getIntegerTopic("TelemetryOverwritten").publish()
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, state: swerve.SwerveDrivetrain.SwerveDriveState):
+        """
+        Hand a drive state to the worker. Called from the odometry thread.
+        """
+        self._telemetry.odometry_stats.record(state)
+        seq = self._written
+        frame = self._frames[seq % len(self._frames)]
+        frame.sequence = -1
+        frame.copyFrom(state)
+        frame.sequence = seq
+        self._written = seq + 1
+        self._wake.set()
+
+    def _run(self):
+        try:
+            # Linux schedules threads individually, so this only lowers the worker
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except (AttributeError, OSError):
+            pass
+
+        frame_count = len(self._frames)
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+
+            seq = self._written
+            if seq == self._consumed:
+                continue
+
+            skipped = seq - self._consumed - 1
+            self._consumed = seq
+            if skipped > 0:
+                self.dropped += skipped
+                self._dropped_pub.set(self.dropped)
 
-            SmartDashboard.putData(f"Module {i}", self._module_mechanisms[i])
\ No newline at end of file
+            # The writer reuses the frame once it has lapped the ring; only
+            # publish a copy made while the frame held this state throughout
+            frame = self._frames[(seq - 1) % frame_count]
+            if frame.sequence == seq - 1:
+                self._frame.copyFrom(frame)
+            if frame.sequence != seq - 1:
+                self.overwritten += 1
+                self._overwritten_pub.set(self.overwritten)
+                continue
+            self._telemetry.telemeterize(self._frame)
@@ -0,0 +1,22 @@
+'''
+    Runs autobatch end to end with one worker process.
+'''
+
+import csv
+
+import autobatch
+
+def test_batch(tmp_path):
+    out = tmp_path / 'autobatch.csv'
+    assert autobatch.main(['leftscore', '--runs', '1', '--workers', '1', '--out', str(out)]) == 0
+
+    with open(out, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [(row['trajectory'], row['alliance']) for row in rows] == [('leftscore', 'blue'), ('leftscore', 'red')]
+    assert all(int(row['runs']) == 2 for row in rows)
+    assert all(int(row['failed']) == 0 for row in rows)
+
+def test_failed_runs_are_counted():
+    rows = autobatch.summarize([('missing', False, None), ('missing', False, None)])
+    assert rows[0]['trajectory'] == 'missing'
+    assert (rows[0]['runs'], rows[0]['failed']) == (0, 2)
@@ -0,0 +1,51 @@
+'''
+    Runs DriveToPose against the kinematic drivetrain model from autosim.
+'''
+
+import math
+import pytest
+
+from wpimath.geometry import Pose2d, Rotation2d
+
+import autos
+from autos import DriveToPose
+from autosim import LOOP_PERIOD, PHYSICS_PERIOD, SimDrivetrain
+
+def run(start: Pose2d, target: Pose2d, seconds: float = 6.0):
+    clock = lambda: 0.0
+    drivetrain = SimDrivetrain(clock)
+    drivetrain.reset_pose(start)
+    command = DriveToPose(drivetrain, lambda: target)
+    command.initialize()
+    max_speed = 0.0
+    for loop in range(int(seconds / LOOP_PERIOD)):
+        command.execute()
+        if command.isFinished():
+            break
+        for _ in range(round(LOOP_PERIOD / PHYSICS_PERIOD)):
+            drivetrain.step(PHYSICS_PERIOD)
+        speeds = drivetrain.get_state().speeds
+        max_speed = max(max_speed, math.hypot(speeds.vx, speeds.vy))
+    command.end(not command.isFinished())
+    return drivetrain, command, loop * LOOP_PERIOD, max_speed
+
+@pytest.mark.parametrize("start, target", [
+    (Pose2d(1.0, 1.0, Rotation2d()), Pose2d(3.0, 2.0, Rotation2d.fromDegrees(90.0))),
+    (Pose2d(5.0, 4.0, Rotation2d.fromDegrees(170.0)), Pose2d(4.0, 4.5, Rotation2d.fromDegrees(-170.0))),
+    (Pose2d(2.0, 2.0, Rotation2d()), Pose2d(2.0, 2.0, Rotation2d())),
+])
+def test_reaches_target(start, target):
+    drivetrain, command, elapsed, max_speed = run(start, target)
+    pose = drivetrain.get_pose()
+    assert command.atTarget()
+    assert pose.translation().distance(target.translation()) < autos.DRIVE_TO_POSE_POSITION_TOLERANCE
+    assert max_speed <= autos.DRIVE_TO_POSE_MAX_SPEED * 1.1
+
+def test_long_move_is_profiled():
+    start = Pose2d(1.0, 1.0, Rotation2d())
+    target = Pose2d(7.0, 1.0, Rotation2d())
+    _, command, elapsed, max_speed = run(start, target)
+    # 6 m at 3 m/s and 3 m/s²: 1 s up, 1 s cruise, 1 s down
+    assert command.atTarget()
+    assert elapsed == pytest.approx(3.0, abs=0.6)
+    assert max_speed == pytest.approx(autos.DRIVE_TO_POSE_MAX_SPEED, rel=0.1)
@@ -0,0 +1,51 @@
+'''
+    Checks the AprilTag field index against the WPILib layout.
+'''
+
+import math
+import pytest
+
+from wpimath.geometry import Pose2d, Rotation2d
+
+from fieldlayout import BLUE_REEF_TAGS, RED_REEF_TAGS, SCORING_DISTANCE, FieldLayout
+
+@pytest.fixture(scope="module")
+def field():
+    return FieldLayout()
+
+def test_tag_poses_match_layout(field):
+    for tag_id in field.ids:
+        expected = field.layout.getTagPose(tag_id).toPose2d()
+        assert field.tagPose(tag_id) == expected
+        assert field.x[tag_id] == pytest.approx(expected.X())
+    assert field.tagPose(0) is None
+    assert field.tagPose(99) is None
+
+def test_reefs_are_on_their_own_side(field):
+    for tag_id in BLUE_REEF_TAGS:
+        assert field.x[tag_id] < field.field_length / 2
+    for tag_id in RED_REEF_TAGS:
+        assert field.x[tag_id] > field.field_length / 2
+
+@pytest.mark.parametrize("red", [False, True])
+def test_scoring_targets_face_their_tag(field, red):
+    for tag_id, target in zip(field.reefTags(red), field.scoringTargets(red)):
+        tag = field.tagPose(tag_id)
+        assert target.translation().distance(tag.translation()) == pytest.approx(SCORING_DISTANCE)
+        to_tag = math.atan2(tag.Y() - target.Y(), tag.X() - target.X())
+        assert math.remainder(to_tag - target.rotation().radians(), math.tau) == pytest.approx(0.0, abs=1e-9)
+
+@pytest.mark.parametrize("red", [False, True])
+def test_nearest_scoring_target(field, red):
+    for tag_id, target in zip(field.reefTags(red), field.scoringTargets(red)):
+        nearby = Pose2d(target.X() + 0.1, target.Y() - 0.1, Rotation2d())
+        assert field.nearestScoringTarget(nearby, red) == (tag_id, target)
+
+def test_visible_tags(field):
+    # In front of each blue reef face, looking at it
+    for target, tag_id in zip(field.scoringTargets(False), BLUE_REEF_TAGS):
+        assert field.visibleTags(target)[0] == tag_id
+    # Facing away from the reef
+    target = field.scoringTargets(False)[0]
+    behind = Pose2d(target.translation(), target.rotation() + Rotation2d(math.pi))
+    assert BLUE_REEF_TAGS[0] not in field.visibleTags(behind)
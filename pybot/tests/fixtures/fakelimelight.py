@@ -0,0 +1,105 @@
+'''
+    A local HTTP server that answers like a Limelight on /results and
+    /status, serving the data in limelightdata. Used by the vision tests and
+    benchmarks instead of a camera.
+'''
+
+import copy
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .limelightdata import DATA, RESULTS
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep connections open between requests, like the camera does
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; don't let Nagle hold the body
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.fake.count('connections')
+
+    def do_GET(self):
+        fake = self.server.fake
+        fake.count('requests')
+        if fake.delay > 0.0:
+            time.sleep(fake.delay)
+
+        if self.path == '/results':
+            body = fake.nextResults()
+        elif self.path == '/status':
+            body = fake.status
+        else:
+            self.send_error(404)
+            return
+
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeLimelight:
+    '''
+        Serves limelightdata.RESULTS and DATA on 127.0.0.1.
+
+        :param delay: Seconds to wait before answering each request.
+        :param new_frames: Advance the result timestamp on every /results
+                           request, as if the camera had a new frame each time.
+        :param fps: Frame rate used to advance the timestamp.
+    '''
+
+    def __init__(self, delay: float = 0.0, new_frames: bool = True, fps: float = 90.0, port: int = 0):
+        self.delay = delay
+        self.new_frames = new_frames
+        self.frame_ms = 1000.0 / fps
+        self.results = copy.deepcopy(RESULTS)
+        self.status = copy.deepcopy(DATA)
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def nextResults(self) -> dict:
+        with self._lock:
+            if self.new_frames:
+                self.results['ts'] += self.frame_ms
+            return dict(self.results)
+
+    def start(self) -> 'FakeLimelight':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='FakeLimelight', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> 'FakeLimelight':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,26 @@
+'''
+    Writes small wpilogs for the log tests through DataLogManager, the same
+    logger robot.py uses, so the files look like ones pulled off the robot.
+'''
+
+import os
+from contextlib import contextmanager
+
+import wpilib
+
+@contextmanager
+def fixtureLog(path):
+    '''
+    Start DataLogManager writing to `path` and yield its DataLog; entries
+    created on it are flushed and the file closed on exit.
+    '''
+    directory, name = os.path.split(os.fspath(path))
+    # Only the entries a test writes itself, not whatever other tests published
+    wpilib.DataLogManager.logNetworkTables(False)
+    wpilib.DataLogManager.start(directory, name)
+    log = wpilib.DataLogManager.getLog()
+    try:
+        yield log
+    finally:
+        log.flush()
+        wpilib.DataLogManager.stop()
@@ -15,3 +15,44 @@ DATA = { 'cameraQuat':
     'snapshotMode': 0, 
     'temp': 66.70500183105469
 }
+
+RESULTS = { 'pID': 0.0,
+    'tl': 19.5,
+    'cl': 9.2,
+    'ts': 1840231.0,
+    'ts_rio': 0.0,
+    'v': 1,
+    'botpose': [ -4.81, -1.34, 0.0, 0.0, 0.0, 178.2, 28.7, 2, 0.21, 2.06, 0.42 ],
+    'botpose_wpiblue': [ 3.96, 2.69, 0.0, 0.0, 0.0, 178.2, 28.7, 2, 0.21, 2.06, 0.42 ],
+    'botpose_wpired': [ 13.59, 5.36, 0.0, 0.0, 0.0, -1.8, 28.7, 2, 0.21, 2.06, 0.42 ],
+    'botpose_tagcount': 2,
+    'botpose_span': 0.21,
+    'botpose_avgdist': 2.06,
+    'botpose_avgarea': 0.42,
+    'stdev_mt1': [ 0.08, 0.11, 0.0, 0.0, 0.0, 3.1 ],
+    'stdev_mt2': [ 0.04, 0.05, 0.0, 0.0, 0.0, 0.0 ],
+    'Fiducial': [
+        { 'fID': 18, 'fam': '36H11C',
+          'pts': [],
+          'skew': [],
+          't6c_ts': [ -0.12, 0.05, -1.98, 1.1, -0.4, 0.2 ],
+          't6r_fs': [ 3.96, 2.69, 0.0, 0.0, 0.0, 178.2 ],
+          't6r_ts': [ 0.12, -0.05, -1.98, -1.1, 0.4, -0.2 ],
+          't6t_cs': [ 0.12, -0.05, 1.98, 1.1, -0.4, 0.2 ],
+          't6t_rs': [ 1.95, 0.11, 0.28, 0.0, 0.0, 1.8 ],
+          'ta': 0.47, 'tx': -3.41, 'txp': 591.2, 'ty': 1.42, 'typ': 346.9 },
+        { 'fID': 17, 'fam': '36H11C',
+          'pts': [],
+          'skew': [],
+          't6c_ts': [ 0.31, 0.06, -2.11, 0.9, -0.3, 58.6 ],
+          't6r_fs': [ 3.97, 2.70, 0.0, 0.0, 0.0, 178.4 ],
+          't6r_ts': [ -0.31, -0.06, -2.11, -0.9, 0.3, -58.6 ],
+          't6t_cs': [ -0.31, 0.06, 2.11, 0.9, -0.3, 58.6 ],
+          't6t_rs': [ 2.14, 0.52, 0.28, 0.0, 0.0, 61.2 ],
+          'ta': 0.37, 'tx': 8.02, 'txp': 791.4, 'ty': 1.31, 'typ': 349.3 }
+    ],
+    'Retro': [],
+    'Detector': [],
+    'Classifier': [],
+    'Barcode': []
+}
@@ -0,0 +1,63 @@
+'''
+    Checks that DriveInputShaper reproduces the original joystick curve from
+    RobotContainer (applyExponential + polar round trip).
+'''
+
+import math
+import random
+import pytest
+
+from inputshaper import DriveInputShaper
+from robotcontainer import RobotContainer, DEAD_BAND
+
+MAX_SPEED = 4.5
+MAX_ANGULAR_RATE = 7.0
+EXPONENT = 4.0
+
+def reference(x, y, rot, drive_scale, rot_scale, drive_sign, rot_sign):
+    apply = RobotContainer.applyExponential
+    magnitude = apply(math.hypot(x, y), DEAD_BAND, EXPONENT) * MAX_SPEED * drive_scale
+    theta = math.atan2(y, x)
+    x1 = magnitude * math.cos(theta)
+    y1 = magnitude * math.sin(theta)
+    omega = rot_sign * apply(rot, DEAD_BAND, EXPONENT) * MAX_ANGULAR_RATE * rot_scale
+    return drive_sign * y1, drive_sign * x1, omega
+
+def axis_values():
+    values = [-1.0, -0.5, -DEAD_BAND, -DEAD_BAND / 2, 0.0, DEAD_BAND / 2, DEAD_BAND, 0.5, 1.0]
+    rng = random.Random(2025)
+    values += [rng.uniform(-1.0, 1.0) for _ in range(40)]
+    return values
+
+@pytest.mark.parametrize("drive_scale, rot_scale", [(0.55, 0.1), (0.1, 0.03), (1.0, 1.0)])
+@pytest.mark.parametrize("drive_sign", [1.0, -1.0])
+def test_matches_original_curve(drive_scale, rot_scale, drive_sign):
+    shaper = DriveInputShaper(MAX_SPEED, MAX_ANGULAR_RATE, DEAD_BAND, EXPONENT, drive_scale, rot_scale)
+    shaper.setSigns(drive_sign, -1.0)
+    values = axis_values()
+    for x in values:
+        for y in values[::3]:
+            rot = y
+            shaper.update(x, y, rot)
+            expected = reference(x, y, rot, drive_scale, rot_scale, drive_sign, -1.0)
+            assert shaper.vx == pytest.approx(expected[0], abs=1e-9)
+            assert shaper.vy == pytest.approx(expected[1], abs=1e-9)
+            assert shaper.omega == pytest.approx(expected[2], abs=1e-9)
+
+def test_direction_is_preserved():
+    shaper = DriveInputShaper(MAX_SPEED, MAX_ANGULAR_RATE, DEAD_BAND, EXPONENT)
+    for x, y in [(0.3, 0.4), (-0.6, 0.2), (0.0, -0.9), (0.7, 0.7)]:
+        sx, sy = shaper.translate(x, y)
+        assert math.atan2(sy, sx) == pytest.approx(math.atan2(y, x))
+
+def test_inside_deadband_is_zero():
+    shaper = DriveInputShaper(MAX_SPEED, MAX_ANGULAR_RATE, DEAD_BAND, EXPONENT)
+    assert shaper.translate(DEAD_BAND * 0.5, -DEAD_BAND * 0.5) == (0.0, 0.0)
+    assert shaper.rotate(-DEAD_BAND * 0.99) == 0.0
+
+def test_scaling_changes_gain():
+    shaper = DriveInputShaper(MAX_SPEED, MAX_ANGULAR_RATE, DEAD_BAND, EXPONENT, 1.0, 1.0)
+    full = shaper.translate(1.0, 0.0)[0]
+    shaper.setScaling(0.1, 0.03)
+    assert shaper.translate(1.0, 0.0)[0] == pytest.approx(full * 0.1)
+    assert shaper.rotate(1.0) == pytest.approx(MAX_ANGULAR_RATE * 0.03)
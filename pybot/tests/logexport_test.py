@@ -0,0 +1,60 @@
+'''
+    Exports a small generated log and checks the columns and summary.
+'''
+
+import math
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from wpiutil.log import DoubleArrayLogEntry, DoubleLogEntry
+
+import logexport
+from fixtures.fixturelog import fixtureLog
+
+SAMPLES = 100
+PERIOD = 0.004
+
+def write_log(path):
+    with fixtureLog(path) as log:
+        pose = DoubleArrayLogEntry(log, 'DriveState/Pose')
+        states = DoubleArrayLogEntry(log, 'DriveState/ModuleStates')
+        targets = DoubleArrayLogEntry(log, 'DriveState/ModuleTargets')
+        period = DoubleLogEntry(log, 'DriveState/OdometryPeriod')
+        for i in range(SAMPLES):
+            t = int(i * PERIOD * 1e6)
+            pose.append([0.01 * i, 0.0, 0.0], t)
+            # Module 2 runs 0.1 m/s slow and 0.1 rad off; the others track exactly
+            target = [0.0, 1.0] * 4
+            state = list(target)
+            state[4] = 0.1
+            state[5] = 0.9
+            states.append(state, t)
+            targets.append(target, t)
+            period.append(PERIOD, t)
+
+def test_export(tmp_path):
+    path = tmp_path / 'match.wpilog'
+    write_log(path)
+    row = logexport.exportLog(str(path), str(tmp_path))
+
+    data = np.load(tmp_path / 'match.npz')
+    assert data['pose'].shape == (SAMPLES, 3)
+    assert data['module_states'].shape == (SAMPLES, 8)
+    assert data['odometry_period'].shape == (SAMPLES,)
+    assert data['pose_time'][1] == pytest.approx(PERIOD)
+
+    assert row['samples'] == SAMPLES
+    assert row['odometry_hz'] == pytest.approx(1.0 / PERIOD)
+    assert row['period_std_ms'] == pytest.approx(0.0)
+    assert row['module0_speed_rms'] == pytest.approx(0.0)
+    assert row['module2_speed_rms'] == pytest.approx(0.1)
+    assert row['module2_angle_rms_deg'] == pytest.approx(math.degrees(0.1))
+
+def test_empty_log(tmp_path):
+    path = tmp_path / 'empty.wpilog'
+    with fixtureLog(path):
+        pass
+    row = logexport.exportLog(str(path), str(tmp_path))
+    assert row['samples'] == 0
+    assert math.isnan(row['odometry_hz'])
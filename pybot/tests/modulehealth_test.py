@@ -0,0 +1,69 @@
+'''
+    Feeds synthetic module states to ModuleHealthMonitor.
+'''
+
+import math
+import pytest
+
+from wpimath.geometry import Rotation2d
+from wpimath.kinematics import SwerveModuleState
+
+import modulehealth
+from modulehealth import ModuleHealthMonitor, MISALIGNED, OK, SLIPPING, STALLED
+
+PERIOD = 0.004
+
+class State:
+    def __init__(self, states, targets, timestamp):
+        self.module_states = states
+        self.module_targets = targets
+        self.odometry_period = PERIOD
+        self.timestamp = timestamp
+
+def run(monitor, seconds, measured, target=(2.0, 0.0)):
+    '''
+    Module 1 reports `measured` (speed, radians), the others track `target`.
+    '''
+    for i in range(int(seconds / PERIOD)):
+        targets = [SwerveModuleState(target[0], Rotation2d(target[1])) for _ in range(4)]
+        states = list(targets)
+        states[1] = SwerveModuleState(measured[0], Rotation2d(measured[1]))
+        monitor.update(State(states, targets, i * PERIOD))
+
+def test_tracking_modules_are_ok():
+    monitor = ModuleHealthMonitor()
+    run(monitor, 2.0, (2.0, 0.0))
+    assert monitor.status == [OK] * 4
+    assert monitor.healthy()
+
+def test_flipped_module_is_ok():
+    monitor = ModuleHealthMonitor()
+    run(monitor, 2.0, (-2.0, math.pi))
+    assert monitor.status[1] == OK
+
+@pytest.mark.parametrize("measured, status", [
+    ((0.2, 0.0), STALLED),
+    ((3.0, 0.0), SLIPPING),
+    ((2.0, math.radians(25.0)), MISALIGNED),
+])
+def test_faults_are_detected(measured, status):
+    monitor = ModuleHealthMonitor()
+    run(monitor, 2.0, measured)
+    assert monitor.status[1] == status
+    assert monitor.status[0] == OK
+    assert not monitor.healthy()
+
+def test_fault_clears_with_hysteresis():
+    monitor = ModuleHealthMonitor()
+    run(monitor, 2.0, (2.0, math.radians(25.0)))
+    assert monitor.status[1] == MISALIGNED
+    # Just under the trip threshold: still flagged
+    run(monitor, 2.0, (2.0, modulehealth.MISALIGN_ANGLE * 0.8))
+    assert monitor.status[1] == MISALIGNED
+    run(monitor, 2.0, (2.0, 0.0))
+    assert monitor.status[1] == OK
+
+def test_angle_is_not_judged_while_stopped():
+    monitor = ModuleHealthMonitor()
+    run(monitor, 2.0, (0.0, 1.0), target=(0.0, 0.0))
+    assert monitor.status[1] == OK
@@ -0,0 +1,57 @@
+'''
+    Feeds synthetic odometry periods to the odometry histograms.
+'''
+
+import math
+import pytest
+
+import odometrystats
+from odometrystats import Histogram, OdometryStats
+
+class State:
+    def __init__(self, period, timestamp, failed_daqs=0):
+        self.odometry_period = period
+        self.timestamp = timestamp
+        self.failed_daqs = failed_daqs
+
+def test_buckets_and_overflow():
+    histogram = Histogram(1.0, 10)
+    for value in (0.5, 1.5, 1.7, 9.9, 25.0, -1.0):
+        histogram.add(value)
+    assert list(histogram.counts) == [2, 2, 0, 0, 0, 0, 0, 0, 0, 1, 1]
+    assert histogram.edges()[-1] == math.inf
+
+def test_percentile():
+    histogram = Histogram(1.0, 10)
+    for _ in range(99):
+        histogram.add(4.5)
+    histogram.add(8.2)
+    counts = histogram.snapshot()
+    assert histogram.percentile(counts, 0.5) == pytest.approx(5.0)
+    assert histogram.percentile(counts, 0.99) == pytest.approx(5.0)
+    assert histogram.percentile(counts, 1.0) == pytest.approx(9.0)
+    assert math.isnan(histogram.percentile([0] * 11, 0.5))
+
+def test_windows(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(odometrystats.utils, 'get_current_time_seconds', lambda: now[0])
+    stats = OdometryStats(publish_period=1.0)
+
+    # A clean 250 Hz second, then one with a 12 ms gap and a failed DAQ
+    for i in range(250):
+        now[0] = i * 0.004 + 0.002
+        stats.record(State(0.004, i * 0.004))
+    stats.publish(1.0)
+    assert stats._last_period[int(4.0 / odometrystats.PERIOD_BUCKET_MS)] == 250
+    assert stats.max_period == 0.0
+
+    now[0] = 1.003
+    stats.record(State(0.012, 1.0, failed_daqs=1))
+    assert stats.max_period == pytest.approx(12.0)
+    assert stats.max_latency == pytest.approx(3.0)
+    # Too early: the window stays open
+    stats.publish(1.5)
+    assert stats._last_failed == 0
+    stats.publish(2.0)
+    assert stats._last_failed == 1
+    assert sum(stats._last_period) == 251
@@ -0,0 +1,81 @@
+'''
+    Checks that generated paths start and end at the right poses and stay
+    within the generator's limits.
+'''
+
+import math
+import pytest
+
+from wpimath.geometry import Pose2d, Rotation2d
+
+import pathgen
+from pathgen import PathGenerator, TrapezoidMove
+from trajectories import TrajectorySampler
+
+CASES = [
+    (Pose2d(1.0, 1.0, Rotation2d()), Pose2d(7.0, 3.0, Rotation2d(2.0)), (0.0, 0.0)),
+    (Pose2d(2.0, 2.0, Rotation2d(3.0)), Pose2d(2.3, 2.1, Rotation2d(-3.0)), (0.0, 0.0)),
+    (Pose2d(1.0, 1.0, Rotation2d()), Pose2d(4.0, 1.0, Rotation2d()), (2.0, 0.5)),
+    (Pose2d(1.0, 1.0, Rotation2d()), Pose2d(1.0, 1.0, Rotation2d()), (0.0, 0.0)),
+]
+
+@pytest.mark.parametrize("start, target, velocity", CASES)
+def test_generated_path(start, target, velocity):
+    table = PathGenerator().generate(start, target, velocity)
+    cols = table.blue
+    assert table.red is table.blue
+    assert (cols.x[0], cols.y[0]) == pytest.approx((start.X(), start.Y()))
+    assert (cols.x[-1], cols.y[-1]) == pytest.approx((target.X(), target.Y()))
+    assert math.remainder(cols.heading[-1] - target.rotation().radians(), math.tau) == pytest.approx(0.0, abs=1e-9)
+    assert (cols.vx[-1], cols.vy[-1], cols.omega[-1]) == (0.0, 0.0, 0.0)
+    for i in range(len(table)):
+        assert math.hypot(cols.vx[i], cols.vy[i]) <= pathgen.MAX_SPEED + 1e-9
+        assert math.hypot(cols.ax[i], cols.ay[i]) <= pathgen.MAX_ACCELERATION + 1e-9
+        assert abs(cols.omega[i]) <= pathgen.MAX_ANGULAR_SPEED + 1e-9
+
+def test_positions_match_velocities():
+    start, target, velocity = CASES[0]
+    table = PathGenerator().generate(start, target, velocity)
+    cols = table.blue
+    for i in range(len(table) - 1):
+        dt = table.t[i + 1] - table.t[i]
+        assert cols.x[i + 1] - cols.x[i] == pytest.approx((cols.vx[i] + cols.vx[i + 1]) / 2 * dt, abs=1e-3)
+        assert cols.y[i + 1] - cols.y[i] == pytest.approx((cols.vy[i] + cols.vy[i + 1]) / 2 * dt, abs=1e-3)
+
+def test_start_speed_is_kept():
+    start, target, velocity = CASES[2]
+    table = PathGenerator().generate(start, target, velocity)
+    assert table.blue.vx[0] == pytest.approx(2.0)
+
+def test_sampler_reads_generated_path():
+    start, target, velocity = CASES[0]
+    table = PathGenerator().generate(start, target, velocity)
+    sampler = TrajectorySampler(table)
+    sample = sampler.sample(table.totalTime() + 1.0, True)
+    assert (sample.x, sample.y) == pytest.approx((target.X(), target.Y()))
+
+@pytest.mark.parametrize("distance", [0.0, 0.1, 1.0, 10.0])
+def test_trapezoid_ends_at_rest(distance):
+    move = TrapezoidMove(distance, 3.0, 3.0)
+    assert move.at(move.total) == (distance, 0.0, 0.0)
+    assert move.at(move.total / 2)[1] <= 3.0
+
+def test_start_speed_is_kept_while_turning():
+    # The 180° turn takes longer than the 1 m move, so the move is stretched
+    start = Pose2d(1.0, 1.0, Rotation2d())
+    target = Pose2d(2.0, 1.0, Rotation2d(math.pi))
+    table = PathGenerator().generate(start, target, (2.0, 0.0))
+    cols = table.blue
+    assert cols.vx[0] == pytest.approx(2.0)
+    assert cols.x[-1] == pytest.approx(target.X())
+    assert math.remainder(cols.heading[-1] - math.pi, math.tau) == pytest.approx(0.0, abs=1e-9)
+    for i in range(len(table) - 1):
+        dt = table.t[i + 1] - table.t[i]
+        assert cols.x[i + 1] - cols.x[i] == pytest.approx((cols.vx[i] + cols.vx[i + 1]) / 2 * dt, abs=1e-3)
+
+@pytest.mark.parametrize("start_speed", [0.0, 1.0, 2.0])
+def test_stretched_trapezoid(start_speed):
+    move = TrapezoidMove(1.0, 3.0, 3.0, start_speed, duration=2.0)
+    assert move.total == pytest.approx(2.0)
+    assert move.at(0.0)[1] == pytest.approx(start_speed)
+    assert move.at(move.total) == (1.0, 0.0, 0.0)
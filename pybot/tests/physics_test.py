@@ -0,0 +1,23 @@
+'''
+    Builds the PhysicsEngine and steps it once with the motors driven.
+'''
+
+from types import SimpleNamespace
+from unittest import mock
+
+import physics
+
+def mechanism(voltage):
+    motor = mock.Mock()
+    motor.sim_state.motor_voltage = voltage
+    return SimpleNamespace(motor=motor, follower=mock.Mock())
+
+def test_physics_engine_steps():
+    container = SimpleNamespace(elevator=mechanism(6.0), intake=mechanism(6.0))
+    engine = physics.PhysicsEngine(mock.Mock(), SimpleNamespace(container=container))
+    engine.update_sim(0.02, 0.02)
+
+    assert engine.elevator_sim.getVelocity() > 0.0
+    assert engine.intake_sim.getAngularVelocity() > 0.0
+    container.elevator.motor.sim_state.set_raw_rotor_position.assert_called_once()
+    container.intake.follower.sim_state.set_rotor_velocity.assert_called_once()
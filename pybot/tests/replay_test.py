@@ -0,0 +1,69 @@
+'''
+    Writes a small wpilog and replays it through the drive controllers.
+'''
+
+import pytest
+
+from wpiutil.log import BooleanArrayLogEntry, BooleanLogEntry, DoubleArrayLogEntry, FloatArrayLogEntry
+
+import replay
+from fixtures.fixturelog import fixtureLog
+from logstream import LogStream
+from replay import Diff, Replay, ENTRIES
+
+SECOND = 1000000
+
+def write_log(path):
+    with fixtureLog(path) as log:
+        enabled = BooleanLogEntry(log, 'DS:enabled')
+        autonomous = BooleanLogEntry(log, 'DS:autonomous')
+        axes = FloatArrayLogEntry(log, 'DS:joystick0/axes')
+        buttons = BooleanArrayLogEntry(log, 'DS:joystick0/buttons')
+        pose = DoubleArrayLogEntry(log, 'DriveState/Pose')
+
+        # Disabled: nothing is driven
+        axes.append([0.5, 0.5, 0.0, 0.0, 0.5, 0.0], 1 * SECOND)
+        # Teleop: five joystick samples, gear switch pressed after the second
+        enabled.append(True, 2 * SECOND)
+        autonomous.append(False, 2 * SECOND)
+        for i in range(5):
+            axes.append([0.1 * i, -0.2 * i, 0.0, 0.0, 0.3, 0.0], 2 * SECOND + i * 20000)
+            buttons.append([False, i == 2], 2 * SECOND + i * 20000 + 1)
+            pose.append([1.0, 2.0, 90.0], 2 * SECOND + i * 20000 + 2)
+
+def test_stream_decodes_records(tmp_path):
+    path = tmp_path / 'match.wpilog'
+    write_log(path)
+    records = list(LogStream(str(path)).stream(ENTRIES))
+    keys = [key for key, _, _ in records]
+    assert keys.count('axes') == 6
+    assert keys.count('pose') == 5
+    key, t, value = records[0]
+    assert (key, t) == ('axes', 1.0)
+    assert list(value) == pytest.approx([0.5, 0.5, 0.0, 0.0, 0.5, 0.0])
+
+def test_replay_matches_shaper(tmp_path):
+    path = tmp_path / 'match.wpilog'
+    write_log(path)
+    rows = list(Replay().run(LogStream(str(path)).stream(ENTRIES)))
+    assert [row[0] for row in rows] == ['drive'] * 5
+
+    # The gear switch halfway through changes the scaling of later samples
+    fresh = Replay()
+    fresh.shaper.update(0.4, -0.8, 0.3)
+    assert rows[4][2] != pytest.approx(fresh.shaper.vx)
+    fresh._gearSwitch()
+    fresh.shaper.update(0.4, -0.8, 0.3)
+    assert rows[4][2:] == pytest.approx((fresh.shaper.vx, fresh.shaper.vy, fresh.shaper.omega))
+
+def test_replay_against_itself(tmp_path, monkeypatch):
+    path = tmp_path / 'match.wpilog'
+    write_log(path)
+    first = tmp_path / 'first.csv'
+    second = tmp_path / 'second.csv'
+    assert replay.main([str(path), '--out', str(first)]) == 0
+    assert replay.main([str(path), '--out', str(second), '--compare', str(first)]) == 0
+
+    # A different controller no longer matches
+    monkeypatch.setattr(replay.robotcontainer, 'MAX_SPEED_SCALING', 0.6)
+    assert replay.main([str(path), '--out', str(second), '--compare', str(first)]) == 1
@@ -0,0 +1,50 @@
+'''
+    Checks the startup timeline's stages and import timing.
+'''
+
+import builtins
+import sys
+import threading
+
+from startup import StartupTimeline
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+def test_stages():
+    clock = Clock()
+    timeline = StartupTimeline(clock)
+    clock.now += 0.5
+    with timeline.stage("Drivetrain"):
+        clock.now += 0.25
+    assert timeline.stages == [("Drivetrain", threading.current_thread().name, 0.5, 0.25)]
+
+def test_stage_on_worker_thread():
+    timeline = StartupTimeline()
+    def configure():
+        with timeline.stage("Elevator"):
+            pass
+    worker = threading.Thread(target=configure, name="DeviceConfig_0")
+    worker.start()
+    worker.join()
+    assert timeline.stages[0][:2] == ("Elevator", "DeviceConfig_0")
+
+def test_imports(monkeypatch):
+    timeline = StartupTimeline()
+    monkeypatch.setattr(timeline, 'publish', lambda: None)
+    monkeypatch.delitem(sys.modules, 'colorsys', raising=False)
+    original = builtins.__import__
+
+    timeline.timeImports()
+    import colorsys
+    assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0)[0] == 0.0
+    ready = timeline.finish()
+
+    assert builtins.__import__ is original
+    assert 'colorsys' in timeline.imports
+    assert 0.0 <= timeline.imports['colorsys'] <= ready
+    assert timeline.report()[0].startswith("Startup ready after")
@@ -0,0 +1,83 @@
+'''
+    Checks the background Limelight client against a local fake camera.
+'''
+
+import time
+import pytest
+
+from fixtures.fakelimelight import FakeLimelight
+from fixtures.limelightdata import DATA, RESULTS
+from vision import LimelightClient, VisionSystem
+
+NOW = 100.0
+
+def client_for(fake: FakeLimelight, **options) -> LimelightClient:
+    return LimelightClient(fake.host, fake.port, clock=lambda: NOW, **options)
+
+def test_result_is_timestamped_at_capture():
+    with FakeLimelight() as fake:
+        client = client_for(fake)
+        result = client.poll()
+    latency = (RESULTS['cl'] + RESULTS['tl']) / 1000.0
+    assert result is client.latest
+    assert result.latency == pytest.approx(latency)
+    assert result.timestamp == pytest.approx(NOW - latency)
+    assert [f.fiducial_id for f in result.results.fiducialResults] == [18, 17]
+
+def test_status_is_read():
+    with FakeLimelight() as fake:
+        client = client_for(fake)
+        client.poll()
+    assert client.status['cpu'] == DATA['cpu']
+    assert client.name == DATA['name']
+    assert client.latest.camera == DATA['name']
+
+def test_connection_is_reused():
+    with FakeLimelight() as fake:
+        client = client_for(fake)
+        for _ in range(20):
+            client.poll()
+        client.stop()
+    assert fake.connections == 1
+    assert client.connects == 1
+    assert client.latest.sequence == 20
+
+def test_repeated_frame_is_not_published():
+    with FakeLimelight(new_frames=False) as fake:
+        client = client_for(fake)
+        first = client.poll()
+        assert client.poll() is None
+    assert client.latest is first
+
+def test_listeners_get_every_new_result():
+    seen = []
+    with FakeLimelight() as fake:
+        client = client_for(fake)
+        client.addListener(seen.append)
+        for _ in range(3):
+            client.poll()
+    assert [r.sequence for r in seen] == [1, 2, 3]
+
+def test_unreachable_camera():
+    with FakeLimelight() as fake:
+        port = fake.port
+    client = LimelightClient('127.0.0.1', port, clock=lambda: NOW)
+    assert client.poll() is None
+    assert client.latest is None
+    assert not client.connected
+    assert client.failures > 0
+
+def test_background_polling():
+    with FakeLimelight() as fake:
+        system = VisionSystem([fake.host], port=fake.port, poll_period=0.005, clock=lambda: NOW)
+        system.start()
+        deadline = time.monotonic() + 2.0
+        while time.monotonic() < deadline:
+            results = system.latest()
+            if results and results[0].sequence >= 5:
+                break
+            time.sleep(0.01)
+        system.stop()
+    assert len(results) == 1
+    assert results[0].sequence >= 5
+    assert fake.connections == 1
@@ -0,0 +1,82 @@
+'''
+    Checks the outlier rejection and standard deviations of VisionFusion.
+'''
+
+import copy
+import math
+import pytest
+
+import limelightresults
+from wpimath.geometry import Pose2d
+from wpimath.kinematics import ChassisSpeeds
+
+from fixtures.limelightdata import RESULTS
+from vision import VisionResult
+import visionfusion
+from visionfusion import VisionFusion
+
+class FakeState:
+    def __init__(self, pose, omega):
+        self.pose = pose
+        self.speeds = ChassisSpeeds(0.0, 0.0, omega)
+
+class FakeDrivetrain:
+    def __init__(self, pose=Pose2d(4.0, 2.7, 0.0), omega=0.0):
+        self.state = FakeState(pose, omega)
+        self.measurements = []
+
+    def get_state(self):
+        return self.state
+
+    def add_vision_measurement(self, pose, timestamp, std_devs):
+        self.measurements.append((pose, timestamp, std_devs))
+
+def result(**botpose):
+    data = copy.deepcopy(RESULTS)
+    pose = data['botpose_wpiblue']
+    for name, value in botpose.items():
+        pose[getattr(visionfusion, 'BOTPOSE_' + name.upper())] = value
+    return VisionResult('limelight', 1, 12.5, 12.53, 0.03, limelightresults.parse_results(data))
+
+def test_good_result_is_added():
+    drivetrain = FakeDrivetrain()
+    fusion = VisionFusion(drivetrain, lambda: True)
+    assert fusion.addResult(result())
+    pose, timestamp, std_devs = drivetrain.measurements[0]
+    botpose = RESULTS['botpose_wpiblue']
+    assert pose.X() == pytest.approx(botpose[0])
+    assert pose.Y() == pytest.approx(botpose[1])
+    assert pose.rotation().degrees() == pytest.approx(botpose[5])
+    assert timestamp == 12.5
+    assert std_devs == VisionFusion.stdDevs(botpose)
+    assert fusion.accepted == 1
+
+@pytest.mark.parametrize("botpose, drivetrain, reason", [
+    ({'tag_count': 0}, FakeDrivetrain(), 'NoTags'),
+    ({'x': 25.0}, FakeDrivetrain(), 'OutOfField'),
+    ({'tag_count': 1, 'avg_area': 0.01}, FakeDrivetrain(), 'Ambiguous'),
+    ({'avg_distance': 6.0}, FakeDrivetrain(), 'TooFar'),
+    ({}, FakeDrivetrain(omega=10.0), 'Spinning'),
+    ({}, FakeDrivetrain(pose=Pose2d(8.0, 4.0, 0.0)), 'Jump'),
+])
+def test_outliers_are_rejected(botpose, drivetrain, reason):
+    fusion = VisionFusion(drivetrain, lambda: True)
+    assert not fusion.addResult(result(**botpose))
+    assert drivetrain.measurements == []
+    assert fusion.rejected[reason] == 1
+
+def test_jump_is_allowed_while_disabled():
+    drivetrain = FakeDrivetrain(pose=Pose2d())
+    fusion = VisionFusion(drivetrain, lambda: False)
+    assert fusion.addResult(result())
+
+def test_std_devs_scale_with_distance_and_tags():
+    near = VisionFusion.stdDevs(RESULTS['botpose_wpiblue'])
+    pose = list(RESULTS['botpose_wpiblue'])
+    pose[visionfusion.BOTPOSE_AVG_DISTANCE] *= 2.0
+    far = VisionFusion.stdDevs(pose)
+    assert far[0] == pytest.approx(near[0] * 4.0)
+    pose[visionfusion.BOTPOSE_TAG_COUNT] = 1
+    single = VisionFusion.stdDevs(pose)
+    assert single[0] == pytest.approx(far[0] * 2.0)
+    assert single[2] == visionfusion.SINGLE_TAG_THETA_STD_DEV
@@ -0,0 +1,276 @@
+import bisect
+import logging
+import math
+import os
+from array import array
+import choreo
+from wpimath.geometry import Pose2d
+
+TRAJECTORY_EXTENSION = '.traj'
+MODULE_COUNT = 4
+
+def trajectoryDirectory() -> str:
+    """
+    Returns the directory holding the deployed Choreo trajectory files.
+
+    Resolved from this module rather than the operating directory, which is
+    taken from the main script, so the robot and tools run from elsewhere
+    (e.g. `python -m benchmarks.sampler`) all find the same files.
+    """
+    return os.path.join (os.path.dirname (os.path.abspath (__file__)), "deploy", "choreo")
+
+def loadTrajectory(name: str) -> choreo.trajectory.SwerveTrajectory:
+    """
+    Parse the trajectory file `name` (without extension) from trajectoryDirectory().
+    """
+    path = os.path.join (trajectoryDirectory(), name + TRAJECTORY_EXTENSION)
+    with open (path, encoding='utf-8') as f:
+        return choreo.load_swerve_trajectory_string (f.read())
+
+def trajectoryNames() -> list[str]:
+    """
+    Returns the names (without extension) of all deployed trajectory files.
+    """
+    names = []
+    for f in os.listdir (trajectoryDirectory()):
+        if f.endswith (TRAJECTORY_EXTENSION):
+            names.append (f.removesuffix (TRAJECTORY_EXTENSION))
+    return sorted (names)
+
+class TrajectorySample:
+    """
+    A mutable swerve sample written in place by TrajectorySampler.
+
+    Has the same fields as choreo's SwerveSample so it can be handed to
+    anything that consumes one (e.g. CommandSwerveDrivetrain.follow_trajectory).
+    """
+    __slots__ = ('timestamp', 'x', 'y', 'heading', 'vx', 'vy', 'omega',
+                 'ax', 'ay', 'alpha', 'fx', 'fy')
+
+    def __init__(self) -> None:
+        self.timestamp = 0.0
+        self.x = 0.0
+        self.y = 0.0
+        self.heading = 0.0
+        self.vx = 0.0
+        self.vy = 0.0
+        self.omega = 0.0
+        self.ax = 0.0
+        self.ay = 0.0
+        self.alpha = 0.0
+        self.fx = [0.0] * MODULE_COUNT
+        self.fy = [0.0] * MODULE_COUNT
+
+    def get_pose(self) -> Pose2d:
+        return Pose2d(self.x, self.y, self.heading)
+
+class _Columns:
+    """
+    Column-wise storage of one set of samples (one alliance).
+    """
+    __slots__ = ('x', 'y', 'heading', 'vx', 'vy', 'omega',
+                 'ax', 'ay', 'alpha', 'fx', 'fy')
+
+    def __init__(self, samples) -> None:
+        self.x = array ('d', (s.x for s in samples))
+        self.y = array ('d', (s.y for s in samples))
+        self.heading = array ('d', (s.heading for s in samples))
+        self.vx = array ('d', (s.vx for s in samples))
+        self.vy = array ('d', (s.vy for s in samples))
+        self.omega = array ('d', (s.omega for s in samples))
+        self.ax = array ('d', (s.ax for s in samples))
+        self.ay = array ('d', (s.ay for s in samples))
+        self.alpha = array ('d', (s.alpha for s in samples))
+        # Module forces are stored flat: sample i uses [i * 4, i * 4 + 4)
+        self.fx = array ('d', (f for s in samples for f in s.fx))
+        self.fy = array ('d', (f for s in samples for f in s.fy))
+
+class SampleTable:
+    """
+    Read-only, array-backed copy of a choreo swerve trajectory.
+
+    Samples are kept in contiguous double arrays, once as authored (blue) and
+    once pre-flipped for the red alliance, so sampling never has to build or
+    mirror sample objects. Use a TrajectorySampler to read from it.
+    """
+
+    def __init__(self, trajectory: choreo.trajectory.SwerveTrajectory) -> None:
+        self.trajectory = trajectory
+        self.name = trajectory.name
+        self.events = trajectory.events
+        samples = trajectory.samples
+        self.t = array ('d', (s.timestamp for s in samples))
+        self.blue = _Columns (samples)
+        self.red = _Columns ([s.flipped() for s in samples])
+
+    @classmethod
+    def fromArrays(cls, name: str, t: array, x: array, y: array, heading: array,
+                   vx: array, vy: array, omega: array,
+                   ax: array, ay: array, alpha: array) -> 'SampleTable':
+        """
+        Build a table from field coordinate columns, e.g. a path generated on
+        the robot. The same samples are used for both alliances, there are no
+        events and module forces are zero.
+        """
+        table = cls.__new__ (cls)
+        table.trajectory = None
+        table.name = name
+        table.events = []
+        table.t = t
+        cols = _Columns (())
+        cols.x, cols.y, cols.heading = x, y, heading
+        cols.vx, cols.vy, cols.omega = vx, vy, omega
+        cols.ax, cols.ay, cols.alpha = ax, ay, alpha
+        cols.fx = array ('d', [0.0]) * (len (t) * MODULE_COUNT)
+        cols.fy = array ('d', [0.0]) * (len (t) * MODULE_COUNT)
+        table.blue = cols
+        table.red = cols
+        return table
+
+    def __len__(self) -> int:
+        return len (self.t)
+
+    def totalTime(self) -> float:
+        return self.t[-1] if len (self.t) > 0 else 0.0
+
+    def initialPose(self, red: bool) -> Pose2d | None:
+        if len (self.t) == 0:
+            return None
+        cols = self.red if red else self.blue
+        return Pose2d(cols.x[0], cols.y[0], cols.heading[0])
+
+class TrajectorySampler:
+    """
+    Samples a SampleTable by time into a single reusable TrajectorySample.
+
+    A cursor remembers the last sample interval, so sampling with increasing
+    timestamps is O(1) amortized; going back in time falls back to a binary
+    search. Interpolation matches choreo's SwerveTrajectory.sample_at.
+    """
+
+    def __init__(self, table: SampleTable) -> None:
+        self.table = table
+        self._sample = TrajectorySample()
+        self._cursor = 0
+
+    def reset(self) -> None:
+        self._cursor = 0
+
+    def sample(self, timestamp: float, red: bool) -> TrajectorySample | None:
+        """
+        Interpolate the trajectory at `timestamp`.
+
+        :param timestamp: Seconds since the start of the trajectory.
+        :param red: Use the red alliance (flipped) samples.
+        :returns: The shared sample object, overwritten by the next call, or
+                  None if the trajectory is empty.
+        """
+        t = self.table.t
+        count = len (t)
+        if count == 0:
+            return None
+
+        cols = self.table.red if red else self.table.blue
+        if timestamp <= t[0]:
+            return self._copy (cols, 0, t[0])
+        if timestamp >= t[-1]:
+            return self._copy (cols, count - 1, t[-1])
+
+        # Find the first sample at or after timestamp, starting at the cursor
+        i = self._cursor
+        if i == 0 or t[i - 1] >= timestamp:
+            i = bisect.bisect_left (t, timestamp)
+        else:
+            while t[i] < timestamp:
+                i += 1
+        self._cursor = i
+
+        dt = t[i] - t[i - 1]
+        if dt < 1e-6:
+            return self._copy (cols, i, t[i])
+        return self._interpolate (cols, i - 1, i, (timestamp - t[i - 1]) / dt, timestamp)
+
+    def _copy(self, cols: _Columns, i: int, timestamp: float) -> TrajectorySample:
+        s = self._sample
+        s.timestamp = timestamp
+        s.x = cols.x[i]
+        s.y = cols.y[i]
+        s.heading = cols.heading[i]
+        s.vx = cols.vx[i]
+        s.vy = cols.vy[i]
+        s.omega = cols.omega[i]
+        s.ax = cols.ax[i]
+        s.ay = cols.ay[i]
+        s.alpha = cols.alpha[i]
+        base = i * MODULE_COUNT
+        for m in range (MODULE_COUNT):
+            s.fx[m] = cols.fx[base + m]
+            s.fy[m] = cols.fy[base + m]
+        return s
+
+    def _interpolate(self, cols: _Columns, a: int, b: int, scale: float, timestamp: float) -> TrajectorySample:
+        s = self._sample
+        s.timestamp = timestamp
+        s.x = cols.x[a] + (cols.x[b] - cols.x[a]) * scale
+        s.y = cols.y[a] + (cols.y[b] - cols.y[a]) * scale
+        # Take the shortest way around, like Rotation2d.interpolate
+        delta = math.remainder (cols.heading[b] - cols.heading[a], math.tau)
+        s.heading = math.remainder (cols.heading[a] + delta * scale, math.tau)
+        s.vx = cols.vx[a] + (cols.vx[b] - cols.vx[a]) * scale
+        s.vy = cols.vy[a] + (cols.vy[b] - cols.vy[a]) * scale
+        s.omega = cols.omega[a] + (cols.omega[b] - cols.omega[a]) * scale
+        s.ax = cols.ax[a] + (cols.ax[b] - cols.ax[a]) * scale
+        s.ay = cols.ay[a] + (cols.ay[b] - cols.ay[a]) * scale
+        s.alpha = cols.alpha[a] + (cols.alpha[b] - cols.alpha[a]) * scale
+        fa = a * MODULE_COUNT
+        fb = b * MODULE_COUNT
+        for m in range (MODULE_COUNT):
+            s.fx[m] = cols.fx[fa + m] + (cols.fx[fb + m] - cols.fx[fa + m]) * scale
+            s.fy[m] = cols.fy[fa + m] + (cols.fy[fb + m] - cols.fy[fa + m]) * scale
+        return s
+
+class TrajectoryStore:
+    """
+    Holds every deployed trajectory, parsed once up front.
+
+    Loading is done in robotInit so that selecting an autonomous routine at
+    autonomousInit is a dictionary lookup instead of JSON parsing. Each
+    trajectory is kept as an array-backed SampleTable.
+    """
+
+    def __init__(self) -> None:
+        self._trajectories: dict[str, SampleTable] = {}
+
+    def loadAll(self) -> None:
+        """
+        Parse every trajectory file in the deploy directory.
+        """
+        for name in trajectoryNames():
+            self.load (name)
+
+    def load(self, name: str) -> None:
+        """
+        Parse a single trajectory file and keep it under its name.
+        """
+        try:
+            self._trajectories[name] = SampleTable (loadTrajectory (name))
+        except (OSError, ValueError, KeyError) as e:
+            logging.error (f"Failed to load trajectory '{name}': {e}")
+
+    def get(self, name: str) -> SampleTable | None:
+        """
+        Returns the pre-loaded trajectory for `name` or None if it isn't known.
+        """
+        return self._trajectories.get (name)
+
+    def names(self) -> list[str]:
+        """
+        Returns the names of all loaded trajectories.
+        """
+        return list (self._trajectories.keys())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._trajectories
+
+    def __len__(self) -> int:
+        return len (self._trajectories)
@@ -0,0 +1,243 @@
+"""
+Background Limelight polling.
+
+Each camera is polled on its own daemon thread over a persistent HTTP
+connection, and results are parsed on that thread. The robot loop only reads
+`LimelightClient.latest`, an immutable VisionResult that the poll thread
+replaces with a single attribute assignment, so the main thread never blocks
+on the network or takes a lock.
+"""
+
+import http.client
+import json
+import logging
+import threading
+import time
+from typing import Callable
+
+import limelightresults
+import wpilib
+
+LIMELIGHT_PORT = 5807
+POLL_PERIOD = 0.01          # seconds between /results requests
+STATUS_PERIOD = 1.0         # seconds between /status requests
+REQUEST_TIMEOUT = 0.1       # seconds
+RECONNECT_PERIOD = 1.0      # seconds between attempts while a camera is unreachable
+
+class VisionResult:
+    """
+    One parsed Limelight result. Never modified once published.
+    """
+    __slots__ = ('camera', 'sequence', 'timestamp', 'received', 'latency', 'results')
+
+    def __init__(self, camera: str, sequence: int, timestamp: float, received: float,
+                 latency: float, results) -> None:
+        self.camera = camera
+        self.sequence = sequence
+        self.timestamp = timestamp
+        """FPGA time (seconds) at which the frame was captured"""
+        self.received = received
+        """FPGA time (seconds) at which the response arrived"""
+        self.latency = latency
+        """Capture plus pipeline latency reported by the camera (seconds)"""
+        self.results = results
+        """limelightresults.GeneralResult"""
+
+class LimelightClient:
+    """
+    Polls one Limelight on a background thread.
+
+    :param host: Address of the camera.
+    :param clock: Returns the current FPGA time in seconds.
+    """
+
+    def __init__(self, host: str, port: int = LIMELIGHT_PORT,
+                 poll_period: float = POLL_PERIOD, status_period: float = STATUS_PERIOD,
+                 timeout: float = REQUEST_TIMEOUT,
+                 clock: Callable[[], float] = wpilib.Timer.getFPGATimestamp) -> None:
+        self.host = host
+        self.port = port
+        self.name = host
+        self.poll_period = poll_period
+        self.status_period = status_period
+        self.timeout = timeout
+
+        self.latest: VisionResult | None = None
+        """Newest result; read it once into a local and use that"""
+        self.status: dict | None = None
+        self.connected = False
+        self.connects = 0
+        self.failures = 0
+        self.round_trip = 0.0
+        """Duration of the last /results request (seconds)"""
+
+        self._clock = clock
+        self._connection: http.client.HTTPConnection | None = None
+        self._frame = None
+        self._sequence = 0
+        self._next_status = 0.0
+        self._listeners: list[Callable[[VisionResult], None]] = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def addListener(self, listener: Callable[[VisionResult], None]) -> None:
+        """
+        Call `listener` with every new result, on the poll thread.
+        """
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"Limelight {self.host}", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._close()
+
+    def poll(self) -> VisionResult | None:
+        """
+        Make one round of requests and publish the result if it is a new frame.
+        Called by the poll thread; call it directly only when not started.
+        """
+        now = time.monotonic()
+        if now >= self._next_status:
+            self._next_status = now + self.status_period
+            status = self._get('/status')
+            if status is not None:
+                self.status = status
+                self.name = status.get('name', self.name)
+
+        start = time.perf_counter()
+        data = self._get('/results')
+        received = self._clock()
+        if data is None:
+            return None
+        self.round_trip = time.perf_counter() - start
+
+        # The camera is usually polled faster than it produces frames
+        frame = data.get('ts')
+        if frame is not None and frame == self._frame:
+            return None
+        self._frame = frame
+
+        results = limelightresults.parse_results(data)
+        latency = (results.capture_latency + results.targeting_latency) / 1000.0
+        self._sequence += 1
+        result = VisionResult(self.name, self._sequence, received - latency, received, latency, results)
+        self.latest = result
+        for listener in self._listeners:
+            listener(result)
+        return result
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            start = time.monotonic()
+            try:
+                self.poll()
+            except Exception:
+                logging.exception(f"Limelight {self.name}: poll failed")
+            period = self.poll_period if self.connected else RECONNECT_PERIOD
+            self._stop.wait(max(0.0, period - (time.monotonic() - start)))
+
+    def _get(self, path: str) -> dict | None:
+        try:
+            if self._connection is None:
+                self._connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                self.connects += 1
+            self._connection.request('GET', path)
+            response = self._connection.getresponse()
+            body = response.read()
+            if response.status != 200:
+                raise http.client.HTTPException(f"{path} returned {response.status}")
+            data = json.loads(body)
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            self.failures += 1
+            if self.connected:
+                logging.warning(f"Lost Limelight {self.name}: {e}")
+            self.connected = False
+            self._close()
+            return None
+
+        if not self.connected:
+            logging.info(f"Connected to Limelight {self.name} at {self.host}:{self.port}")
+            self.connected = True
+        return data
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+class VisionSystem:
+    """
+    The set of Limelights on the robot.
+
+    :param hosts: Camera addresses. If None, cameras are discovered on a
+                  background thread when started, so startup does not wait
+                  for discovery.
+    :param client_options: Passed on to every LimelightClient.
+    """
+
+    def __init__(self, hosts: list[str] | None = None, **client_options) -> None:
+        self.clients: tuple[LimelightClient, ...] = ()
+        self._hosts = hosts
+        self._client_options = client_options
+        self._listeners: list[Callable[[VisionResult], None]] = []
+
+    def addListener(self, listener: Callable[[VisionResult], None]) -> None:
+        """
+        Call `listener` with every new result from any camera, on that
+        camera's poll thread.
+        """
+        self._listeners.append(listener)
+        for client in self.clients:
+            client.addListener(listener)
+
+    def start(self) -> None:
+        if self._hosts is None:
+            threading.Thread(target=self._discover, name="Limelight discovery", daemon=True).start()
+        else:
+            self._startClients(self._hosts)
+
+    def stop(self) -> None:
+        for client in self.clients:
+            client.stop()
+
+    def latest(self) -> list[VisionResult]:
+        """
+        The newest result of every camera that has produced one.
+        """
+        results = []
+        for client in self.clients:
+            result = client.latest
+            if result is not None:
+                results.append(result)
+        return results
+
+    def _discover(self) -> None:
+        # Only needed here, on the discovery thread, so it stays out of startup
+        import limelight
+
+        try:
+            hosts = limelight.discover_limelights()
+        except OSError as e:
+            logging.error(f"Limelight discovery failed: {e}")
+            return
+        if not hosts:
+            logging.warning("No Limelights found")
+            return
+        self._startClients(hosts)
+
+    def _startClients(self, hosts: list[str]) -> None:
+        clients = []
+        for host in hosts:
+            client = LimelightClient(host, **self._client_options)
+            for listener in self._listeners:
+                client.addListener(listener)
+            client.start()
+            clients.append(client)
+        self.clients = tuple(clients)
@@ -0,0 +1,128 @@
+"""
+Fuses Limelight pose estimates into the drivetrain's pose estimator.
+
+VisionFusion is registered as a VisionSystem listener, so it runs on the
+camera poll threads at camera rate: each new result is checked, given
+standard deviations and passed to CommandSwerveDrivetrain.add_vision_measurement
+with its capture timestamp. The robot loop does none of this work.
+"""
+
+import math
+import threading
+from typing import Callable
+
+import wpilib
+from ntcore import NetworkTableInstance
+from wpimath.geometry import Pose2d, Rotation2d
+
+from vision import VisionResult
+
+# Indices into the Limelight botpose arrays
+BOTPOSE_X = 0
+BOTPOSE_Y = 1
+BOTPOSE_YAW = 5
+BOTPOSE_TAG_COUNT = 7
+BOTPOSE_AVG_DISTANCE = 9
+BOTPOSE_AVG_AREA = 10
+BOTPOSE_LENGTH = 11
+
+FIELD_LENGTH = 17.548       # meters
+FIELD_WIDTH = 8.052         # meters
+FIELD_MARGIN = 0.5          # meters
+
+MAX_TAG_DISTANCE = 4.0      # meters, average over the tags seen
+MIN_SINGLE_TAG_AREA = 0.1   # percent of image; smaller single tags flip between poses
+MAX_ROTATION_RATE = math.radians(360.0)
+MAX_POSE_JUMP = 1.0         # meters from the current estimate
+
+XY_STD_DEV = 0.1            # meters, one tag at one meter
+THETA_STD_DEV = 0.2         # radians, one tag at one meter
+SINGLE_TAG_THETA_STD_DEV = 1e6  # don't take heading from a single tag
+
+REJECT_REASONS = ('NoTags', 'OutOfField', 'Ambiguous', 'TooFar', 'Spinning', 'Jump')
+
+class VisionFusion:
+    """
+    Filters vision results and adds the good ones to the pose estimator.
+
+    :param drivetrain: The CommandSwerveDrivetrain to correct.
+    :param is_enabled: Returns True while the robot is enabled. The pose jump
+                       check only applies when enabled, so the robot can
+                       localize from scratch while disabled.
+    """
+
+    def __init__(self, drivetrain, is_enabled: Callable[[], bool] = wpilib.DriverStation.isEnabled) -> None:
+        self._drivetrain = drivetrain
+        self._is_enabled = is_enabled
+        self._lock = threading.Lock()
+
+        self.accepted = 0
+        self.rejected = dict.fromkeys(REJECT_REASONS, 0)
+
+        table = NetworkTableInstance.getDefault().getTable("Vision")
+        self._accepted_pub = table.getIntegerTopic("Accepted").publish()
+        self._rejected_pubs = {reason: table.getIntegerTopic(f"Rejected/{reason}").publish()
+                               for reason in REJECT_REASONS}
+        self._pose_pub = table.getStructTopic("Pose", Pose2d).publish()
+
+    def addResult(self, result: VisionResult) -> bool:
+        """
+        Check one camera result and add it to the estimator if it passes.
+        Called on a camera poll thread.
+
+        :returns: True if the measurement was used.
+        """
+        with self._lock:
+            botpose = result.results.botpose_wpiblue
+            reason = self._check(botpose)
+            if reason is not None:
+                self.rejected[reason] += 1
+                self._rejected_pubs[reason].set(self.rejected[reason])
+                return False
+
+            pose = Pose2d(botpose[BOTPOSE_X], botpose[BOTPOSE_Y],
+                          Rotation2d.fromDegrees(botpose[BOTPOSE_YAW]))
+            self._drivetrain.add_vision_measurement(pose, result.timestamp, self.stdDevs(botpose))
+            self.accepted += 1
+            self._accepted_pub.set(self.accepted)
+            self._pose_pub.set(pose)
+            return True
+
+    def _check(self, botpose) -> str | None:
+        """
+        Returns the reason to reject a botpose, or None if it is usable.
+        """
+        if len(botpose) < BOTPOSE_LENGTH or botpose[BOTPOSE_TAG_COUNT] < 1:
+            return 'NoTags'
+
+        x = botpose[BOTPOSE_X]
+        y = botpose[BOTPOSE_Y]
+        if not (-FIELD_MARGIN <= x <= FIELD_LENGTH + FIELD_MARGIN
+                and -FIELD_MARGIN <= y <= FIELD_WIDTH + FIELD_MARGIN):
+            return 'OutOfField'
+        if botpose[BOTPOSE_TAG_COUNT] == 1 and botpose[BOTPOSE_AVG_AREA] < MIN_SINGLE_TAG_AREA:
+            return 'Ambiguous'
+        if botpose[BOTPOSE_AVG_DISTANCE] > MAX_TAG_DISTANCE:
+            return 'TooFar'
+
+        state = self._drivetrain.get_state()
+        if abs(state.speeds.omega) > MAX_ROTATION_RATE:
+            return 'Spinning'
+        if self._is_enabled():
+            current = state.pose
+            if math.hypot(x - current.X(), y - current.Y()) > MAX_POSE_JUMP:
+                return 'Jump'
+        return None
+
+    @staticmethod
+    def stdDevs(botpose) -> tuple[float, float, float]:
+        """
+        Standard deviations (x, y, theta) for a botpose: they grow with the
+        square of the average tag distance and shrink with the tag count.
+        """
+        count = botpose[BOTPOSE_TAG_COUNT]
+        distance = max(botpose[BOTPOSE_AVG_DISTANCE], 1.0)
+        scale = distance * distance / count
+        xy = XY_STD_DEV * scale
+        theta = THETA_STD_DEV * scale if count > 1 else SINGLE_TAG_THETA_STD_DEV
+        return (xy, xy, theta)